@@ -0,0 +1,38 @@
+# commands/backfill_reaction_rollups.py
+"""
+Rebuild the hourly/daily reaction rollups from the reactions table.
+
+Usage:
+    python -m app.commands.backfill_reaction_rollups [--since YYYY-MM-DD]
+"""
+import argparse
+from datetime import datetime
+
+from ..config.database import SessionLocal, init_database
+from ..services.reaction_rollup_service import ReactionRollupService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill reaction rollups")
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Only rebuild buckets from this UTC day on (default: everything)",
+    )
+    args = parser.parse_args(argv)
+
+    init_database()
+    db = SessionLocal()
+    try:
+        written = ReactionRollupService.rebuild(db, since=args.since)
+    finally:
+        db.close()
+
+    for table, rows in written.items():
+        print(f"{table}: {rows} bucket(s) written")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
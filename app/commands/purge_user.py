@@ -0,0 +1,48 @@
+# commands/purge_user.py
+"""
+Delete a user account in bounded batches (resumes a purge cut short).
+
+Usage:
+    python -m app.commands.purge_user <user_id> [--batch-size 500]
+"""
+import argparse
+import asyncio
+import uuid
+
+from ..config.database import get_database, init_database
+from ..services.user_purge import user_purger
+
+
+async def _purge(user_id: uuid.UUID) -> bool:
+    try:
+        return await user_purger.purge(user_id)
+    finally:
+        await get_database().dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Purge a user account in batches")
+    parser.add_argument("user_id", type=uuid.UUID)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Publications per transaction (default: USER_PURGE_BATCH_SIZE)",
+    )
+    args = parser.parse_args(argv)
+
+    database = init_database()
+    user_purger.batch_size = args.batch_size or database.settings.user_purge_batch_size
+    found = asyncio.run(_purge(args.user_id))
+
+    stats = user_purger.stats()
+    print(
+        f"{args.user_id}: {'deleted' if found else 'not found'}; "
+        f"{stats['publications_deleted']} publication(s), {stats['reactions_deleted']} reaction(s) "
+        f"in {stats['batches']} batch(es), longest {stats['longest_batch_ms']} ms"
+    )
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+# commands/reconcile_reaction_counts.py
+"""
+Recompute publication like/dislike counters from the reactions table.
+
+Usage:
+    python -m app.commands.reconcile_reaction_counts [--dry-run]
+"""
+import argparse
+
+from ..config.database import SessionLocal, init_database
+from ..services.reaction_count_service import ReactionCountService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile publication reaction counters")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report drift, do not rewrite the counters",
+    )
+    args = parser.parse_args(argv)
+
+    init_database()
+    db = SessionLocal()
+    try:
+        drift = ReactionCountService.reconcile(db, fix=not args.dry_run)
+    finally:
+        db.close()
+
+    for item in drift:
+        print(
+            f"{item['publication_id']}: "
+            f"likes {item['stored_likes']} -> {item['actual_likes']}, "
+            f"dislikes {item['stored_dislikes']} -> {item['actual_dislikes']}"
+        )
+
+    action = "found" if args.dry_run else "fixed"
+    print(f"{len(drift)} publication(s) with drift {action}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
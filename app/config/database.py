@@ -1,35 +1,121 @@
-import os
-from dotenv import load_dotenv
+import itertools
+from typing import Optional
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
 
-# Load .env
-dotenv_path = os.path.join(os.getcwd(), '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path)
-else:
-    raise FileNotFoundError(f"No se encontró el archivo .env en: {dotenv_path}")
-
-# URL .env
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("La variable DATABASE_URL no está definida en el archivo .env")
-
-# Create engine SQLAlchemy
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=NullPool,  # !Conx Pull
-    #echo=True  #logs SQL
-)
+from .pool import TimedAsyncQueuePool, TimedQueuePool
+from .instrumentation import install_slow_query_log
+from .query_stats import install_query_stats
+from .replicas import READ_METHODS, read_your_writes, reader_ids
+from .settings import Settings, get_settings
+
+
+def _async_url(database_url: str):
+    """Same database as DATABASE_URL, through the asyncpg driver"""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    # asyncpg calls libpq's sslmode "ssl"
+    if "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+
+def _pool_options(settings: Settings, queue_pool_class) -> dict:
+    """Engine keyword arguments for the configured pool mode"""
+    if settings.db_pool_mode == "null":
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": queue_pool_class,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+class Database:
+    """Sync and async engines for one Settings; building it opens no connection"""
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+        # Sync engine: maintenance commands and scripts
+        self.engine = create_engine(
+            settings.database_url,
+            echo=settings.db_echo,  # logs SQL
+            **_pool_options(settings, TimedQueuePool)
+        )
+
+        # Async engine: API requests
+        self.async_engine = create_async_engine(
+            settings.async_database_url or _async_url(settings.database_url),
+            echo=settings.db_echo,
+            **_pool_options(settings, TimedAsyncQueuePool)
+        )
+
+        # Async read replicas (READ_REPLICA_URLS): GET requests, see replicas.py
+        self.replica_engines = [
+            create_async_engine(
+                _async_url(url),
+                echo=settings.db_echo,
+                **_pool_options(settings, TimedAsyncQueuePool)
+            )
+            for url in settings.read_replica_urls
+        ]
+        self._replica_turn = itertools.count()
+
+        # Statement/row counters for record_queries() and per-request metrics
+        for engine in [self.engine, self.async_engine.sync_engine] + [e.sync_engine for e in self.replica_engines]:
+            install_query_stats(engine)
+            install_slow_query_log(engine, settings.slow_query_ms)
 
-# Class Sesion
+    def read_engine(self):
+        """Next replica, round-robin"""
+        return self.replica_engines[next(self._replica_turn) % len(self.replica_engines)]
+
+    async def dispose(self):
+        for engine in self.replica_engines:
+            await engine.dispose()
+        await self.async_engine.dispose()
+        self.engine.dispose()
+
+
+# Class Sesion, bound to the engines by init_database()
 SessionLocal = sessionmaker(
     autocommit=False,
+    autoflush=False
+)
+
+# Objects stay usable after commit: attribute refreshes would need IO outside await
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
+_database: Optional[Database] = None
+
+
+def init_database(settings: Optional[Settings] = None) -> Database:
+    """Build the engines for settings (default: get_settings()) and bind the session factories"""
+    global _database
+    _database = Database(settings or get_settings())
+    SessionLocal.configure(bind=_database.engine)
+    AsyncSessionLocal.configure(bind=_database.async_engine)
+    return _database
+
+
+def get_database() -> Database:
+    """The current engines, built from get_settings() on first use"""
+    return _database if _database is not None else init_database()
+
 # Base Class
 Base = declarative_base()
 
@@ -40,3 +126,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def _session_for(request: Request) -> AsyncSession:
+    """Replica session for reads, unless the reader wrote within the read-your-writes window"""
+    database = get_database()
+    if request.method not in READ_METHODS or not database.replica_engines:
+        return AsyncSessionLocal()
+    if read_your_writes.is_sticky(reader_ids(request)):
+        read_your_writes.routed(replica=False, sticky=True)
+        return AsyncSessionLocal()
+    read_your_writes.routed(replica=True)
+    return AsyncSessionLocal(bind=database.read_engine(), info={"replica": True})
+
+async def get_async_db(request: Request):
+    async with _session_for(request) as db:
+        yield db
@@ -0,0 +1,204 @@
+# config/instrumentation.py
+"""
+Request and SQL instrumentation, cheap enough to leave on in production.
+
+InstrumentationMiddleware wraps every HTTP request in a QueryStats recording
+(see query_stats.py). It adds a Server-Timing header and feeds per-route
+latency, DB time and statement histograms that /metrics renders in the
+Prometheus text format. Statements slower than SLOW_QUERY_MS are logged with
+their normalized SQL and the route that issued them.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from .query_stats import QueryStats, _current_stats
+
+logger = logging.getLogger("app.sql")
+
+# Seconds; the usual Prometheus defaults, trimmed at both ends
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route template of the request being handled, e.g. "/publications/by-page/{page_id}"
+_current_route: ContextVar[Optional[dict]] = ContextVar("current_route", default=None)
+
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\$\d+|%\([^)]*\)s|\?)(?:::\w+(?:\s\w+)*)?\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """One line, and expanded IN (...) parameter lists collapsed to a single (...)"""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def route_template(scope: Optional[dict]) -> str:
+    """The matched route's path template; raw paths would explode the label set"""
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_route() -> str:
+    return route_template(_current_route.get())
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            # Per-bucket counts (plus +Inf), sum
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self._series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{{{label_text}}} {total:.6f}"
+            yield f"{self.name}_count{{{label_text}}} {cumulative}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """Process-wide request and SQL metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Request latency by route",
+            ("method", "route", "status"), LATENCY_BUCKETS,
+        )
+        self.db_time = Histogram(
+            "http_request_db_seconds", "Database time per request by route",
+            ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.statements = Histogram(
+            "http_request_sql_statements", "SQL statements per request by route",
+            ("method", "route"), STATEMENT_BUCKETS,
+        )
+        self.slow_queries = 0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: QueryStats):
+        with self._lock:
+            self.latency.observe((method, route, str(status)), seconds)
+            self.db_time.observe((method, route), stats.db_time)
+            self.statements.observe((method, route), stats.statements)
+
+    def observe_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self, gauges: Dict[str, Tuple[str, Dict[tuple, float]]] = None) -> str:
+        """Prometheus text exposition; gauges: {name: (help, {(label pairs): value})}"""
+        with self._lock:
+            lines = []
+            for histogram in (self.latency, self.db_time, self.statements):
+                lines.extend(histogram.render())
+            lines.append("# HELP sql_slow_queries_total Statements slower than SLOW_QUERY_MS")
+            lines.append("# TYPE sql_slow_queries_total counter")
+            lines.append(f"sql_slow_queries_total {self.slow_queries}")
+        for name, (help_text, samples) in (gauges or {}).items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples.items():
+                label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def install_slow_query_log(engine, threshold_ms: float):
+    """Log statements slower than threshold_ms (0 disables) with the route that ran them"""
+    if threshold_ms <= 0:
+        return
+    threshold = threshold_ms / 1000
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if elapsed >= threshold:
+            request_metrics.observe_slow_query()
+            logger.warning(
+                "slow query %.1fms route=%s sql=%s",
+                elapsed * 1000, current_route(), normalize_sql(statement),
+            )
+
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware: per-request query stats, Server-Timing and metrics"""
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(parent=_current_stats.get())
+        stats_token = _current_stats.set(stats)
+        route_token = _current_route.set(scope)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Streaming bodies keep querying after this; their timing is partial
+                    total = (time.perf_counter() - start) * 1000
+                    value = (
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries", '
+                        f"app;dur={total:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", value.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.observe_request(
+                scope["method"], route_template(scope), status, time.perf_counter() - start, stats
+            )
+            _current_route.reset(route_token)
+            _current_stats.reset(stats_token)
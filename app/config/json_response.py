@@ -0,0 +1,16 @@
+# config/json_response.py
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON body encoded by orjson. Returning one from a route skips FastAPI's
+    response_model validation and jsonable_encoder: only for data the app
+    built itself in the exact response shape (UUIDs and datetimes included).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,89 @@
+# config/query_stats.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+
+
+class QueryStats:
+    """Statements, rows and database time recorded while a block runs"""
+
+    def __init__(self, keep_statements: bool = False, parent: "Optional[QueryStats]" = None):
+        # Enclosing recording (e.g. a benchmark around a request): it sees everything too
+        self.parent = parent
+        self.statements = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.keep_statements = keep_statements
+        self.executed: List[str] = []
+
+    def record(self, statement: str, rowcount: int, seconds: float):
+        self.statements += 1
+        # DBAPI reports -1 when the row count is unknown
+        if rowcount and rowcount > 0:
+            self.rows += rowcount
+        self.db_time += seconds
+        if self.keep_statements:
+            self.executed.append(statement)
+        if self.parent is not None:
+            self.parent.record(statement, rowcount, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "statements": self.statements,
+            "rows": self.rows,
+            "db_time_ms": round(self.db_time * 1000, 3),
+        }
+
+
+# Per task/thread: concurrent requests never see each other's counts
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def record_queries(keep_statements: bool = False):
+    """
+    Count the SQL issued inside the block on any engine with query stats installed:
+
+        with record_queries() as stats:
+            await client.get("/publications/all-items")
+        assert stats.statements == 2
+    """
+    stats = QueryStats(keep_statements, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None and context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+def _rowcount(cursor) -> int:
+    rowcount = cursor.rowcount
+    if (rowcount is None or rowcount < 0) and cursor.description is not None:
+        # SELECT on a driver that does not count rows (sqlite): the asyncio
+        # adapters have already fetched them into a buffer
+        rowcount = len(getattr(cursor, "_rows", ()))
+    return rowcount
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start = getattr(context, "_query_stats_start", None)
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+    stats.record(statement, _rowcount(cursor), elapsed)
+
+
+def install_query_stats(engine):
+    """Attach the recording hooks to a (sync) engine; async engines pass .sync_engine"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,114 @@
+# config/replicas.py
+"""
+Read-replica routing.
+
+GET and HEAD requests run on a replica (round-robin when there are several),
+everything else on the primary. A user who wrote in the last
+READ_YOUR_WRITES_SECONDS reads from the primary as well, so replication lag
+never hides their own writes from them. The window is kept in process memory:
+with several workers it only covers the worker that handled the write, so keep
+it comfortably above the usual replica lag.
+"""
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from .settings import Settings
+
+# Methods that may be served by a replica
+READ_METHODS = ("GET", "HEAD")
+
+# Expired entries are dropped once the window map grows past this
+PRUNE_AT = 10_000
+
+# 0 when the replica has replayed everything it received; NULL on a primary
+LAG_QUERY = text(
+    "SELECT pg_is_in_recovery(), CASE"
+    " WHEN NOT pg_is_in_recovery() THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+LAG_TIMEOUT = 2.0
+
+
+class ReadYourWrites:
+    """Which users wrote recently, and how reads were routed"""
+
+    def __init__(self, window: float):
+        self.window = window
+        self._written: Dict[str, float] = {}
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    def wrote(self, *user_ids):
+        """Route these users' reads to the primary for the next `window` seconds"""
+        if self.window <= 0:
+            return
+        until = time.monotonic() + self.window
+        for user_id in user_ids:
+            if user_id is not None:
+                self._written[str(user_id)] = until
+        if len(self._written) > PRUNE_AT:
+            now = time.monotonic()
+            self._written = {user_id: until for user_id, until in self._written.items() if until > now}
+
+    def is_sticky(self, user_ids: Iterable[Optional[str]]) -> bool:
+        now = time.monotonic()
+        for user_id in user_ids:
+            if user_id is not None and self._written.get(str(user_id), 0.0) > now:
+                return True
+        return False
+
+    def routed(self, replica: bool, sticky: bool = False):
+        if replica:
+            self.replica_reads += 1
+        else:
+            self.primary_reads += 1
+            if sticky:
+                self.sticky_reads += 1
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "window_seconds": self.window,
+            "sticky_users": sum(1 for until in self._written.values() if until > now),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+        }
+
+
+def reader_ids(request):
+    """Users a request reads on behalf of: user-id header, viewer_id, a {user_id} path parameter"""
+    return (
+        request.headers.get("user-id"),
+        request.query_params.get("viewer_id"),
+        request.path_params.get("user_id"),
+    )
+
+
+def describe_url(url) -> str:
+    """host:port/database, without credentials"""
+    url = make_url(url) if isinstance(url, str) else url
+    return f"{url.host}:{url.port or 5432}/{url.database}"
+
+
+async def replica_lag(engine) -> dict:
+    """Whether the server is a standby and how far behind the primary it is (seconds)"""
+    async def _query():
+        async with engine.connect() as connection:
+            return (await connection.execute(LAG_QUERY)).one()
+
+    try:
+        in_recovery, lag = await asyncio.wait_for(_query(), LAG_TIMEOUT)
+    except Exception as exc:
+        return {"error": repr(exc)}
+    return {"in_recovery": in_recovery, "lag_seconds": float(lag) if lag is not None else None}
+
+
+read_your_writes = ReadYourWrites(window=Settings.read_your_writes_seconds)
@@ -0,0 +1,168 @@
+# config/settings.py
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_list(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration read from the environment (.env)"""
+    database_url: str
+    # Defaults to DATABASE_URL through the asyncpg driver
+    async_database_url: Optional[str] = None
+
+    # Pool: "queue" keeps connections open between requests, "null" opens one per checkout
+    db_pool_mode: str = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_echo: bool = False
+
+    # Read replicas (DATABASE_URL format) for GET requests; a user's reads stay on the
+    # primary for this many seconds after they write
+    read_replica_urls: Tuple[str, ...] = ()
+    read_your_writes_seconds: float = 5.0
+
+    # In-process read cache for publication routes
+    publication_cache_size: int = 2048
+    publication_cache_ttl: float = 30.0
+    publication_cache_routes: Tuple[str, ...] = ("by-id", "by-page", "by-user", "by-tags", "all-items")
+
+    # Rows per server-side cursor fetch in /publications/export
+    export_chunk_size: int = 500
+
+    # List routes: column-projected rows encoded straight to JSON (off: ORM objects + PublicationResponse)
+    fast_list_responses: bool = True
+
+    # Write-behind buffer for /reactions/toggle (off: every toggle commits on its own)
+    reaction_write_behind: bool = False
+    reaction_buffer_flush_ms: int = 200
+    reaction_buffer_max_ops: int = 1000
+
+    # Trending feed: score half-life, reaction weights and how often scores are re-decayed
+    trending_half_life_hours: float = 24.0
+    trending_like_weight: float = 1.0
+    trending_dislike_weight: float = 0.5
+    trending_redecay_seconds: int = 300
+
+    # Deleting a user: accounts with more publications + reactions than the threshold
+    # are purged in the background, batch_size publications per transaction (0: never)
+    user_purge_threshold: int = 5000
+    user_purge_batch_size: int = 500
+
+    # Hourly reaction rollups older than this many days are pruned (0 keeps them); daily ones are kept
+    rollup_hourly_retention_days: int = 90
+
+    # Seconds between version checks of the cached tag/degree/page tables
+    reference_cache_check_seconds: float = 5.0
+
+    # Instrumentation: statements slower than this are logged (0 disables), Server-Timing header
+    slow_query_ms: float = 200.0
+    server_timing: bool = True
+
+    # gzip/brotli for JSON and text responses of at least this many bytes (0 disables)
+    compression_min_bytes: int = 1024
+
+    # Startup: open pool connections, run the hot queries once and load the reference cache
+    # before reporting ready. 0 connections: db_pool_size
+    startup_warmup: bool = True
+    warmup_connections: int = 0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise ValueError("La variable DATABASE_URL no está definida (entorno o archivo .env)")
+
+        pool_mode = os.getenv("DB_POOL_MODE", "queue").strip().lower()
+        if pool_mode not in ("queue", "null"):
+            raise ValueError(f"DB_POOL_MODE inválido: {pool_mode} (use 'queue' o 'null')")
+
+        return cls(
+            database_url=database_url,
+            async_database_url=os.getenv("ASYNC_DATABASE_URL") or None,
+            db_pool_mode=pool_mode,
+            db_pool_size=_env_int("DB_POOL_SIZE", cls.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", cls.db_max_overflow),
+            db_pool_timeout=_env_float("DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", cls.db_pool_recycle),
+            db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.db_pool_pre_ping),
+            db_echo=_env_bool("DB_ECHO", cls.db_echo),
+            read_replica_urls=_env_list("READ_REPLICA_URLS", cls.read_replica_urls),
+            read_your_writes_seconds=_env_float("READ_YOUR_WRITES_SECONDS", cls.read_your_writes_seconds),
+            publication_cache_size=_env_int("PUBLICATION_CACHE_SIZE", cls.publication_cache_size),
+            publication_cache_ttl=_env_float("PUBLICATION_CACHE_TTL", cls.publication_cache_ttl),
+            publication_cache_routes=_env_list("PUBLICATION_CACHE_ROUTES", cls.publication_cache_routes),
+            export_chunk_size=_env_int("EXPORT_CHUNK_SIZE", cls.export_chunk_size),
+            fast_list_responses=_env_bool("FAST_LIST_RESPONSES", cls.fast_list_responses),
+            reaction_write_behind=_env_bool("REACTION_WRITE_BEHIND", cls.reaction_write_behind),
+            reaction_buffer_flush_ms=_env_int("REACTION_BUFFER_FLUSH_MS", cls.reaction_buffer_flush_ms),
+            reaction_buffer_max_ops=_env_int("REACTION_BUFFER_MAX_OPS", cls.reaction_buffer_max_ops),
+            trending_half_life_hours=_env_float("TRENDING_HALF_LIFE_HOURS", cls.trending_half_life_hours),
+            trending_like_weight=_env_float("TRENDING_LIKE_WEIGHT", cls.trending_like_weight),
+            trending_dislike_weight=_env_float("TRENDING_DISLIKE_WEIGHT", cls.trending_dislike_weight),
+            trending_redecay_seconds=_env_int("TRENDING_REDECAY_SECONDS", cls.trending_redecay_seconds),
+            user_purge_threshold=_env_int("USER_PURGE_THRESHOLD", cls.user_purge_threshold),
+            user_purge_batch_size=_env_int("USER_PURGE_BATCH_SIZE", cls.user_purge_batch_size),
+            rollup_hourly_retention_days=_env_int("ROLLUP_HOURLY_RETENTION_DAYS", cls.rollup_hourly_retention_days),
+            reference_cache_check_seconds=_env_float("REFERENCE_CACHE_CHECK_SECONDS", cls.reference_cache_check_seconds),
+            slow_query_ms=_env_float("SLOW_QUERY_MS", cls.slow_query_ms),
+            server_timing=_env_bool("SERVER_TIMING", cls.server_timing),
+            compression_min_bytes=_env_int("COMPRESSION_MIN_BYTES", cls.compression_min_bytes),
+            startup_warmup=_env_bool("STARTUP_WARMUP", cls.startup_warmup),
+            warmup_connections=_env_int("WARMUP_CONNECTIONS", cls.warmup_connections),
+        )
+
+
+_settings: Optional[Settings] = None
+
+
+def load_settings(env_file: Optional[str] = ".env") -> Settings:
+    """Settings from the environment, after loading env_file (relative to the CWD) if it exists"""
+    if env_file:
+        dotenv_path = os.path.join(os.getcwd(), env_file)
+        if os.path.exists(dotenv_path):
+            load_dotenv(dotenv_path)
+    return Settings.from_env()
+
+
+def configure_settings(settings: Settings) -> Settings:
+    """Make settings the ones get_settings() returns (create_app, tests)"""
+    global _settings
+    _settings = settings
+    return settings
+
+
+def get_settings() -> Settings:
+    """Active settings; read from .env and the environment on first use if none were configured"""
+    if _settings is None:
+        return configure_settings(load_settings())
+    return _settings
@@ -1,32 +1,113 @@
 # app/main.py
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
-from app.config.database import get_db
+from app.config.compression import CompressionMiddleware
+from app.config.database import init_database
+from app.config.instrumentation import InstrumentationMiddleware
+from app.config.replicas import read_your_writes
+from app.config.settings import Settings, configure_settings, load_settings
 from fastapi.middleware.cors import CORSMiddleware
 
 from .routes import (
     publication_routes,
     user_routes,
-    reaction_routes
+    reaction_routes,
+    reference_routes,
+    health_routes,
+    metrics_routes
 )
+from .services.cache import publication_cache
+from .services.reaction_buffer import reaction_buffer
+from .services.reaction_rollup_service import rollup_prune_job
+from .services.reference_cache import reference_cache
+from .services.trending_service import trending_decay_job
+from .services.user_purge import user_purger
+from .services.warmup_service import startup_warmup
 
-# Create FastAPI app
-app = FastAPI(
-    title="Proyecto Realidad Nacional",
-    description="Backend del aplicativo de realidad nacional",
-    version="1.0.0"
-)
 
-# CORS middleware to allow frontend connections
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["https://propuestas-peru.onrender.com", "http://propuestas-peru.onrender.com"],  # Update with your Next.js frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def _configure_services(settings: Settings):
+    """Size the process-wide caches, buffers and jobs from settings"""
+    publication_cache.max_entries = settings.publication_cache_size
+    publication_cache.ttl = settings.publication_cache_ttl
+    reference_cache.check_interval = settings.reference_cache_check_seconds
+    reaction_buffer.flush_interval = settings.reaction_buffer_flush_ms / 1000
+    reaction_buffer.max_pending = settings.reaction_buffer_max_ops
+    trending_decay_job.interval = settings.trending_redecay_seconds
+    read_your_writes.window = settings.read_your_writes_seconds
+    user_purger.threshold = settings.user_purge_threshold
+    user_purger.batch_size = settings.user_purge_batch_size
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database = app.state.database
+    # Serving starts only after this; /health/ready stays 503 until a warm-up succeeds
+    if not await startup_warmup.run(database):
+        startup_warmup.retry(database)
+    if database.settings.reaction_write_behind:
+        reaction_buffer.start()
+    trending_decay_job.start()
+    rollup_prune_job.start()
+    yield
+    await startup_warmup.stop()
+    await trending_decay_job.stop()
+    await rollup_prune_job.stop()
+    await user_purger.stop()
+    # Flush buffered reactions before the process exits
+    await reaction_buffer.stop()
+    await database.dispose()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the application for settings (default: .env and the environment).
+    Engines are created here, not at import; connections open during startup.
+    """
+    settings = configure_settings(settings or load_settings())
+    database = init_database(settings)
+    _configure_services(settings)
+
+    app = FastAPI(
+        title="Proyecto Realidad Nacional",
+        description="Backend del aplicativo de realidad nacional",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    app.state.settings = settings
+    app.state.database = database
+
+    # CORS middleware to allow frontend connections
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["https://propuestas-peru.onrender.com", "http://propuestas-peru.onrender.com"],  # Update with your Next.js frontend URL
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    app.include_router(publication_routes.router)
+    app.include_router(user_routes.router)
+    app.include_router(reaction_routes.router)
+    app.include_router(reference_routes.router)
+    app.include_router(health_routes.router)
+    app.include_router(metrics_routes.router)
+
+    if settings.compression_min_bytes > 0:
+        app.add_middleware(CompressionMiddleware, min_bytes=settings.compression_min_bytes)
+
+    # Outermost: timings cover CORS handling and the whole response
+    app.add_middleware(InstrumentationMiddleware, server_timing=settings.server_timing)
+    return app
 
 
-# Include routers
-app.include_router(publication_routes.router)
-app.include_router(user_routes.router)
-app.include_router(reaction_routes.router)
\ No newline at end of file
+def __getattr__(name: str):
+    # `uvicorn app.main:app` and `from app.main import app` still work: the
+    # default app is built on first access instead of at import
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,11 @@
 # models/__init__.py
 from .user import User
 from .publication import Publication
+from .publication_tag import PublicationTag
 from .page import Page
 from .tag import Tag
 from .degree import Degree
-from .reaction import Reaction
\ No newline at end of file
+from .reaction import Reaction
+from .reaction_rollup import PageReactionRollup, PublicationReactionRollup
+from .trending import PublicationTrending, TrendingState
+from .reference_data_version import ReferenceDataVersion
@@ -9,4 +9,4 @@ class Page(Base):
     id = Column(Integer, primary_key=True)
     url = Column(String(255), nullable=False)
 
-    publications = relationship("Publication", back_populates="page", lazy="joined")
+    publications = relationship("Publication", back_populates="page", lazy="raise")
@@ -1,7 +1,7 @@
 # models/publication.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, Integer, String, ForeignKey, DateTime, text
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 import uuid
 from ..config.database import Base
 
@@ -12,12 +12,39 @@ class Publication(Base):
     title = Column(String(255), nullable=False)
     content = Column(String, nullable=False)
     date = Column(DateTime, nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     page_id = Column(Integer, ForeignKey("page.id"), nullable=False)
 
-    user = relationship("User", back_populates="publications", lazy="joined")
-    page = relationship("Page", back_populates="publications", lazy="joined")
+    # Denormalized counters, maintained by ReactionService.toggle_reaction
+    likes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    dislikes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    # Card data for view=summary listings, set on create and update (content_summary.py)
+    excerpt = Column(String(300), nullable=True)
+    word_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    # ETag validator: bumped on update and on every reaction change
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    # Full-text search document (Spanish), kept up to date by Postgres on every
+    # insert/update. Never loaded with the row: only used inside search queries
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('spanish', coalesce(content, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+        raiseload=True,
+    )
+
+    user = relationship("User", back_populates="publications", lazy="raise")
+    page = relationship("Page", back_populates="publications", lazy="raise")
+    # Deleting a publication leaves its reactions and tag links to ON DELETE CASCADE
+    # (passive_deletes: the ORM never loads them just to delete them row by row)
     tags = relationship(
-        "Tag", secondary="publication_tag", back_populates="publications", lazy="joined", 
+        "Tag", secondary="publication_tag", back_populates="publications", lazy="raise", passive_deletes=True,
     )
-    reactions = relationship("Reaction", back_populates="publication", cascade="all, delete-orphan")
\ No newline at end of file
+    reactions = relationship("Reaction", back_populates="publication", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
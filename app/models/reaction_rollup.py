@@ -0,0 +1,32 @@
+# models/reaction_rollup.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..config.database import Base
+
+class PublicationReactionRollup(Base):
+    """
+    Likes and dislikes per publication and UTC time bucket (granularity "hour"
+    or "day"), counting the current reactions whose date falls in the bucket.
+    Maintained by ReactionRollupService.
+    """
+    __tablename__ = "publication_reaction_rollup"
+
+    publication_id = Column(UUID(as_uuid=True), ForeignKey("publication.id", ondelete="CASCADE"), primary_key=True)
+    granularity = Column(String(8), primary_key=True)
+    # Start of the bucket, UTC without time zone
+    bucket = Column(DateTime, primary_key=True)
+    # The publication's page, moved along with it: page leaderboards read only their own buckets
+    page_id = Column(Integer, nullable=False)
+    likes = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    dislikes = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+class PageReactionRollup(Base):
+    """The same buckets summed over every publication of a page"""
+    __tablename__ = "page_reaction_rollup"
+
+    page_id = Column(Integer, ForeignKey("page.id", ondelete="CASCADE"), primary_key=True)
+    granularity = Column(String(8), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    likes = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    dislikes = Column(Integer, nullable=False, default=0, server_default=text("0"))
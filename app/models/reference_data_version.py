@@ -0,0 +1,10 @@
+# models/reference_data_version.py
+from sqlalchemy import BigInteger, Column, String, text
+from ..config.database import Base
+
+class ReferenceDataVersion(Base):
+    """Write counter per reference table (tag, degree, page), bumped by triggers"""
+    __tablename__ = "reference_data_version"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1, server_default=text("1"))
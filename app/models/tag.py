@@ -13,5 +13,5 @@ class Tag(Base):
     description = Column(String, nullable=True)
 
     publications = relationship(
-        "Publication", secondary="publication_tag", back_populates="tags", lazy="joined"
+        "Publication", secondary="publication_tag", back_populates="tags", lazy="raise"
     )
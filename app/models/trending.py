@@ -0,0 +1,26 @@
+# models/trending.py
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..config.database import Base
+
+class PublicationTrending(Base):
+    """
+    Time-decayed reaction score per publication, maintained by TrendingService.
+    Scores are stored relative to an epoch, the same one for every row once the
+    re-decay job has run, so their order is the order of the current decayed
+    scores and top-K is an index scan.
+    """
+    __tablename__ = "publication_trending"
+
+    publication_id = Column(UUID(as_uuid=True), ForeignKey("publication.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, default=0, server_default=text("0"))
+    # The time score is expressed at; NULL (rows from before migration 013): TrendingState.epoch
+    epoch = Column(DateTime(timezone=True), nullable=True)
+
+class TrendingState(Base):
+    """Single row: the epoch new trending scores are expressed at, moved by the re-decay job"""
+    __tablename__ = "trending_state"
+
+    id = Column(Integer, primary_key=True, default=1)
+    epoch = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
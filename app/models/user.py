@@ -1,5 +1,5 @@
 # models/user.py
-from sqlalchemy import Column, DateTime, String, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -16,7 +16,10 @@ class User(Base):
     password = Column(String, nullable=True)
     resetPasswordToken = Column(String, nullable=True)
     resetPasswordExpires = Column(DateTime, nullable=True)
-    degreeId = Column(String, ForeignKey("degree.id"), nullable=False)
+    degreeId = Column(Integer, ForeignKey("degree.id"), nullable=False)
+    # ETag validator: bumped by UserService.update_user
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
 
-    publications = relationship("Publication", back_populates="user", lazy="joined", cascade="all, delete-orphan")
-    reactions = relationship("Reaction", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # Publications and reactions go with the user through ON DELETE CASCADE
+    publications = relationship("Publication", back_populates="user", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    reactions = relationship("Reaction", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
@@ -0,0 +1,59 @@
+# routes/health_routes.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ..config.database import get_database
+from ..config.settings import get_settings
+from ..config.pool import pool_status
+from ..config.replicas import describe_url, read_your_writes, replica_lag
+from ..services.cache import publication_cache
+from ..services.reaction_buffer import reaction_buffer
+from ..services.reference_cache import reference_cache
+from ..services.user_purge import user_purger
+from ..services.warmup_service import startup_warmup
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/ready")
+async def get_readiness():
+    """200 once the startup warm-up finished, 503 before (or while shutting down)"""
+    return JSONResponse(startup_warmup.status(), status_code=200 if startup_warmup.ready else 503)
+
+@router.get("/db")
+async def get_db_health():
+    """Report connection pool occupancy and checkout wait times"""
+    database = get_database()
+    return {
+        "pool_mode": database.settings.db_pool_mode,
+        "pool": pool_status(database.async_engine.pool),
+        "sync_pool": pool_status(database.engine.pool),
+        "replica_pools": [pool_status(engine.pool) for engine in database.replica_engines],
+    }
+
+@router.get("/replicas")
+async def get_replica_health():
+    """Report each read replica's replication lag and how reads were routed"""
+    database = get_database()
+    replicas = []
+    for engine in database.replica_engines:
+        replicas.append({"url": describe_url(engine.url), **(await replica_lag(engine))})
+    return {"replicas": replicas, "read_your_writes": read_your_writes.stats()}
+
+@router.get("/cache")
+async def get_cache_health():
+    """Report publication cache size, hit/miss ratio and evictions"""
+    return {
+        "enabled_routes": list(get_settings().publication_cache_routes),
+        "publications": publication_cache.stats(),
+        "reference": reference_cache.stats(),
+    }
+
+@router.get("/reaction-buffer")
+async def get_reaction_buffer_health():
+    """Report pending buffered reactions and how many writes coalescing saved"""
+    return reaction_buffer.stats()
+
+@router.get("/user-purge")
+async def get_user_purge_health():
+    """Report background account purges: running, done, and the longest batch"""
+    return user_purger.stats()
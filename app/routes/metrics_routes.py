@@ -0,0 +1,49 @@
+# routes/metrics_routes.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..config.database import get_database
+from ..config.instrumentation import request_metrics
+from ..config.pool import pool_status
+from ..services.cache import publication_cache
+
+router = APIRouter(tags=["metrics"])
+
+POOL_GAUGES = {
+    "size": "Configured pool size",
+    "checked_out": "Connections in use",
+    "idle": "Connections idle in the pool",
+    "overflow": "Connections open beyond the pool size",
+    "checkouts": "Connection checkouts since start",
+    "timeouts": "Checkouts that timed out",
+    "wait_max_ms": "Longest checkout wait (ms)",
+    "wait_total_ms": "Total checkout wait (ms)",
+}
+
+CACHE_GAUGES = ("entries", "hits", "misses", "evictions", "expirations", "invalidations")
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition: per-route latency, DB time, statements, pool and cache"""
+    database = get_database()
+    pools = {"async": pool_status(database.async_engine.pool), "sync": pool_status(database.engine.pool)}
+    for index, engine in enumerate(database.replica_engines):
+        pools[f"replica-{index}"] = pool_status(engine.pool)
+    gauges = {}
+    for key, help_text in POOL_GAUGES.items():
+        samples = {
+            (("engine", name),): status[key]
+            for name, status in pools.items()
+            if key in status
+        }
+        if samples:
+            gauges[f"db_pool_{key}"] = (help_text, samples)
+
+    cache = publication_cache.stats()
+    for key in CACHE_GAUGES:
+        gauges[f"publication_cache_{key}"] = (f"Publication cache {key}", {(): cache[key]})
+
+    return PlainTextResponse(
+        request_metrics.render(gauges),
+        media_type="text/plain; version=0.0.4",
+    )
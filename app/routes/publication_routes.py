@@ -1,131 +1,328 @@
 # routes/publication_routes.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 import uuid
 
 from app.schemas.reaction_schema import ReactionType
 
-from ..config.database import get_db
+from ..config.database import get_async_db
+from ..config.json_response import FastJSONResponse
+from ..config.replicas import read_your_writes
 from ..services.publication_service import PublicationService
-from ..schemas.publication_schema import PublicationCreate, PublicationUpdate, PublicationResponse, TagSchema
+from ..services.publication_cache_service import PublicationCacheService
+from ..services.publication_row_service import PublicationRowService
+from ..services.etag_service import ETagService, etag_matches
+from ..services.export_service import ExportService
+from ..services.bulk_import_service import BulkImportService
+from ..services.search_service import SearchService
+from ..services.trending_service import TrendingService
+from ..services.reaction_service import ReactionService
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..services.projection import PUBLICATION_FIELDS, PublicationProjection
+from ..schemas.publication_schema import PublicationCreate, PublicationUpdate, PublicationResponse, PublicationListResponse, TagSchema
+from ..schemas.publication_schema import PublicationBulkCreate, PublicationBulkResponse, PublicationSearchResponse, TrendingListResponse
 
 router = APIRouter(prefix="/publications", tags=["publications"])
 
+def publication_projection(
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated subset of: {', '.join(PUBLICATION_FIELDS)}"
+    ),
+) -> PublicationProjection:
+    """view=summary (excerpt and word_count instead of content) or a fields= sparse fieldset"""
+    try:
+        return PublicationProjection.parse(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _list_response(page, etag: Optional[str] = None, projection: Optional[PublicationProjection] = None):
+    """Row fast-path pages go straight to the JSON encoder, model pages through response_model"""
+    fast = PublicationRowService.serves(projection) if projection else PublicationRowService.enabled()
+    if fast:
+        return FastJSONResponse(page, headers={"ETag": etag} if etag else None)
+    return page
+
 @router.post("/", response_model=PublicationResponse)
-def create_publication(
+async def create_publication(
     publication: PublicationCreate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new publication"""
     try:
-        db_publication = PublicationService.create_publication(db, publication, publication.user_id)
+        db_publication = await PublicationService.create_publication(db, publication, publication.user_id)
+        read_your_writes.wrote(publication.user_id)
         return db_publication
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk", response_model=PublicationBulkResponse)
+async def bulk_create_publications(
+    payload: PublicationBulkCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many publications in one transaction, with a result per item"""
+    try:
+        result = await BulkImportService.import_publications(db, payload.items)
+        read_your_writes.wrote(*{item.user_id for item in payload.items})
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.put("/{publication_id}/{user_id}", response_model=PublicationResponse)
-def update_publication(
+async def update_publication(
     publication_id: uuid.UUID, 
     user_id: uuid.UUID,
     publication: PublicationUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing publication, only if the user is the owner"""
     try:
-        db_publication = PublicationService.update_publication(
+        db_publication = await PublicationService.update_publication(
             db, publication_id, publication, user_id
         )
         if not db_publication:
             raise HTTPException(status_code=404, detail="Publication not found")
+        read_your_writes.wrote(user_id)
         return db_publication
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
 
 @router.delete("/{publication_id}/{user_id}")
-def delete_publication(
+async def delete_publication(
     publication_id: uuid.UUID, 
     user_id: uuid.UUID,  # Post by path
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a publication, only if the user is the owner"""
     try:
-        success = PublicationService.delete_publication(db, publication_id, user_id)  # Pasamos el user_id
+        success = await PublicationService.delete_publication(db, publication_id, user_id)  # Pasamos el user_id
         if not success:
             raise HTTPException(status_code=404, detail="Publication not found")
+        read_your_writes.wrote(user_id)
         return {"detail": "Publication deleted successfully"}
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
     
-@router.get("/all-items", response_model=List[PublicationResponse])
-def get_all_publications(db: Session = Depends(get_db)):
-    """Get all publications."""
-    db_publications = PublicationService.get_all_publications(db)
-    if not db_publications:
-        raise HTTPException(status_code=200, detail="No publications found")
-    return db_publications
-
-@router.get("/user-reactions/{user_id}/likes", response_model=List[PublicationResponse])
-def get_user_liked_publications(
+@router.get("/all-items", response_model=PublicationListResponse)
+async def get_all_publications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    if_none_match: Optional[str] = Header(None),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all publications, newest first, one page at a time."""
+    try:
+        version = await ETagService.all_publications(db, cursor, limit, variant=projection.etag_variant)
+        etag = ETagService.for_viewer(version, viewer_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        page = await PublicationCacheService.get_all_publications(
+            db, cursor, limit, use_cache=PublicationCacheService.enabled("all-items"),
+            projection=projection, version=version,
+        )
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), etag, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/user-reactions/{user_id}/likes", response_model=PublicationListResponse)
+async def get_user_liked_publications(
     user_id: uuid.UUID, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get publications liked by a user"""
-    return PublicationService.get_user_reactions(db, user_id, ReactionType.LIKE)
+    try:
+        if PublicationRowService.serves(projection):
+            page = await PublicationRowService.get_user_reactions(db, user_id, ReactionType.LIKE, cursor, limit, projection)
+        else:
+            page = await PublicationService.get_user_reactions(db, user_id, ReactionType.LIKE, cursor, limit)
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), projection=projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/user-reactions/{user_id}/dislikes", response_model=List[PublicationResponse])
-def get_user_disliked_publications(
+@router.get("/user-reactions/{user_id}/dislikes", response_model=PublicationListResponse)
+async def get_user_disliked_publications(
     user_id: uuid.UUID, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get publications disliked by a user"""
-    return PublicationService.get_user_reactions(db, user_id, ReactionType.DISLIKE)
+    try:
+        if PublicationRowService.serves(projection):
+            page = await PublicationRowService.get_user_reactions(db, user_id, ReactionType.DISLIKE, cursor, limit, projection)
+        else:
+            page = await PublicationService.get_user_reactions(db, user_id, ReactionType.DISLIKE, cursor, limit)
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), projection=projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/by-page/{page_id}", response_model=List[PublicationResponse])
-def get_publications_by_page(
+@router.get("/by-page/{page_id}", response_model=PublicationListResponse)
+async def get_publications_by_page(
     page_id: int, 
-    #skip: int = 0, 
-    #limit: int = 10, 
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    if_none_match: Optional[str] = Header(None),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get publications for a specific page"""
-    return PublicationService.get_publications_by_page(db, page_id)
+    try:
+        version = await ETagService.publications_by_page(db, page_id, cursor, limit, variant=projection.etag_variant)
+        etag = ETagService.for_viewer(version, viewer_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        page = await PublicationCacheService.get_publications_by_page(
+            db, page_id, cursor, limit, use_cache=PublicationCacheService.enabled("by-page"),
+            projection=projection, version=version,
+        )
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), etag, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/by-user/{user_id}", response_model=List[PublicationResponse])
-def get_publications_by_user(
+@router.get("/by-user/{user_id}", response_model=PublicationListResponse)
+async def get_publications_by_user(
     user_id: uuid.UUID, 
-    #skip: int = 0, 
-    #limit: int = 10, 
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    if_none_match: Optional[str] = Header(None),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get publications for a specific user"""
-    return PublicationService.get_publications_by_user(db, user_id)
+    try:
+        version = await ETagService.publications_by_user(db, user_id, cursor, limit, variant=projection.etag_variant)
+        etag = ETagService.for_viewer(version, viewer_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        page = await PublicationCacheService.get_publications_by_user(
+            db, user_id, cursor, limit, use_cache=PublicationCacheService.enabled("by-user"),
+            projection=projection, version=version,
+        )
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), etag, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/by-tags", response_model=List[PublicationResponse])
-def get_publications_by_tags(
+@router.get("/by-tags", response_model=PublicationListResponse)
+async def get_publications_by_tags(
+    response: Response,
     tag_ids: List[int] = Query(..., min_items=1),
-    #skip: int = 0, 
-    #limit: int = 10, 
-    db: Session = Depends(get_db)
+    mode: Literal["any", "all"] = "any",
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    if_none_match: Optional[str] = Header(None),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Obtener publicaciones con las etiquetas especificadas"""
-    return PublicationService.get_publications_by_tags(db, tag_ids)
+    """Obtener publicaciones con alguna (mode=any) o todas (mode=all) las etiquetas especificadas"""
+    try:
+        version = await ETagService.publications_by_tags(db, tag_ids, cursor, limit, mode, variant=projection.etag_variant)
+        etag = ETagService.for_viewer(version, viewer_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        page = await PublicationCacheService.get_publications_by_tags(
+            db, tag_ids, cursor, limit, mode, use_cache=PublicationCacheService.enabled("by-tags"),
+            projection=projection, version=version,
+        )
+        return _list_response(await ReactionService.with_viewer_reactions(db, page, viewer_id), etag, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/search", response_model=PublicationSearchResponse)
+async def search_publications(
+    q: str = Query(..., min_length=1, max_length=200),
+    page_id: Optional[int] = None,
+    tag_ids: Optional[List[int]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over title and content, best match first, with highlighted snippets"""
+    try:
+        page = await SearchService.search_publications(db, q, page_id, tag_ids, cursor, limit, projection)
+        return page if projection.is_default else FastJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/trending", response_model=TrendingListResponse)
+async def get_trending_publications(
+    page_id: Optional[int] = None,
+    tag_ids: Optional[List[int]] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    viewer_id: Optional[uuid.UUID] = None,
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Publications with the most recent reaction activity, hottest first"""
+    page = await TrendingService.get_trending(db, page_id, tag_ids, limit, projection)
+    page = await ReactionService.with_viewer_reactions(db, page, viewer_id)
+    return page if projection.is_default else FastJSONResponse(page)
+
+@router.get("/export")
+async def export_publications(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format")
+):
+    """Stream every publication (with counts and tags) as NDJSON or CSV"""
+    if export_format == "csv":
+        return StreamingResponse(
+            ExportService.stream_csv(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="publications.csv"'},
+        )
+    return StreamingResponse(ExportService.stream_ndjson(), media_type="application/x-ndjson")
 
 @router.get("/{publication_id}/tags", response_model=List[TagSchema])
-def get_publication_tags(
+async def get_publication_tags(
     publication_id: uuid.UUID, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get tags for a specific publication"""
-    return PublicationService.get_publication_tags(db, publication_id)
+    return await PublicationService.get_publication_tags(db, publication_id)
 
 @router.get("/{publication_id}", response_model=PublicationResponse)
-def get_publication_by_id(
+async def get_publication_by_id(
     publication_id: uuid.UUID, 
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    projection: PublicationProjection = Depends(publication_projection),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a publication by its ID"""
-    publication = PublicationService.get_publication_by_id(db, publication_id)
+    # Version check first: a 304 never loads the publication itself
+    etag = await ETagService.publication(db, publication_id, projection.etag_variant)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    publication = await PublicationCacheService.get_publication_by_id(
+        db, publication_id, use_cache=PublicationCacheService.enabled("by-id"), projection=projection,
+        version=etag,
+    )
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
+    if not projection.is_default:
+        return FastJSONResponse(publication, headers={"ETag": etag})
     return publication
\ No newline at end of file
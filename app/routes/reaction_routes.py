@@ -1,39 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Literal, Optional
 import uuid
 
-from ..config.database import get_db
+from ..config.database import get_async_db
+from ..config.replicas import read_your_writes
+from ..models.publication import Publication
+from ..services.reaction_rollup_service import ReactionRollupService
 from ..services.reaction_service import ReactionService
-from ..schemas.reaction_schema import ReactionCreate, PublicationReactionCountResponse
+from ..schemas.reaction_schema import (
+    ReactionCreate,
+    PublicationReactionCountResponse,
+    ReactionBatchCreate,
+    ReactionBatchResponse,
+    ReactionLookupRequest,
+    ReactionLookupResponse,
+    ReactionSeriesResponse,
+    ReactionLeaderboardResponse,
+)
 from ..schemas.publication_schema import PublicationResponse
 
 router = APIRouter(prefix="/reactions", tags=["reactions"])
 
 @router.post("/toggle")
-def toggle_reaction(
+async def toggle_reaction(
     reaction: ReactionCreate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle a reaction to a publication"""
     try:
-        reaction_result = ReactionService.toggle_reaction(db, reaction)
+        reaction_result = await ReactionService.toggle_reaction(db, reaction)
+        read_your_writes.wrote(reaction.id_user)
         return {"detail": "Reaction updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/batch", response_model=ReactionBatchResponse)
+async def toggle_reactions_batch(
+    batch: ReactionBatchCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Apply many reaction toggles in one transaction, in order"""
+    try:
+        results = await ReactionService.apply_toggles(db, batch.items)
+        read_your_writes.wrote(*{item.id_user for item in batch.items})
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    failed = sum(1 for result in results if "error" in result)
+    return {"applied": len(results) - failed, "failed": failed, "results": results}
+
+@router.post("/lookup", response_model=ReactionLookupResponse)
+async def lookup_user_reactions(
+    lookup: ReactionLookupRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """A user's reaction (or None) to each of many publications, with one query"""
+    reactions = await ReactionService.get_user_reactions_for(db, lookup.id_user, lookup.publication_ids)
+    return {
+        "items": [
+            {"id_publication": publication_id, "reaction_type": reactions.get(publication_id)}
+            for publication_id in lookup.publication_ids
+        ]
+    }
+
 @router.get("/reaction-get/{user_id}/{publication_id}", response_model=dict)
-def check_user_reaction(
+async def check_user_reaction(
     user_id: uuid.UUID, 
     publication_id: uuid.UUID, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Check if a user has reacted to a publication (like or dislike)"""
     try:
-        reaction_info = ReactionService.check_user_reaction(db, user_id, publication_id)
+        reaction_info = await ReactionService.check_user_reaction(db, user_id, publication_id)
         if reaction_info["exists"]:
             return {"exists": True, "reaction_type": reaction_info["reaction_type"]}
         else:
             return {"exists": False, "reaction_type": reaction_info["reaction_type"]}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/counts/{publication_id}", response_model=PublicationReactionCountResponse)
+async def get_publication_reaction_counts(
+    publication_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """A publication's like and dislike counters"""
+    counts = (await db.execute(
+        select(Publication.likes_count, Publication.dislikes_count).where(Publication.id == publication_id)
+    )).first()
+    if counts is None:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    return {"likes_count": counts.likes_count, "dislikes_count": counts.dislikes_count}
+
+@router.get("/series/publication/{publication_id}", response_model=ReactionSeriesResponse)
+async def get_publication_reaction_series(
+    publication_id: uuid.UUID,
+    granularity: Literal["hour", "day"] = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Likes and dislikes per hour or day for a publication, from the rollups (default: last 48h / 30 days)"""
+    try:
+        return await ReactionRollupService.publication_series(db, publication_id, granularity, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/series/page/{page_id}", response_model=ReactionSeriesResponse)
+async def get_page_reaction_series(
+    page_id: int,
+    granularity: Literal["hour", "day"] = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Likes and dislikes per hour or day across a page, from the rollups"""
+    try:
+        return await ReactionRollupService.page_series(db, page_id, granularity, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/leaderboard/{page_id}", response_model=ReactionLeaderboardResponse)
+async def get_page_reaction_leaderboard(
+    page_id: int,
+    granularity: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    metric: Literal["likes", "dislikes", "net"] = "likes",
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """A page's most liked (or disliked, or net liked) publications over a range, from the rollups"""
+    try:
+        return await ReactionRollupService.page_leaderboard(db, page_id, granularity, start, end, metric, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
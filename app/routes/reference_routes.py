@@ -0,0 +1,49 @@
+# routes/reference_routes.py
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from ..config.database import get_async_db
+from ..schemas.publication_schema import TagSchema
+from ..schemas.reference_schema import DegreeSchema
+from ..services.etag_service import etag_matches
+from ..services.reference_cache import reference_cache
+
+router = APIRouter(tags=["reference"])
+
+def _reference_etag(table: str) -> Optional[str]:
+    """None while the table has no reference_data_version row: nothing to validate against"""
+    version = reference_cache.versions.get(table)
+    if version is None:
+        return None
+    return f'"r-{table}-{version}"'
+
+@router.get("/tags", response_model=List[TagSchema])
+async def get_tags(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """All tags, served from the reference data cache"""
+    tags = await reference_cache.tags(db)
+    etag = _reference_etag("tag")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if etag:
+        response.headers["ETag"] = etag
+    return tags
+
+@router.get("/degrees", response_model=List[DegreeSchema])
+async def get_degrees(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """All degrees, served from the reference data cache"""
+    degrees = await reference_cache.degrees(db)
+    etag = _reference_etag("degree")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if etag:
+        response.headers["ETag"] = etag
+    return degrees
@@ -1,18 +1,21 @@
 # routes/user_routes.py
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from ..config.database import get_db
+from ..config.database import get_async_db
+from ..config.replicas import read_your_writes
 from ..schemas.user_schema import UserUpdate, UserResponse, UserPublicResponse
 from ..services.user_service import UserService
+from ..services.etag_service import ETagService, etag_matches
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.put("/me", response_model=UserResponse)
 async def update_user(
     user_update: UserUpdate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     user_id: Optional[str] = Header(None)
 ):
     """
@@ -23,12 +26,16 @@ async def update_user(
         raise HTTPException(status_code=401, detail="User ID is required")
     
     service = UserService(db)
-    return service.update_user(user_id, user_update)
+    user = await service.update_user(user_id, user_update)
+    read_your_writes.wrote(user_id)
+    return user
 
 @router.get("/me", response_model=UserPublicResponse)
 async def get_user_info(
-    db: Session = Depends(get_db), 
-    user_id: Optional[str] = Header(None)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db), 
+    user_id: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get current user's information
@@ -37,20 +44,31 @@ async def get_user_info(
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID is required")
 
+    etag = await ETagService.user(db, user_id)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if etag:
+        response.headers["ETag"] = etag
+
     service = UserService(db)
-    return service.get_user_info(user_id)
+    return await service.get_user_info(user_id)
 
 @router.delete("/me")
 async def delete_user(
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     user_id: Optional[str] = Header(None)
 ):
     """
     Delete current user
     Requires user ID for authentication
+    Large accounts are purged in the background: 202 instead of 200
     """
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID is required")
     
     service = UserService(db)
-    return service.delete_user(user_id)
\ No newline at end of file
+    result = await service.delete_user(user_id)
+    read_your_writes.wrote(user_id)
+    if result.get("purging"):
+        return JSONResponse(result, status_code=202)
+    return result
\ No newline at end of file
@@ -1,10 +1,11 @@
 # schemas/publication_schema.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
 from app.schemas.user_schema import UserBase
+from app.schemas.reaction_schema import ReactionType
 
 class Page(BaseModel):
     id: int
@@ -45,6 +46,53 @@ class PublicationResponse(PublicationBase):
     page_id: int
     likes_count: int = 0
     dislikes_count: int = 0
+    # The viewer's own reaction, only filled in when the request names a viewer_id
+    viewer_reaction: Optional[ReactionType] = None
     
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class PublicationListResponse(BaseModel):
+    items: List[PublicationResponse]
+    next_cursor: Optional[str] = None
+
+class TrendingPublicationResponse(PublicationResponse):
+    # Current time-decayed score
+    trending_score: float = 0.0
+
+class TrendingListResponse(BaseModel):
+    items: List[TrendingPublicationResponse]
+
+class PublicationSearchItem(BaseModel):
+    id: UUID
+    title: str
+    date: datetime
+    user_id: UUID
+    user: UserBase
+    page_id: int
+    page: Page
+    tags: List[TagSchema]
+    likes_count: int = 0
+    dislikes_count: int = 0
+    rank: float
+    # Matching fragments of content, matches wrapped in <mark></mark>
+    snippet: str
+
+class PublicationSearchResponse(BaseModel):
+    items: List[PublicationSearchItem]
+    next_cursor: Optional[str] = None
+
+BULK_IMPORT_MAX_ITEMS = 1000
+
+class PublicationBulkCreate(BaseModel):
+    items: List[PublicationCreate] = Field(..., min_length=1, max_length=BULK_IMPORT_MAX_ITEMS)
+
+class PublicationBulkItemResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+class PublicationBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[PublicationBulkItemResult]
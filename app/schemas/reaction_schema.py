@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -20,4 +21,66 @@ class ReactionResponse(BaseModel):
 
 class PublicationReactionCountResponse(BaseModel):
     likes_count: int = 0
-    dislikes_count: int = 0
\ No newline at end of file
+    dislikes_count: int = 0
+REACTION_BATCH_MAX_ITEMS = 1000
+
+class ReactionBatchCreate(BaseModel):
+    items: List[ReactionCreate] = Field(..., min_length=1, max_length=REACTION_BATCH_MAX_ITEMS)
+
+class ReactionBatchItemResult(BaseModel):
+    index: int
+    id_user: UUID
+    id_publication: UUID
+    # added | removed | flipped | unchanged
+    transition: Optional[str] = None
+    # Reaction left in place after the toggle (None when removed or on error)
+    reaction_type: Optional[ReactionType] = None
+    error: Optional[str] = None
+
+class ReactionBatchResponse(BaseModel):
+    applied: int
+    failed: int
+    results: List[ReactionBatchItemResult]
+
+REACTION_LOOKUP_MAX_ITEMS = 500
+
+class ReactionLookupRequest(BaseModel):
+    id_user: UUID
+    publication_ids: List[UUID] = Field(..., min_length=1, max_length=REACTION_LOOKUP_MAX_ITEMS)
+
+class ReactionLookupItem(BaseModel):
+    id_publication: UUID
+    reaction_type: Optional[ReactionType] = None
+
+class ReactionLookupResponse(BaseModel):
+    items: List[ReactionLookupItem]
+
+class ReactionBucket(BaseModel):
+    # Start of the hour or day (UTC)
+    bucket: datetime
+    likes: int
+    dislikes: int
+
+class ReactionSeriesResponse(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    likes: int
+    dislikes: int
+    # Only buckets with reactions, oldest first
+    buckets: List[ReactionBucket]
+
+class ReactionLeaderboardItem(BaseModel):
+    publication_id: UUID
+    title: str
+    likes: int
+    dislikes: int
+    net: int
+
+class ReactionLeaderboardResponse(BaseModel):
+    page_id: int
+    granularity: str
+    start: datetime
+    end: datetime
+    metric: str
+    items: List[ReactionLeaderboardItem]
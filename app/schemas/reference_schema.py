@@ -0,0 +1,6 @@
+# schemas/reference_schema.py
+from pydantic import BaseModel
+
+class DegreeSchema(BaseModel):
+    id: int
+    title: str
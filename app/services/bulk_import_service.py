@@ -0,0 +1,99 @@
+# services/bulk_import_service.py
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select
+from datetime import datetime
+import uuid
+
+from ..models.publication import Publication
+from ..models.publication_tag import PublicationTag
+from ..models.user import User
+from ..schemas.publication_schema import PublicationCreate
+from .cache import invalidate_publication
+from .content_summary import summarize_content
+from .reference_cache import reference_cache
+
+# Rows per multi-row INSERT, well below the 32767 bind parameter limit
+INSERT_BATCH_SIZE = 500
+
+# publication.title is a VARCHAR(255): one longer title would fail the whole INSERT
+TITLE_MAX_LENGTH = Publication.__table__.c.title.type.length
+
+class BulkImportService:
+    @staticmethod
+    async def _existing(db: AsyncSession, column, values) -> set:
+        if not values:
+            return set()
+        result = await db.execute(select(column).where(column.in_(values)))
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def import_publications(db: AsyncSession, items: List[PublicationCreate]):
+        """
+        Create many publications in one transaction.
+        Tags and pages referenced by the whole batch are validated against the
+        reference data cache and users with one query, titles against the column
+        length; valid items are inserted with multi-row INSERTs and invalid ones
+        are reported without blocking the rest.
+        """
+        tag_ids = {tag_id for item in items for tag_id in item.tags}
+        page_ids = {item.page_id for item in items}
+        user_ids = {item.user_id for item in items}
+
+        existing_tags = await reference_cache.existing_tag_ids(db, tag_ids)
+        existing_pages = await reference_cache.existing_page_ids(db, page_ids)
+        existing_users = await BulkImportService._existing(db, User.id, user_ids)
+
+        now = datetime.utcnow()
+        results = []
+        publication_rows = []
+        created_items = []
+        tag_rows = []
+        for index, item in enumerate(items):
+            errors = []
+            if len(item.title) > TITLE_MAX_LENGTH:
+                errors.append(f"Title longer than {TITLE_MAX_LENGTH} characters")
+            invalid_tags = set(item.tags) - existing_tags
+            if invalid_tags:
+                errors.append(f"Invalid tags: {invalid_tags}")
+            if item.page_id not in existing_pages:
+                errors.append(f"Invalid page: {item.page_id}")
+            if item.user_id not in existing_users:
+                errors.append(f"Invalid user: {item.user_id}")
+            if errors:
+                results.append({"index": index, "error": "; ".join(errors)})
+                continue
+
+            publication_id = uuid.uuid4()
+            excerpt, word_count = summarize_content(item.content)
+            publication_rows.append({
+                "id": publication_id,
+                "title": item.title,
+                "content": item.content,
+                "excerpt": excerpt,
+                "word_count": word_count,
+                "date": now,
+                "user_id": item.user_id,
+                "page_id": item.page_id,
+            })
+            tag_rows.extend(
+                {"publication_id": publication_id, "tag_id": tag_id} for tag_id in set(item.tags)
+            )
+            created_items.append(item)
+            results.append({"index": index, "id": publication_id})
+
+        try:
+            for start in range(0, len(publication_rows), INSERT_BATCH_SIZE):
+                await db.execute(insert(Publication).values(publication_rows[start:start + INSERT_BATCH_SIZE]))
+            for start in range(0, len(tag_rows), INSERT_BATCH_SIZE):
+                await db.execute(insert(PublicationTag).values(tag_rows[start:start + INSERT_BATCH_SIZE]))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        for row, item in zip(publication_rows, created_items):
+            invalidate_publication(row["id"], item.page_id, item.tags, item.user_id, created=True)
+
+        created = len(publication_rows)
+        return {"created": created, "failed": len(items) - created, "results": results}
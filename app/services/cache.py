@@ -0,0 +1,166 @@
+# services/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+from ..config.settings import Settings
+
+MISSING = object()
+
+# Invalidation stamps kept for set() to check; older ones are forgotten and
+# values loaded before them are not stored at all
+INVALIDATION_HISTORY = 10000
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with a TTL and dependency-based invalidation.
+
+    Every entry is stored with the dependency keys it was built from, e.g.
+    ("publication", id) for each item it contains, ("author", user_id) for the
+    author fields embedded in it and ("page", page_id) for the collection it
+    belongs to. Writes invalidate exactly the entries that depend on what they
+    touched.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._dependents: dict = {}
+        # Ticked by every invalidation, which stamps the dependency keys it names:
+        # set() drops a value only if one of its own keys was stamped since it was loaded
+        self.generation = 0
+        self._stamps: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Values loaded before this generation are never stored (clear(), forgotten stamps)
+        self._floor = 0
+        # monotonic() of the latest invalidation (replica reads check it, see publication_cache_service)
+        self.invalidated_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, depends_on: Iterable[Hashable] = (), generation: int = None):
+        """
+        Store a value; skipped when generation (self.generation before loading it)
+        is given and one of its dependency keys was invalidated since
+        """
+        if self.max_entries <= 0:
+            return
+        deps = frozenset(depends_on)
+        with self._lock:
+            if generation is not None and self._stale(deps, generation):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, deps)
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _stale(self, deps, generation: int) -> bool:
+        if generation < self._floor:
+            return True
+        return any(self._stamps.get(dep, 0) > generation for dep in deps)
+
+    def invalidate(self, *deps: Hashable):
+        """Drop every entry built from any of the given dependency keys"""
+        with self._lock:
+            self.generation += 1
+            self.invalidated_at = time.monotonic()
+            for dep in deps:
+                self._stamps[dep] = self.generation
+                self._stamps.move_to_end(dep)
+                for key in list(self._dependents.get(dep, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+            while len(self._stamps) > INVALIDATION_HISTORY:
+                _, stamp = self._stamps.popitem(last=False)
+                self._floor = max(self._floor, stamp)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._floor = self.generation
+            self._stamps.clear()
+            self.invalidated_at = time.monotonic()
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._dependents.clear()
+
+    def _remove(self, key: Hashable):
+        _, _, deps = self._entries.pop(key)
+        for dep in deps:
+            keys = self._dependents.get(dep)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dep]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Publication reads (see publication_cache_service.py). Per process: writes in
+# other workers do not invalidate it, but entries are stored with the ETag they
+# were built at and not served under another one. Sized from the active
+# settings by create_app().
+publication_cache = ResponseCache(
+    max_entries=Settings.publication_cache_size,
+    ttl=Settings.publication_cache_ttl,
+)
+
+
+def invalidate_publication(publication_id, page_id=None, tag_ids: Iterable[int] = (), user_id=None, created: bool = False):
+    """
+    Invalidate what a write to one publication can change: entries containing it,
+    and the collections it now belongs to (it may have just entered them).
+    """
+    deps = [("publication", publication_id)]
+    if page_id is not None:
+        deps.append(("page", page_id))
+    deps.extend(("tag", tag_id) for tag_id in tag_ids)
+    if created:
+        deps.append(("user", user_id))
+        deps.append(("all",))
+    publication_cache.invalidate(*deps)
+
+
+def invalidate_author(user_id):
+    """Invalidate every entry embedding the author fields of a user (name, mail, bio, degree)"""
+    publication_cache.invalidate(("author", user_id), ("author",))
@@ -0,0 +1,24 @@
+# services/content_summary.py
+import re
+from typing import Tuple
+
+# Characters of content kept in a publication's stored excerpt (view=summary)
+EXCERPT_LENGTH = 280
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def summarize_content(content: str) -> Tuple[str, int]:
+    """
+    (excerpt, word_count) stored with a publication. The excerpt is the content
+    with whitespace collapsed, cut at the last word boundary within
+    EXCERPT_LENGTH characters. Mirrors the backfill in migration 008.
+    """
+    text = _WHITESPACE.sub(" ", content).strip()
+    word_count = len(text.split(" ")) if text else 0
+    if len(text) <= EXCERPT_LENGTH:
+        return text, word_count
+    head = text[:EXCERPT_LENGTH + 1]
+    if " " in head:
+        head = head.rsplit(" ", 1)[0]
+    return head[:EXCERPT_LENGTH].rstrip() + "…", word_count
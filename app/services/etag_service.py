@@ -0,0 +1,109 @@
+# services/etag_service.py
+"""
+Strong ETags computed from version stamps, without loading the ORM graph.
+
+A publication's ETag comes from its version (bumped on update and on every
+reaction change) and its author's version. A list page's ETag hashes the
+(id, version, author version) of exactly the rows the page would return,
+read with the same keyset window as the page itself. Sparse fieldsets and
+view=summary pass a variant, so each response shape has its own ETag.
+
+The ETag without a viewer also versions the cached bodies (see
+publication_cache_service.py): a body cached under another ETag is not served.
+"""
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+import hashlib
+import uuid
+
+from ..models.publication import Publication
+from ..models.user import User
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_window
+from .publication_service import PublicationService
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    If-None-Match check (comma-separated list or '*'). Weak comparison, as
+    RFC 9110 asks for: compressed responses carry W/ of the same tag.
+    """
+    if not if_none_match or not etag:
+        return False
+    candidates = [_opaque(value.strip()) for value in if_none_match.split(",")]
+    return "*" in candidates or _opaque(etag) in candidates
+
+class ETagService:
+    @staticmethod
+    async def _list_etag(db: AsyncSession, name: str, statement, cursor: Optional[str], limit: int, viewer_id: Optional[uuid.UUID] = None, variant: str = ""):
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        window = keyset_window(
+            statement.join(User, User.id == Publication.user_id)
+            .with_only_columns(Publication.id, Publication.version, User.version),
+            cursor,
+            limit,
+        )
+        rows = (await db.execute(window)).all()
+
+        digest = hashlib.sha1(f"{name}|{cursor}|{limit}|{variant}".encode())
+        for publication_id, version, user_version in rows:
+            digest.update(f"|{publication_id}:{version}:{user_version}".encode())
+        return ETagService.for_viewer(f'"l-{digest.hexdigest()}"', viewer_id)
+
+    @staticmethod
+    def for_viewer(etag: str, viewer_id: Optional[uuid.UUID]) -> str:
+        """
+        A list ETag for a viewer. viewer_reaction changes bump the publication
+        version too; the viewer only has to be part of the tag.
+        """
+        if viewer_id is None:
+            return etag
+        return f'"l-{hashlib.sha1(f"{etag}|{viewer_id}".encode()).hexdigest()}"'
+
+    @staticmethod
+    async def publication(db: AsyncSession, publication_id: uuid.UUID, variant: str = "") -> Optional[str]:
+        """ETag of one publication, None when it does not exist"""
+        row = (await db.execute(
+            select(Publication.version, User.version)
+            .join(User, User.id == Publication.user_id)
+            .where(Publication.id == publication_id)
+        )).first()
+        if row is None:
+            return None
+        suffix = f"-{variant}" if variant else ""
+        return f'"p-{publication_id}-{row[0]}-{row[1]}{suffix}"'
+
+    @staticmethod
+    async def publications_by_page(db: AsyncSession, page_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, viewer_id: Optional[uuid.UUID] = None, variant: str = ""):
+        return await ETagService._list_etag(
+            db, f"by-page:{page_id}", PublicationService.by_page_query(page_id), cursor, limit, viewer_id, variant
+        )
+
+    @staticmethod
+    async def publications_by_user(db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, viewer_id: Optional[uuid.UUID] = None, variant: str = ""):
+        return await ETagService._list_etag(
+            db, f"by-user:{user_id}", PublicationService.by_user_query(user_id), cursor, limit, viewer_id, variant
+        )
+
+    @staticmethod
+    async def publications_by_tags(db: AsyncSession, tag_ids: List[int], cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, mode: str = "any", viewer_id: Optional[uuid.UUID] = None, variant: str = ""):
+        tag_key = ",".join(str(tag_id) for tag_id in sorted(set(tag_ids)))
+        return await ETagService._list_etag(
+            db, f"by-tags:{mode}:{tag_key}", PublicationService.by_tags_query(tag_ids, mode), cursor, limit, viewer_id, variant
+        )
+
+    @staticmethod
+    async def all_publications(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, viewer_id: Optional[uuid.UUID] = None, variant: str = ""):
+        return await ETagService._list_etag(
+            db, "all-items", PublicationService.all_query(), cursor, limit, viewer_id, variant
+        )
+
+    @staticmethod
+    async def user(db: AsyncSession, user_id: str) -> Optional[str]:
+        """ETag of a user profile, None when the user does not exist"""
+        version = (await db.execute(select(User.version).where(User.id == user_id))).scalar()
+        if version is None:
+            return None
+        return f'"u-{user_id}-{version}"'
@@ -0,0 +1,103 @@
+# services/export_service.py
+from typing import AsyncIterator, Dict, List
+from sqlalchemy import select
+import csv
+import io
+import json
+
+from ..config.database import AsyncSessionLocal
+from ..config.settings import get_settings
+from ..models.publication import Publication
+from ..models.publication_tag import PublicationTag
+from ..models.tag import Tag
+
+EXPORT_COLUMNS = (
+    Publication.id,
+    Publication.title,
+    Publication.content,
+    Publication.date,
+    Publication.user_id,
+    Publication.page_id,
+    Publication.likes_count,
+    Publication.dislikes_count,
+)
+
+CSV_HEADER = [
+    "id", "title", "content", "date", "user_id", "page_id",
+    "likes_count", "dislikes_count", "tag_ids", "tag_titles",
+]
+
+class ExportService:
+    """
+    Streams every publication without materializing the table: rows come from a
+    server-side cursor chunk by chunk, tags are fetched with one query per chunk,
+    and each chunk is written out before the next one is read.
+    """
+
+    @staticmethod
+    async def _tags_for(db, publication_ids) -> Dict:
+        result = await db.execute(
+            select(PublicationTag.publication_id, Tag.id, Tag.title)
+            .join(Tag, Tag.id == PublicationTag.tag_id)
+            .where(PublicationTag.publication_id.in_(publication_ids))
+        )
+        tags: Dict = {}
+        for publication_id, tag_id, title in result:
+            tags.setdefault(publication_id, []).append({"id": tag_id, "title": title})
+        return tags
+
+    @staticmethod
+    async def _chunks(chunk_size: int) -> AsyncIterator[List]:
+        """Yield (rows, tags_by_publication) per chunk, on a session of its own"""
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(*EXPORT_COLUMNS)
+                .order_by(Publication.date, Publication.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for rows in result.partitions(chunk_size):
+                tags = await ExportService._tags_for(db, [row.id for row in rows])
+                yield rows, tags
+
+    @staticmethod
+    async def stream_ndjson(chunk_size: int = None) -> AsyncIterator[bytes]:
+        """One JSON object per line"""
+        async for rows, tags in ExportService._chunks(chunk_size or get_settings().export_chunk_size):
+            lines = []
+            for row in rows:
+                lines.append(json.dumps({
+                    "id": str(row.id),
+                    "title": row.title,
+                    "content": row.content,
+                    "date": row.date.isoformat(),
+                    "user_id": str(row.user_id),
+                    "page_id": row.page_id,
+                    "likes_count": row.likes_count,
+                    "dislikes_count": row.dislikes_count,
+                    "tags": tags.get(row.id, []),
+                }, ensure_ascii=False))
+            yield ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    async def stream_csv(chunk_size: int = None) -> AsyncIterator[bytes]:
+        """CSV with a header row; tags as '|'-separated ids and titles"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+
+        async for rows, tags in ExportService._chunks(chunk_size or get_settings().export_chunk_size):
+            for row in rows:
+                row_tags = tags.get(row.id, [])
+                writer.writerow([
+                    row.id, row.title, row.content, row.date.isoformat(),
+                    row.user_id, row.page_id, row.likes_count, row.dislikes_count,
+                    "|".join(str(tag["id"]) for tag in row_tags),
+                    "|".join(tag["title"] or "" for tag in row_tags),
+                ])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header only, when there are no publications
+        if buffer.tell():
+            yield buffer.getvalue().encode()
@@ -0,0 +1,23 @@
+# services/loading.py
+"""
+Relationship loading profiles.
+
+Every relationship in app/models defaults to lazy="raise", so a query only
+loads what its profile asks for and an unplanned access fails loudly instead
+of issuing hidden queries (or, with joined defaults, dragging in every other
+publication of the same page and author).
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..models.publication import Publication
+
+# Everything PublicationResponse serializes: many-to-ones joined into the
+# main query, tags in one extra SELECT ... IN per result set
+PUBLICATION_RESPONSE = (
+    joinedload(Publication.user),
+    joinedload(Publication.page),
+    selectinload(Publication.tags),
+)
+
+# Ownership checks and deletes only need the row itself
+PUBLICATION_ONLY = ()
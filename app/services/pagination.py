@@ -0,0 +1,68 @@
+# services/pagination.py
+from typing import Optional, Tuple
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import json
+import uuid
+
+from ..models.publication import Publication
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(date: datetime, publication_id: uuid.UUID) -> str:
+    """Opaque cursor pointing just after the given (date, id) position"""
+    raw = json.dumps([date.isoformat(), str(publication_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor, raises ValueError on anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, publication_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(date), uuid.UUID(publication_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def encode_rank_cursor(rank: float, publication_id: uuid.UUID) -> str:
+    """Opaque cursor pointing just after the given (rank, id) position of a ranked result"""
+    raw = json.dumps([rank, str(publication_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, uuid.UUID]:
+    """Inverse of encode_rank_cursor, raises ValueError on anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, publication_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), uuid.UUID(publication_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def keyset_window(statement, cursor: Optional[str], limit: int):
+    """
+    Order newest first by (date, id), start after the cursor and fetch one row
+    more than the page size (it tells whether another page exists).
+    The cursor filter turns into an index range scan, so every page costs the same.
+    """
+    statement = statement.order_by(Publication.date.desc(), Publication.id.desc())
+    if cursor:
+        date, publication_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Publication.date, Publication.id) < tuple_(date, publication_id))
+    return statement.limit(limit + 1)
+
+async def paginate_publications(db: AsyncSession, statement, cursor: Optional[str], limit: int):
+    """Keyset pagination over publications, newest first, ordered by (date, id)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    result = await db.execute(keyset_window(statement, cursor, limit))
+    rows = result.unique().scalars().all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,171 @@
+# services/projection.py
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from ..models.page import Page
+from ..models.publication import Publication
+from ..models.user import User
+
+# Every publication field a list item can carry, in response order
+PUBLICATION_FIELDS = (
+    "title", "content", "excerpt", "word_count", "tags", "id", "date", "user_id", "user",
+    "page", "page_id", "likes_count", "dislikes_count", "viewer_reaction",
+)
+
+# view=full is PublicationResponse; view=summary swaps content for the stored excerpt
+VIEWS = {
+    "full": tuple(field for field in PUBLICATION_FIELDS if field not in ("excerpt", "word_count")),
+    "summary": tuple(field for field in PUBLICATION_FIELDS if field != "content"),
+}
+
+# Selectable columns by label
+COLUMNS = {
+    "id": Publication.id,
+    "title": Publication.title,
+    "content": Publication.content,
+    "excerpt": Publication.excerpt,
+    "word_count": Publication.word_count,
+    "date": Publication.date,
+    "user_id": Publication.user_id,
+    "page_id": Publication.page_id,
+    "likes_count": Publication.likes_count,
+    "dislikes_count": Publication.dislikes_count,
+    "user_name": User.name,
+    "user_lastName": User.lastName,
+    "user_mail": User.mail,
+    "user_bio": User.bio,
+    "user_degreeId": User.degreeId,
+    "page_url": Page.url,
+}
+
+USER_COLUMNS = ("user_name", "user_lastName", "user_mail", "user_bio", "user_degreeId")
+
+# Columns each field is built from; tags and viewer_reaction are looked up by id
+FIELD_COLUMNS = {
+    "user": USER_COLUMNS,
+    "page": ("page_id", "page_url"),
+    "tags": ("id",),
+    "viewer_reaction": ("id",),
+}
+
+
+# The same fields read from a loaded Publication entity (search, trending)
+ENTITY_GETTERS = {
+    "user": lambda publication: {
+        "name": publication.user.name,
+        "lastName": publication.user.lastName,
+        "mail": publication.user.mail,
+        "bio": publication.user.bio,
+        "degreeId": publication.user.degreeId,
+    },
+    "page": lambda publication: {"id": publication.page.id, "url": publication.page.url},
+    "tags": lambda publication: [
+        {"id": tag.id, "title": tag.title, "description": tag.description} for tag in publication.tags
+    ],
+    "viewer_reaction": lambda publication: None,
+}
+
+
+class PublicationProjection:
+    """
+    Which publication fields a response carries (view=full|summary, fields=...),
+    and therefore which columns are selected, which relationships are loaded
+    and which keys every item gets. `id` is always included.
+    """
+
+    def __init__(self, fields: Iterable[str], default: bool = False):
+        fields = set(fields) | {"id"}
+        self.fields: Tuple[str, ...] = tuple(field for field in PUBLICATION_FIELDS if field in fields)
+        # The plain view=full: the shape PublicationResponse and the ORM path produce
+        self.is_default = default
+
+        labels = ["id", "date"]
+        for field in self.fields:
+            for label in FIELD_COLUMNS.get(field, (field,)):
+                if label not in labels:
+                    labels.append(label)
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self.columns = tuple(COLUMNS[label].label(label) for label in self.labels)
+        self.needs_user = "user" in self.fields
+        self.needs_page = "page" in self.fields
+        self.needs_tags = "tags" in self.fields
+        self._getters = [(field, self._getter(field)) for field in self.fields]
+
+    @classmethod
+    def parse(cls, view: str = "full", fields: Optional[str] = None) -> "PublicationProjection":
+        """From the view and fields= query parameters; ValueError on unknown names"""
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view}")
+        if not fields:
+            return cls(VIEWS[view], default=view == "full")
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(PUBLICATION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return cls(requested)
+
+    @property
+    def key(self) -> Tuple[str, ...]:
+        """Part of cache keys: one entry per shape"""
+        return self.fields
+
+    @property
+    def etag_variant(self) -> str:
+        """Mixed into ETags so each shape has its own; empty for the default view"""
+        if self.is_default:
+            return ""
+        return hashlib.sha1(",".join(self.fields).encode()).hexdigest()[:8]
+
+    def _getter(self, field: str):
+        position = {label: index for index, label in enumerate(self.labels)}
+        if field == "user":
+            name, last_name, mail, bio, degree_id = (position[label] for label in USER_COLUMNS)
+            return lambda row, tags: {
+                "name": row[name],
+                "lastName": row[last_name],
+                "mail": row[mail],
+                "bio": row[bio],
+                "degreeId": row[degree_id],
+            }
+        if field == "page":
+            page_id, url = position["page_id"], position["page_url"]
+            return lambda row, tags: {"id": row[page_id], "url": row[url]}
+        if field == "tags":
+            publication_id = position["id"]
+            return lambda row, tags: tags.get(row[publication_id], [])
+        if field == "viewer_reaction":
+            # Filled in by ReactionService.with_viewer_reactions
+            return lambda row, tags: None
+        index = position[field]
+        return lambda row, tags: row[index]
+
+    def build_items(self, rows: Iterable[Sequence], tags: Dict) -> List[dict]:
+        """Items from rows selected with self.columns and each publication's tag dicts"""
+        getters = self._getters
+        return [{field: get(row, tags) for field, get in getters} for row in rows]
+
+    def orm_options(self) -> list:
+        """Loader options for queries that load Publication entities (search, trending)"""
+        attributes = [
+            COLUMNS[label] for label in self.labels if label not in USER_COLUMNS and label != "page_url"
+        ]
+        options = [load_only(*attributes)]
+        if self.needs_user:
+            options.append(joinedload(Publication.user).load_only(*(COLUMNS[label] for label in USER_COLUMNS)))
+        if self.needs_page:
+            options.append(joinedload(Publication.page))
+        if self.needs_tags:
+            options.append(selectinload(Publication.tags))
+        return options
+
+    def entity_item(self, publication: Publication) -> dict:
+        """An item from a Publication loaded with orm_options()"""
+        return {
+            field: ENTITY_GETTERS[field](publication) if field in ENTITY_GETTERS else getattr(publication, field)
+            for field in self.fields
+        }
+
+
+FULL_VIEW = PublicationProjection.parse("full")
@@ -0,0 +1,175 @@
+# services/publication_cache_service.py
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+import time
+import uuid
+
+from ..config.replicas import read_your_writes
+from ..config.settings import get_settings
+from ..schemas.publication_schema import PublicationListResponse, PublicationResponse
+from .cache import MISSING, publication_cache
+from .pagination import DEFAULT_PAGE_SIZE
+from .projection import FULL_VIEW, PublicationProjection
+from .publication_row_service import PublicationRowService
+from .publication_service import PublicationService
+
+class PublicationCacheService:
+    """Read-through cache in front of the PublicationService read methods"""
+
+    @staticmethod
+    def enabled(route: str) -> bool:
+        """Whether a route serves from the cache (PUBLICATION_CACHE_ROUTES)"""
+        return route in get_settings().publication_cache_routes
+
+    @staticmethod
+    def _storable(db: AsyncSession) -> bool:
+        """
+        A replica may not have replayed the write behind the latest invalidation yet;
+        its results are only cached once that is a read-your-writes window old
+        """
+        if not db.info.get("replica"):
+            return True
+        return time.monotonic() - publication_cache.invalidated_at >= read_your_writes.window
+
+    @staticmethod
+    def _cached(key, version: Optional[str]):
+        """
+        The cached response for key if it was built at version (the response's
+        ETag without a viewer). Writes in other workers do not invalidate this
+        process's entries, but they do change the version.
+        """
+        cached = publication_cache.get(key)
+        if cached is MISSING:
+            return MISSING
+        cached_version, response = cached
+        return response if cached_version == version else MISSING
+
+    @staticmethod
+    def _item_deps(items) -> list:
+        """
+        ("publication", id) for every item, and ("author", user_id) for every item
+        embedding its author. Items showing the author without user_id (a sparse
+        fieldset) depend on ("author",), which every profile update invalidates.
+        """
+        deps = []
+        for item in items:
+            if not isinstance(item, dict):
+                item = {"id": item.id, "user_id": item.user_id, "user": item.user}
+            deps.append(("publication", item["id"]))
+            if "user" in item:
+                deps.append(("author", item["user_id"]) if "user_id" in item else ("author",))
+        return deps
+
+    @staticmethod
+    async def _list(db: AsyncSession, key, collection_deps, load, load_rows, use_cache: bool, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """
+        A list page: a {items: [dict], next_cursor} page from the row fast path
+        (PublicationRowService) or a PublicationListResponse built from ORM objects.
+        Cached pages are served only at the version they were stored with.
+        """
+        fast = PublicationRowService.serves(projection)
+        if fast:
+            # Every shape is cached on its own, never mixed up
+            key = ("rows", projection.key) + key
+        if use_cache:
+            cached = PublicationCacheService._cached(key, version)
+            if cached is not MISSING:
+                return cached
+        generation = publication_cache.generation
+
+        if fast:
+            response = await load_rows()
+            items = response["items"]
+        else:
+            page = await load()
+            response = PublicationListResponse(
+                items=[PublicationResponse.model_validate(item, from_attributes=True) for item in page["items"]],
+                next_cursor=page["next_cursor"],
+            )
+            items = response.items
+
+        if use_cache and PublicationCacheService._storable(db):
+            deps = list(collection_deps) + PublicationCacheService._item_deps(items)
+            publication_cache.set(key, (version, response), deps, generation)
+        return response
+
+    @staticmethod
+    async def get_publication_by_id(db: AsyncSession, publication_id: uuid.UUID, use_cache: bool = True, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """Get a publication by its ID; a cached one only at the given version (its ETag)"""
+        key = ("by-id", publication_id)
+        if not projection.is_default:
+            key += (projection.key,)
+        if use_cache:
+            cached = PublicationCacheService._cached(key, version)
+            if cached is not MISSING:
+                return cached
+        generation = publication_cache.generation
+
+        if projection.is_default:
+            publication = await PublicationService.get_publication_by_id(db, publication_id)
+            response = PublicationResponse.model_validate(publication, from_attributes=True) if publication else None
+        else:
+            response = await PublicationRowService.get_publication_by_id(db, publication_id, projection)
+        if response is None:
+            return None
+
+        if use_cache and PublicationCacheService._storable(db):
+            publication_cache.set(key, (version, response), PublicationCacheService._item_deps([response]), generation)
+        return response
+
+    @staticmethod
+    async def get_publications_by_page(db: AsyncSession, page_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, use_cache: bool = True, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """Get publications for a specific page"""
+        return await PublicationCacheService._list(
+            db,
+            ("by-page", page_id, cursor, limit),
+            [("page", page_id)],
+            lambda: PublicationService.get_publications_by_page(db, page_id, cursor, limit),
+            lambda: PublicationRowService.get_publications_by_page(db, page_id, cursor, limit, projection),
+            use_cache,
+            projection,
+            version,
+        )
+
+    @staticmethod
+    async def get_publications_by_user(db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, use_cache: bool = True, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """Get publications for a specific user"""
+        return await PublicationCacheService._list(
+            db,
+            ("by-user", user_id, cursor, limit),
+            [("user", user_id)],
+            lambda: PublicationService.get_publications_by_user(db, user_id, cursor, limit),
+            lambda: PublicationRowService.get_publications_by_user(db, user_id, cursor, limit, projection),
+            use_cache,
+            projection,
+            version,
+        )
+
+    @staticmethod
+    async def get_publications_by_tags(db: AsyncSession, tag_ids: List[int], cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, mode: str = "any", use_cache: bool = True, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """Get publications that have any (mode="any") or all (mode="all") of the specified tags"""
+        tag_key = tuple(sorted(set(tag_ids)))
+        return await PublicationCacheService._list(
+            db,
+            ("by-tags", mode, tag_key, cursor, limit),
+            [("tag", tag_id) for tag_id in tag_key],
+            lambda: PublicationService.get_publications_by_tags(db, tag_ids, cursor, limit, mode),
+            lambda: PublicationRowService.get_publications_by_tags(db, tag_ids, cursor, limit, mode, projection),
+            use_cache,
+            projection,
+            version,
+        )
+
+    @staticmethod
+    async def get_all_publications(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, use_cache: bool = True, projection: PublicationProjection = FULL_VIEW, version: Optional[str] = None):
+        """Get all publications"""
+        return await PublicationCacheService._list(
+            db,
+            ("all-items", cursor, limit),
+            [("all",)],
+            lambda: PublicationService.get_all_publications(db, cursor, limit),
+            lambda: PublicationRowService.get_all_publications(db, cursor, limit, projection),
+            use_cache,
+            projection,
+            version,
+        )
@@ -0,0 +1,117 @@
+# services/publication_row_service.py
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import get_settings
+from ..models.page import Page
+from ..models.publication import Publication
+from ..models.publication_tag import PublicationTag
+from ..models.user import User
+from ..schemas.reaction_schema import ReactionType
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, keyset_window
+from .projection import FULL_VIEW, PublicationProjection
+from .publication_service import PublicationService
+from .reference_cache import reference_cache
+
+class PublicationRowService:
+    """
+    Fast path for publication list responses.
+
+    Instead of loading Publication objects with their relationships and
+    validating each one into PublicationResponse, a page is one query selecting
+    only the projection's columns, plus (when tags are wanted) one
+    (publication_id, tag_id) lookup resolved against the reference cache.
+    Items are plain dicts in the response shape; the data comes from our own
+    tables, so it is not validated again and goes straight to the JSON encoder
+    (FastJSONResponse).
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the default view uses this path too (FAST_LIST_RESPONSES)"""
+        return get_settings().fast_list_responses
+
+    @staticmethod
+    def serves(projection: PublicationProjection) -> bool:
+        """Summary views and sparse fieldsets only exist on this path"""
+        return not projection.is_default or PublicationRowService.enabled()
+
+    @staticmethod
+    def rows_query(statement, projection: PublicationProjection = FULL_VIEW):
+        """A select(Publication) query, narrowed to the projection's columns and joins"""
+        statement = statement.with_only_columns(*projection.columns, maintain_column_froms=False)
+        if projection.needs_user:
+            statement = statement.join(User, User.id == Publication.user_id)
+        if projection.needs_page:
+            statement = statement.join(Page, Page.id == Publication.page_id)
+        return statement
+
+    @staticmethod
+    async def _tags_for(db: AsyncSession, publication_ids: List[uuid.UUID]) -> Dict[uuid.UUID, List[dict]]:
+        if not publication_ids:
+            return {}
+        pairs = (await db.execute(
+            select(PublicationTag.publication_id, PublicationTag.tag_id)
+            .where(PublicationTag.publication_id.in_(publication_ids))
+        )).all()
+        tag_map = await reference_cache.tag_map(db, {tag_id for _, tag_id in pairs})
+        tags = defaultdict(list)
+        for publication_id, tag_id in pairs:
+            tag = tag_map.get(tag_id)
+            if tag is not None:
+                tags[publication_id].append(tag)
+        return tags
+
+    @staticmethod
+    async def _items(db: AsyncSession, rows, projection: PublicationProjection) -> List[dict]:
+        tags = await PublicationRowService._tags_for(db, [row.id for row in rows]) if projection.needs_tags else {}
+        return projection.build_items(rows, tags)
+
+    @staticmethod
+    async def paginate(db: AsyncSession, statement, cursor: Optional[str], limit: int, projection: PublicationProjection = FULL_VIEW):
+        """Same keyset pages as paginate_publications, as {items: [dict], next_cursor}"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        window = keyset_window(PublicationRowService.rows_query(statement, projection), cursor, limit)
+        rows = (await db.execute(window)).all()
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last.date, last.id)
+
+        items = await PublicationRowService._items(db, page, projection)
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def get_publication_by_id(db: AsyncSession, publication_id: uuid.UUID, projection: PublicationProjection = FULL_VIEW) -> Optional[dict]:
+        statement = PublicationRowService.rows_query(select(Publication), projection).where(Publication.id == publication_id)
+        row = (await db.execute(statement)).first()
+        if row is None:
+            return None
+        return (await PublicationRowService._items(db, [row], projection))[0]
+
+    @staticmethod
+    async def get_publications_by_page(db: AsyncSession, page_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, projection: PublicationProjection = FULL_VIEW):
+        return await PublicationRowService.paginate(db, PublicationService.by_page_query(page_id), cursor, limit, projection)
+
+    @staticmethod
+    async def get_publications_by_user(db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, projection: PublicationProjection = FULL_VIEW):
+        return await PublicationRowService.paginate(db, PublicationService.by_user_query(user_id), cursor, limit, projection)
+
+    @staticmethod
+    async def get_publications_by_tags(db: AsyncSession, tag_ids: List[int], cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, mode: str = "any", projection: PublicationProjection = FULL_VIEW):
+        return await PublicationRowService.paginate(db, PublicationService.by_tags_query(tag_ids, mode), cursor, limit, projection)
+
+    @staticmethod
+    async def get_all_publications(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, projection: PublicationProjection = FULL_VIEW):
+        return await PublicationRowService.paginate(db, PublicationService.all_query(), cursor, limit, projection)
+
+    @staticmethod
+    async def get_user_reactions(db: AsyncSession, id_user: uuid.UUID, type: ReactionType = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, projection: PublicationProjection = FULL_VIEW):
+        return await PublicationRowService.paginate(db, PublicationService.user_reactions_query(id_user, type), cursor, limit, projection)
@@ -1,7 +1,7 @@
 # services/publication_service.py
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import UUID, and_
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import UUID, delete, func, select
 
 from app.models.reaction import Reaction
 from app.schemas.reaction_schema import ReactionType
@@ -9,54 +9,83 @@ from ..models.publication import Publication
 from ..models.tag import Tag
 from ..models.publication_tag import PublicationTag
 from ..schemas.publication_schema import PublicationCreate, PublicationUpdate
+from .cache import invalidate_publication
+from .content_summary import summarize_content
+from .loading import PUBLICATION_ONLY, PUBLICATION_RESPONSE
+from .pagination import DEFAULT_PAGE_SIZE, paginate_publications
+from .reaction_rollup_service import ReactionRollupService
+from .reference_cache import reference_cache
 from datetime import datetime
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class PublicationService:    
     @staticmethod
-    def create_publication(db: Session, publication: PublicationCreate, user_id: uuid.UUID):
+    async def _get(db: AsyncSession, publication_id: uuid.UUID, profile=PUBLICATION_RESPONSE):
+        """Load one publication with the given loading profile, or None"""
+        result = await db.execute(
+            select(Publication)
+            .where(Publication.id == publication_id)
+            .options(*profile)
+            .execution_options(populate_existing=True)
+        )
+        return result.unique().scalars().first()
+
+    @staticmethod
+    async def create_publication(db: AsyncSession, publication: PublicationCreate, user_id: uuid.UUID):
         """Create a new publication"""
             # Validate all tags exist
-        existing_tags = db.query(Tag.id).filter(Tag.id.in_(publication.tags)).all()
-        existing_tag_ids = [tag[0] for tag in existing_tags]
+        existing_tag_ids = await reference_cache.existing_tag_ids(db, publication.tags)
         
         invalid_tags = set(publication.tags) - set(existing_tag_ids)
         if invalid_tags:
             raise ValueError(f"Invalid tags: {invalid_tags}")
         
+        excerpt, word_count = summarize_content(publication.content)
         db_publication = Publication(
             title=publication.title,
             content=publication.content,
+            excerpt=excerpt,
+            word_count=word_count,
             page_id=publication.page_id,
             user_id=user_id,
             date=datetime.utcnow()
         )
         
         db.add(db_publication)
-        db.commit()
-        db.refresh(db_publication)
+        # Flush for the id; the publication and its tags commit together
+        await db.flush()
 
         # Add tags != ''
-        if publication.tags:
-            for tag_id in publication.tags:
-                # Exist?
-                tag = db.query(Tag).filter(Tag.id == tag_id).first()
-                if tag:
-                    publication_tag = PublicationTag(
-                        publication_id=db_publication.id,
-                        tag_id=tag_id
-                    )
-                    db.add(publication_tag)
-            
-            db.commit()
-            db.refresh(db_publication)
+        for tag_id in publication.tags or ():
+            # Exist?
+            if tag_id in existing_tag_ids:
+                publication_tag = PublicationTag(
+                    publication_id=db_publication.id,
+                    tag_id=tag_id
+                )
+                db.add(publication_tag)
+
+        await db.commit()
 
-        return db_publication
+        invalidate_publication(
+            db_publication.id, db_publication.page_id, publication.tags, user_id, created=True
+        )
+        return await PublicationService._get(db, db_publication.id)
+
+    @staticmethod
+    async def _lock_reactions(db: AsyncSession, publication_id: uuid.UUID):
+        """Take the row lock reaction toggles take (see ReactionService._lock_publications)"""
+        await db.execute(
+            select(Publication.id).where(Publication.id == publication_id).with_for_update(key_share=True)
+        )
 
     @staticmethod
-    def update_publication(db: Session, publication_id: uuid.UUID, publication: PublicationUpdate, user_id: uuid.UUID):
+    async def update_publication(db: AsyncSession, publication_id: uuid.UUID, publication: PublicationUpdate, user_id: uuid.UUID):
         """Update an existing publication, only if the user is the owner"""
-        db_publication = db.query(Publication).filter(Publication.id == publication_id).first()
+        db_publication = await PublicationService._get(db, publication_id, PUBLICATION_ONLY)
         if not db_publication:
             return None
         
@@ -67,13 +96,17 @@ class PublicationService:
         # Update title and content
         db_publication.title = publication.title
         db_publication.content = publication.content
+        db_publication.excerpt, db_publication.word_count = summarize_content(publication.content)
+        db_publication.version = Publication.version + 1
 
-        # Update page
-        if publication.page_id is not None:
+        # Update page; its reaction rollups move along (row locked so no toggle records in between)
+        if publication.page_id is not None and publication.page_id != db_publication.page_id:
+            await PublicationService._lock_reactions(db, publication_id)
+            await ReactionRollupService.move_publication(db, publication_id, publication.page_id)
             db_publication.page_id = publication.page_id
 
         # Remove existing tags
-        db.query(PublicationTag).filter(PublicationTag.publication_id == publication_id).delete()
+        await db.execute(delete(PublicationTag).where(PublicationTag.publication_id == publication_id))
         
         # Add new tags
         if publication.tags:
@@ -84,16 +117,17 @@ class PublicationService:
                 )
                 db.add(publication_tag)
 
-        db.commit()
-        db.refresh(db_publication)
-        return db_publication
+        await db.commit()
+
+        invalidate_publication(publication_id, db_publication.page_id, publication.tags)
+        return await PublicationService._get(db, publication_id)
 
     @staticmethod
-    def delete_publication(db: Session, publication_id: UUID, user_id: uuid.UUID):
+    async def delete_publication(db: AsyncSession, publication_id: UUID, user_id: uuid.UUID):
         """Delete a publication, only if the user is the owner"""
         try:
             # The first pub
-            publication = db.query(Publication).filter(Publication.id == publication_id).first()
+            publication = await PublicationService._get(db, publication_id, PUBLICATION_ONLY)
             
             if not publication:
                 return False
@@ -102,118 +136,109 @@ class PublicationService:
             if publication.user_id != user_id:
                 raise ValueError("You are not the owner of this publication")
             
-            db.delete(publication)
-            db.commit()
+            await PublicationService._lock_reactions(db, publication_id)
+            await ReactionRollupService.release_publication(db, publication_id)
+            # Reactions, tag links, trending score and rollups go with it (ON DELETE CASCADE)
+            await db.execute(delete(Publication).where(Publication.id == publication_id))
+            await db.commit()
+            invalidate_publication(publication_id)
             return True
         except Exception as e:
-            db.rollback()
-            print(f"Error deleting publication: {e}")
+            await db.rollback()
+            logger.exception("Error deleting publication %s", publication_id)
             raise
 
     
-    #GET METHODS
+    #LIST QUERIES (shared by the reads and their ETag checks)
     @staticmethod
-    def _add_reaction_counts(db: Session, publications):
+    def by_page_query(page_id: int):
+        return select(Publication).where(Publication.page_id == page_id)
+
+    @staticmethod
+    def by_user_query(user_id: uuid.UUID):
+        return select(Publication).where(Publication.user_id == user_id)
+
+    @staticmethod
+    def tagged_ids_query(tag_ids: List[int], mode: str = "any"):
         """
-        Add likes_count and dislikes_count to List Pub
+        Ids of publications carrying any (or, with mode="all", every one) of the tags.
+        Both read only the (tag_id, publication_id) index: "all" groups the matching
+        rows per publication and keeps those that matched every requested tag.
         """
-        # Convert Lis
-        if not isinstance(publications, list):
-            publications = [publications]
-        
-        # For pub search
-        for pub in publications:
-            # like count
-            pub.likes_count = db.query(Reaction).filter(
-                and_(
-                    Reaction.id_publication == pub.id,
-                    Reaction.type == 'like'
-                )
-            ).count()
-            
-            # dislike count
-            pub.dislikes_count = db.query(Reaction).filter(
-                and_(
-                    Reaction.id_publication == pub.id,
-                    Reaction.type == 'dislike'
-                )
-            ).count()
-        
-        # RETURN ALWAYS LIST OBJ
-        return publications
+        tagged = select(PublicationTag.publication_id).where(PublicationTag.tag_id.in_(tag_ids))
+        if mode == "all":
+            tagged = tagged.group_by(PublicationTag.publication_id).having(
+                func.count(PublicationTag.tag_id.distinct()) == len(set(tag_ids))
+            )
+        return tagged
 
-    
     @staticmethod
-    def get_publications_by_page(db: Session, page_id: int):
+    def by_tags_query(tag_ids: List[int], mode: str = "any"):
+        # Semi-join: no DISTINCT needed over the joined rows
+        return select(Publication).where(Publication.id.in_(PublicationService.tagged_ids_query(tag_ids, mode)))
+
+    @staticmethod
+    def all_query():
+        return select(Publication)
+
+    @staticmethod
+    def user_reactions_query(id_user: uuid.UUID, type: ReactionType = None):
+        statement = select(Publication).join(Reaction).where(Reaction.id_user == id_user)
+        if type:
+            statement = statement.where(Reaction.type == type)
+        return statement
+
+    #GET METHODS
+    @staticmethod
+    async def get_publications_by_page(db: AsyncSession, page_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
         """Get publications for a specific page"""
-        publications =  db.query(Publication).filter(Publication.page_id == page_id).all()
-        return PublicationService._add_reaction_counts(db, publications)
+        statement = PublicationService.by_page_query(page_id).options(*PUBLICATION_RESPONSE)
+        return await paginate_publications(db, statement, cursor, limit)
 
     @staticmethod
-    def get_publications_by_user(db: Session, user_id: uuid.UUID):
+    async def get_publications_by_user(db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
         """Get publications for a specific user"""
-        publications =  db.query(Publication).filter(Publication.user_id == user_id).all()
-        return PublicationService._add_reaction_counts(db, publications)
-
-    @staticmethod
-    def get_publications_by_tags(db: Session, tag_ids: List[int]):
-        """Get publications that have any of the specified tags"""
-        publications =  (
-            db.query(Publication)
-            .join(PublicationTag)
-            .filter(PublicationTag.tag_id.in_(tag_ids))
-            .distinct() #NO DUPLICATION
-            .all()
-        )
-        return PublicationService._add_reaction_counts(db, publications)
+        statement = PublicationService.by_user_query(user_id).options(*PUBLICATION_RESPONSE)
+        return await paginate_publications(db, statement, cursor, limit)
+
+    @staticmethod
+    async def get_publications_by_tags(db: AsyncSession, tag_ids: List[int], cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, mode: str = "any"):
+        """Get publications that have any (mode="any") or all (mode="all") of the specified tags"""
+        statement = PublicationService.by_tags_query(tag_ids, mode).options(*PUBLICATION_RESPONSE)
+        return await paginate_publications(db, statement, cursor, limit)
 
     @staticmethod
-    def get_publication_tags(db: Session, publication_id: uuid.UUID):
+    async def get_publication_tags(db: AsyncSession, publication_id: uuid.UUID):
         """Get tags for a specific publication"""
-        publications =  db.query(Tag).join(PublicationTag).filter(PublicationTag.publication_id == publication_id).all()
-        return PublicationService._add_reaction_counts(db, publications)
+        result = await db.execute(
+            select(Tag).join(PublicationTag).where(PublicationTag.publication_id == publication_id)
+        )
+        return result.unique().scalars().all()
         
     @staticmethod
-    def get_publication_by_id(db: Session, publication_id: uuid.UUID):
+    async def get_publication_by_id(db: AsyncSession, publication_id: uuid.UUID):
         """
         Retrieve a publication by its ID with all related information
         
         Args:
-            db (Session): Database session
+            db (AsyncSession): Database session
             publication_id (UUID): Unique identifier of the publication
         
         Returns:
-            Publication: The publication with reaction counts
+            Publication: The publication with its stored reaction counts
         """
-        publication = db.query(Publication).filter(Publication.id == publication_id).first()
-        
-        if not publication:
-            return None
-        
-        # Add reaction counts to the publication
-        publications_with_reactions = PublicationService._add_reaction_counts(db, publication)
-        
-        # Only First
-        return publications_with_reactions[0]
+        return await PublicationService._get(db, publication_id)
     
     #USER AND ALL PUBLICATIONS WITH REACTIONS
     
     @staticmethod
-    def get_all_publications(db: Session):
+    async def get_all_publications(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
         """Get all publications"""
-        publications =  db.query(Publication).all()
-        return PublicationService._add_reaction_counts(db, publications)
+        statement = PublicationService.all_query().options(*PUBLICATION_RESPONSE)
+        return await paginate_publications(db, statement, cursor, limit)
     
     @staticmethod
-    def get_user_reactions(db: Session, id_user: uuid.UUID, type: ReactionType = None):
+    async def get_user_reactions(db: AsyncSession, id_user: uuid.UUID, type: ReactionType = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
         """Get publications reacted by a user"""
-        query = db.query(Publication).join(Reaction).filter(Reaction.id_user == id_user)
-        
-        if type:
-            query = query.filter(Reaction.type == type)
-        
-        # Get all reactions
-        publications = query.all()
-        
-        # Add counts
-        return PublicationService._add_reaction_counts(db, publications)
+        statement = PublicationService.user_reactions_query(id_user, type).options(*PUBLICATION_RESPONSE)
+        return await paginate_publications(db, statement, cursor, limit)
@@ -0,0 +1,265 @@
+# services/reaction_buffer.py
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..config.database import AsyncSessionLocal
+from ..config.settings import Settings
+from ..models.reaction import Reaction
+from ..models.user import User
+from .cache import invalidate_publication
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[uuid.UUID, uuid.UUID]
+
+# Reaction states a (user, publication) key can be in
+STATES = (None, 'like', 'dislike')
+
+
+def _toggle(reaction_type: str) -> tuple:
+    """Toggle as a state -> state map: same type removes it, anything else sets it"""
+    return tuple(None if state == reaction_type else reaction_type for state in STATES)
+
+
+def _then(first: tuple, second: tuple) -> tuple:
+    """Compose two state maps: apply first, then second"""
+    return tuple(second[STATES.index(state)] for state in first)
+
+
+def _apply(change: tuple, state: Optional[str]) -> Optional[str]:
+    return change[STATES.index(state)]
+
+
+class ReactionWriteBuffer:
+    """
+    Write-behind buffer for reaction toggles.
+
+    A toggle's outcome depends on the stored reaction, so each pending key keeps
+    the net effect of its toggles as a map from stored state to final state.
+    Any burst of toggles on one key collapses into one map, and a flush turns
+    it into at most one row write. Flushes run every flush_interval seconds, or
+    sooner once max_pending toggles are waiting.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: Dict[Key, tuple] = {}
+        # Drained by the flush in progress; still visible to reads until committed
+        self._in_flight: Dict[Key, tuple] = {}
+        self._pending_ops = 0
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.toggles = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.flushed_toggles = 0
+        self.rows_written = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def toggle(self, user_id: uuid.UUID, publication_id: uuid.UUID, reaction_type: str):
+        """Buffer one toggle; wakes the flusher once max_pending toggles are waiting"""
+        key = (user_id, publication_id)
+        with self._lock:
+            change = _toggle(reaction_type)
+            previous = self._pending.get(key)
+            self._pending[key] = change if previous is None else _then(previous, change)
+            self._pending_ops += 1
+            self.toggles += 1
+            full = self._pending_ops >= self.max_pending
+        if full and self._wakeup is not None:
+            self._wakeup.set()
+
+    def resolve(self, user_id: uuid.UUID, publication_id: uuid.UUID, stored: Optional[str]) -> Optional[str]:
+        """The reaction a key will have once pending toggles reach the database"""
+        key = (user_id, publication_id)
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            pending = self._pending.get(key)
+        if in_flight is not None:
+            stored = _apply(in_flight, stored)
+        if pending is not None:
+            stored = _apply(pending, stored)
+        return stored
+
+    def start(self):
+        if self._task is None:
+            self._flush_lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the flusher and write out everything still pending. The flusher is
+        not cancelled: a flush in progress finishes (or puts its toggles back) first.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Reaction buffer flush failed; toggles kept for the next one")
+
+    async def flush(self):
+        """Persist the net effect of every pending toggle in one transaction"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._in_flight, self._pending = self._pending, {}
+                drained_ops, self._pending_ops = self._pending_ops, 0
+
+            start = time.perf_counter()
+            try:
+                rows, dropped = await self._write(self._in_flight)
+            except BaseException:
+                # Including cancellation: put the drained toggles back in front of
+                # anything buffered since (the transaction rolled back)
+                with self._lock:
+                    for key, change in self._in_flight.items():
+                        newer = self._pending.get(key)
+                        self._pending[key] = change if newer is None else _then(change, newer)
+                    self._pending_ops += drained_ops
+                    self._in_flight = {}
+                    self.flush_errors += 1
+                raise
+
+            with self._lock:
+                self._in_flight = {}
+                self.flushes += 1
+                self.flushed_toggles += drained_ops
+                self.rows_written += rows
+                self.dropped += dropped
+                self.last_flush_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    async def _write(self, changes: Dict[Key, tuple]) -> Tuple[int, int]:
+        """
+        Apply the net changes against the stored reactions and counters.
+        Returns (reaction rows written, keys dropped for a missing user or publication).
+        """
+        # Imported here: reaction_service imports this module for the global buffer
+        from .reaction_rollup_service import ReactionRollupService
+        from .reaction_service import ReactionService
+        from .trending_service import TrendingService
+
+        now = datetime.utcnow()
+        keys = list(changes)
+        async with AsyncSessionLocal() as db:
+            try:
+                publications = await ReactionService._lock_publications(db, {p for _, p in keys})
+                users = set((await db.execute(
+                    select(User.id).where(User.id.in_({u for u, _ in keys}))
+                )).scalars().all())
+                stored = {
+                    (user_id, publication_id): (reaction_type, date)
+                    for user_id, publication_id, reaction_type, date in (await db.execute(
+                        select(Reaction.id_user, Reaction.id_publication, Reaction.type, Reaction.date)
+                        .where(tuple_(Reaction.id_user, Reaction.id_publication).in_(keys))
+                        .order_by(Reaction.id_publication, Reaction.id_user)
+                        .with_for_update()
+                    )).all()
+                }
+
+                removals, upserts, dropped = [], [], 0
+                deltas: Dict[uuid.UUID, Dict[str, int]] = {}
+                rollup_changes = []
+                for key in sorted(keys, key=lambda k: (k[1], k[0])):
+                    user_id, publication_id = key
+                    if user_id not in users or publication_id not in publications:
+                        dropped += 1
+                        continue
+                    before, before_date = stored.get(key, (None, None))
+                    after = _apply(changes[key], before)
+                    if after == before:
+                        continue
+                    if after is None:
+                        removals.append(key)
+                    else:
+                        upserts.append({"id_user": user_id, "id_publication": publication_id, "type": after, "date": now})
+                    delta = deltas.setdefault(publication_id, {"like": 0, "dislike": 0})
+                    if before is not None:
+                        delta[before] -= 1
+                        rollup_changes.append((publication_id, before_date, before, -1))
+                    if after is not None:
+                        delta[after] += 1
+                        rollup_changes.append((publication_id, now, after, 1))
+
+                if removals:
+                    await db.execute(
+                        delete(Reaction).where(tuple_(Reaction.id_user, Reaction.id_publication).in_(removals))
+                    )
+                if upserts:
+                    upsert = pg_insert(Reaction).values(upserts)
+                    await db.execute(upsert.on_conflict_do_update(
+                        index_elements=[Reaction.id_user, Reaction.id_publication],
+                        set_={"type": upsert.excluded.type, "date": upsert.excluded.date},
+                    ))
+                await ReactionService._apply_counter_deltas(db, deltas)
+                await TrendingService.record(db, deltas)
+                await ReactionRollupService.record(db, rollup_changes, publications)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        for publication_id in deltas:
+            invalidate_publication(publication_id)
+        return len(removals) + len(upserts), dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.running,
+                "flush_interval_ms": round(self.flush_interval * 1000, 3),
+                "max_pending": self.max_pending,
+                "pending_keys": len(self._pending),
+                "pending_toggles": self._pending_ops,
+                "toggles": self.toggles,
+                "flushes": self.flushes,
+                "flush_errors": self.flush_errors,
+                "last_flush_ms": self.last_flush_ms,
+                "flushed_toggles": self.flushed_toggles,
+                "rows_written": self.rows_written,
+                # Toggles that never needed their own write: superseded or cancelled out
+                "writes_saved": self.flushed_toggles - self.rows_written,
+                "dropped": self.dropped,
+            }
+
+
+# Only started when REACTION_WRITE_BEHIND is on (see main.py). Per process:
+# toggles wait in memory for up to flush_interval before other workers see them.
+reaction_buffer = ReactionWriteBuffer(
+    flush_interval=Settings.reaction_buffer_flush_ms / 1000,
+    max_pending=Settings.reaction_buffer_max_ops,
+)
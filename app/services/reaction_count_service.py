@@ -0,0 +1,113 @@
+# services/reaction_count_service.py
+from typing import List
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, or_, select, update
+
+from ..models.publication import Publication
+from ..models.reaction import Reaction
+from .cache import invalidate_publication
+
+class ReactionCountService:
+    @staticmethod
+    def _actual_counts():
+        """Like/dislike counts per publication computed from the reactions table"""
+        return (
+            select(
+                Reaction.id_publication.label("publication_id"),
+                func.count().filter(Reaction.type == 'like').label("likes"),
+                func.count().filter(Reaction.type == 'dislike').label("dislikes"),
+            )
+            .group_by(Reaction.id_publication)
+            .subquery("actual")
+        )
+
+    @staticmethod
+    def find_drift(db: Session, *conditions) -> List[dict]:
+        """
+        Compare the stored counters of every publication (or those matching
+        conditions) with the reactions table.
+        Returns one entry per publication whose counters disagree.
+        """
+        actual = ReactionCountService._actual_counts()
+        actual_likes = func.coalesce(actual.c.likes, 0)
+        actual_dislikes = func.coalesce(actual.c.dislikes, 0)
+
+        rows = (
+            db.query(
+                Publication.id,
+                Publication.likes_count,
+                Publication.dislikes_count,
+                actual_likes,
+                actual_dislikes,
+            )
+            .outerjoin(actual, actual.c.publication_id == Publication.id)
+            .filter(
+                *conditions,
+                or_(
+                    Publication.likes_count != actual_likes,
+                    Publication.dislikes_count != actual_dislikes,
+                )
+            )
+            .all()
+        )
+        return [
+            {
+                "publication_id": publication_id,
+                "stored_likes": stored_likes,
+                "stored_dislikes": stored_dislikes,
+                "actual_likes": likes,
+                "actual_dislikes": dislikes,
+            }
+            for publication_id, stored_likes, stored_dislikes, likes, dislikes in rows
+        ]
+
+    @staticmethod
+    def reconcile(db: Session, fix: bool = True) -> List[dict]:
+        """
+        Recompute the counters of every publication from reactions in bulk.
+        The drifted publications are locked in id order, the same order toggles
+        take, and checked again before their counters are rewritten, so no toggle
+        can slip in between. Rewritten publications get a new version (ETag) and
+        leave this process's cache; other workers' entries expire with the TTL.
+        """
+        drift = ReactionCountService.find_drift(db)
+
+        if fix and drift:
+            ids = sorted(item["publication_id"] for item in drift)
+            db.execute(
+                select(Publication.id)
+                .where(Publication.id.in_(ids))
+                .order_by(Publication.id)
+                .with_for_update(key_share=True)
+            )
+            drift = ReactionCountService.find_drift(db, Publication.id.in_(ids))
+
+        if fix and drift:
+            # Core UPDATE executemany: the version bump is an expression, which the
+            # ORM bulk UPDATE by primary key cannot take
+            publication = Publication.__table__
+            db.execute(
+                update(publication)
+                .where(publication.c.id == bindparam("publication_id"))
+                .values(
+                    likes_count=bindparam("actual_likes"),
+                    dislikes_count=bindparam("actual_dislikes"),
+                    version=publication.c.version + 1,
+                ),
+                [
+                    {
+                        "publication_id": item["publication_id"],
+                        "actual_likes": item["actual_likes"],
+                        "actual_dislikes": item["actual_dislikes"],
+                    }
+                    for item in drift
+                ],
+            )
+
+        if fix:
+            db.commit()
+            for item in drift:
+                invalidate_publication(item["publication_id"])
+        else:
+            db.rollback()
+        return drift
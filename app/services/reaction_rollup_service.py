@@ -0,0 +1,392 @@
+# services/reaction_rollup_service.py
+"""
+Hourly and daily like/dislike buckets per publication and per page.
+
+A bucket counts the current reactions dated inside it (UTC), the same thing
+GROUP BY date_trunc(...) over `reactions` returns, so the incremental path and
+a bulk rebuild always agree:
+
+- a new reaction adds 1 to the buckets of its date
+- an un-react takes 1 off the buckets of the removed reaction's date
+- a flip does both: the old type at the old date, the new type now
+- deleting a user or a publication, or moving a publication to another
+  page, is applied set-based in the same transaction
+
+Time series and leaderboards then read buckets instead of scanning reactions.
+Hourly buckets are kept for ROLLUP_HOURLY_RETENTION_DAYS (RollupPruneJob);
+changes to older ones are skipped. Daily buckets are kept.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import String, column, delete, func, literal, or_, select, text, true, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config.database import AsyncSessionLocal
+from ..config.settings import get_settings
+from ..models.publication import Publication
+from ..models.reaction import Reaction
+from ..models.reaction_rollup import PageReactionRollup, PublicationReactionRollup
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day")
+BUCKET_SIZE = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+DEFAULT_RANGE = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+# Widest range a series or leaderboard may cover, in buckets
+MAX_BUCKETS = 2000
+
+# (publication_id, reaction date, reaction type, +1 or -1)
+Change = Tuple[uuid.UUID, datetime, str, int]
+
+# Rollup table, the columns identifying a bucket's scope, and where they come from for a reaction
+SCOPES = (
+    (PublicationReactionRollup, ("publication_id", "page_id"), (Reaction.id_publication, Publication.page_id)),
+    (PageReactionRollup, ("page_id",), (Publication.page_id,)),
+)
+
+
+def to_utc(moment: datetime) -> datetime:
+    """Naive UTC; naive values are taken as UTC already (datetime.utcnow())"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = to_utc(moment).replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if granularity == "day" else moment
+
+
+def hourly_cutoff() -> Optional[datetime]:
+    """Start of the oldest hourly bucket kept (a UTC day), None when they are kept forever"""
+    days = get_settings().rollup_hourly_retention_days
+    if days <= 0:
+        return None
+    return bucket_start(datetime.utcnow() - timedelta(days=days), "day")
+
+
+def _add_on_conflict(insert, model):
+    """Existing buckets take the increments; new ones start from them"""
+    return insert.on_conflict_do_update(
+        index_elements=[model.__table__.primary_key.columns[name] for name in model.__table__.primary_key.columns.keys()],
+        set_={"likes": model.likes + insert.excluded.likes, "dislikes": model.dislikes + insert.excluded.dislikes},
+    )
+
+
+def _reaction_buckets(sources, sign: int = 1, cutoff: Optional[datetime] = None):
+    """
+    (scope columns, granularity, bucket, likes, dislikes) of the reactions, grouped;
+    hourly buckets before cutoff left out. Filter with .where()
+    """
+    granularities = values(column("granularity", String), name="granularities").data([(g,) for g in GRANULARITIES])
+    bucket = func.date_trunc(granularities.c.granularity, func.timezone("UTC", Reaction.date))
+    statement = (
+        select(
+            *sources,
+            granularities.c.granularity,
+            bucket,
+            func.count().filter(Reaction.type == 'like') * sign,
+            func.count().filter(Reaction.type == 'dislike') * sign,
+        )
+        .select_from(Reaction)
+        .join(Publication, Publication.id == Reaction.id_publication)
+        .join(granularities, true())
+    )
+    if cutoff is not None:
+        statement = statement.where(or_(granularities.c.granularity != "hour", bucket >= cutoff))
+    return statement.group_by(*sources, granularities.c.granularity, bucket)
+
+
+def _columns(scope_keys) -> list:
+    return list(scope_keys) + ["granularity", "bucket", "likes", "dislikes"]
+
+
+class ReactionRollupService:
+    @staticmethod
+    async def record(db: AsyncSession, changes: Iterable[Change], pages: Dict[uuid.UUID, int]):
+        """
+        Add reaction changes to the publication and page buckets inside the caller's
+        transaction: one INSERT ... ON CONFLICT per table. pages maps publication to page.
+        """
+        cutoff = hourly_cutoff()
+        counts = ({}, {})
+        for publication_id, moment, reaction_type, delta in changes:
+            index = 0 if reaction_type == 'like' else 1
+            page_id = pages[publication_id]
+            for granularity in GRANULARITIES:
+                bucket = bucket_start(moment, granularity)
+                if granularity == "hour" and cutoff is not None and bucket < cutoff:
+                    # Past retention: pruned, or about to be
+                    continue
+                for scope_counts, scope in zip(counts, ((publication_id, page_id), (page_id,))):
+                    scope_counts.setdefault((scope, granularity, bucket), [0, 0])[index] += delta
+
+        for (model, scope_keys, _), scope_counts in zip(SCOPES, counts):
+            # Sorted: concurrent writers take the bucket row locks in the same order
+            rows = [
+                {**dict(zip(scope_keys, scope)), "granularity": granularity, "bucket": bucket, "likes": likes, "dislikes": dislikes}
+                for (scope, granularity, bucket), (likes, dislikes) in sorted(scope_counts.items())
+                if likes or dislikes
+            ]
+            if rows:
+                await db.execute(_add_on_conflict(pg_insert(model).values(rows), model))
+
+    @staticmethod
+    async def release_reactions(db: AsyncSession, *conditions):
+        """Take the reactions matching conditions out of every bucket before they are deleted"""
+        cutoff = hourly_cutoff()
+        for model, scope_keys, sources in SCOPES:
+            source = _reaction_buckets(sources, sign=-1, cutoff=cutoff).where(*conditions)
+            await db.execute(_add_on_conflict(pg_insert(model).from_select(_columns(scope_keys), source), model))
+
+    @staticmethod
+    def _page_buckets(*conditions):
+        """The buckets of the publications matching conditions, summed per page"""
+        return (
+            select(
+                Publication.page_id,
+                PublicationReactionRollup.granularity,
+                PublicationReactionRollup.bucket,
+                func.sum(PublicationReactionRollup.likes).label("likes"),
+                func.sum(PublicationReactionRollup.dislikes).label("dislikes"),
+            )
+            .join(Publication, Publication.id == PublicationReactionRollup.publication_id)
+            .where(*conditions)
+            .group_by(Publication.page_id, PublicationReactionRollup.granularity, PublicationReactionRollup.bucket)
+            .subquery("publication_buckets")
+        )
+
+    @staticmethod
+    async def release_publications(db: AsyncSession, *conditions):
+        """
+        Take the publications matching conditions out of their pages' buckets before
+        they are deleted or moved (their own buckets go with them, ON DELETE CASCADE)
+        """
+        source = ReactionRollupService._page_buckets(*conditions)
+        await db.execute(
+            update(PageReactionRollup)
+            .where(
+                PageReactionRollup.page_id == source.c.page_id,
+                PageReactionRollup.granularity == source.c.granularity,
+                PageReactionRollup.bucket == source.c.bucket,
+            )
+            .values(
+                likes=PageReactionRollup.likes - source.c.likes,
+                dislikes=PageReactionRollup.dislikes - source.c.dislikes,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def release_publication(db: AsyncSession, publication_id: uuid.UUID):
+        """Take a publication out of its page's buckets before it is deleted"""
+        await ReactionRollupService.release_publications(db, Publication.id == publication_id)
+
+    @staticmethod
+    async def move_publication(db: AsyncSession, publication_id: uuid.UUID, new_page_id: int):
+        """Move a publication's buckets to another page; call before page_id is written"""
+        await ReactionRollupService.release_publications(db, Publication.id == publication_id)
+        source = ReactionRollupService._page_buckets(Publication.id == publication_id)
+        await db.execute(_add_on_conflict(
+            pg_insert(PageReactionRollup).from_select(
+                _columns(("page_id",)),
+                select(literal(new_page_id), source.c.granularity, source.c.bucket, source.c.likes, source.c.dislikes),
+            ),
+            PageReactionRollup,
+        ))
+        await db.execute(
+            update(PublicationReactionRollup)
+            .where(PublicationReactionRollup.publication_id == publication_id)
+            .values(page_id=new_page_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(db: Session, since: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Recompute the buckets from `reactions`, all of them or from the UTC day of
+        `since` on (hourly ones only within retention). The rollup tables are locked for the duration, so toggles wait
+        and then apply on top of the rebuilt buckets. Returns rows written per table.
+        """
+        since = bucket_start(since, "day") if since is not None else None
+        db.execute(text("LOCK TABLE publication_reaction_rollup, page_reaction_rollup IN EXCLUSIVE MODE"))
+
+        written = {}
+        for model, scope_keys, sources in SCOPES:
+            cleared = delete(model)
+            source = _reaction_buckets(sources, cutoff=hourly_cutoff())
+            if since is not None:
+                cleared = cleared.where(model.bucket >= since)
+                source = source.where(func.timezone("UTC", Reaction.date) >= since)
+            db.execute(cleared)
+            result = db.execute(pg_insert(model).from_select(_columns(scope_keys), source))
+            written[model.__tablename__] = result.rowcount
+        db.commit()
+        return written
+
+    @staticmethod
+    def _range(granularity: str, start: Optional[datetime], end: Optional[datetime]):
+        end = to_utc(end) if end is not None else datetime.utcnow()
+        start = bucket_start(start if start is not None else end - DEFAULT_RANGE[granularity], granularity)
+        if end <= start:
+            raise ValueError("end must be after start")
+        if (end - start) / BUCKET_SIZE[granularity] > MAX_BUCKETS:
+            raise ValueError(f"Range too wide: at most {MAX_BUCKETS} {granularity} buckets")
+        cutoff = hourly_cutoff() if granularity == "hour" else None
+        if cutoff is not None and start < cutoff:
+            raise ValueError(f"Hourly buckets are kept from {cutoff.date().isoformat()} on; use granularity=day")
+        return start, end
+
+    @staticmethod
+    async def _series(db: AsyncSession, model, scope_column, scope_id, granularity: str, start: Optional[datetime], end: Optional[datetime]):
+        start, end = ReactionRollupService._range(granularity, start, end)
+        rows = (await db.execute(
+            select(model.bucket, model.likes, model.dislikes)
+            .where(
+                scope_column == scope_id,
+                model.granularity == granularity,
+                model.bucket >= start,
+                model.bucket < end,
+            )
+            .order_by(model.bucket)
+        )).all()
+        # Buckets without reactions are left out
+        buckets = [{"bucket": bucket, "likes": likes, "dislikes": dislikes} for bucket, likes, dislikes in rows if likes or dislikes]
+        return {
+            "granularity": granularity,
+            "start": start,
+            "end": end,
+            "likes": sum(bucket["likes"] for bucket in buckets),
+            "dislikes": sum(bucket["dislikes"] for bucket in buckets),
+            "buckets": buckets,
+        }
+
+    @staticmethod
+    async def publication_series(db: AsyncSession, publication_id: uuid.UUID, granularity: str = "hour", start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """A publication's likes and dislikes per bucket in [start, end)"""
+        return await ReactionRollupService._series(
+            db, PublicationReactionRollup, PublicationReactionRollup.publication_id, publication_id, granularity, start, end
+        )
+
+    @staticmethod
+    async def page_series(db: AsyncSession, page_id: int, granularity: str = "hour", start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """A page's likes and dislikes per bucket in [start, end)"""
+        return await ReactionRollupService._series(
+            db, PageReactionRollup, PageReactionRollup.page_id, page_id, granularity, start, end
+        )
+
+    @staticmethod
+    async def page_leaderboard(
+        db: AsyncSession,
+        page_id: int,
+        granularity: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        metric: str = "likes",
+        limit: int = 10,
+    ):
+        """A page's publications with the most likes, dislikes or net likes in [start, end)"""
+        start, end = ReactionRollupService._range(granularity, start, end)
+        likes = func.sum(PublicationReactionRollup.likes)
+        dislikes = func.sum(PublicationReactionRollup.dislikes)
+        order = {"likes": likes, "dislikes": dislikes, "net": likes - dislikes}[metric]
+
+        # Only the page's own buckets are read (ix_publication_reaction_rollup_page),
+        # and only the top `limit` publications are joined for their titles
+        top = (
+            select(PublicationReactionRollup.publication_id, likes.label("likes"), dislikes.label("dislikes"))
+            .where(
+                PublicationReactionRollup.page_id == page_id,
+                PublicationReactionRollup.granularity == granularity,
+                PublicationReactionRollup.bucket >= start,
+                PublicationReactionRollup.bucket < end,
+            )
+            .group_by(PublicationReactionRollup.publication_id)
+            .having(order > 0)
+            .order_by(order.desc(), PublicationReactionRollup.publication_id)
+            .limit(limit)
+            .subquery("top")
+        )
+        top_order = {"likes": top.c.likes, "dislikes": top.c.dislikes, "net": top.c.likes - top.c.dislikes}[metric]
+        rows = (await db.execute(
+            select(top.c.publication_id, Publication.title, top.c.likes, top.c.dislikes)
+            .join(Publication, Publication.id == top.c.publication_id)
+            .order_by(top_order.desc(), top.c.publication_id)
+        )).all()
+        items = [
+            {"publication_id": publication_id, "title": title, "likes": likes, "dislikes": dislikes, "net": likes - dislikes}
+            for publication_id, title, likes, dislikes in rows
+        ]
+        return {"page_id": page_id, "granularity": granularity, "start": start, "end": end, "metric": metric, "items": items}
+
+    @staticmethod
+    async def prune(cutoff: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete the hourly buckets before cutoff (default: the retention cutoff),
+        one UTC day per transaction. Returns rows deleted per table.
+        """
+        cutoff = cutoff if cutoff is not None else hourly_cutoff()
+        deleted = {model.__tablename__: 0 for model, _, _ in SCOPES}
+        if cutoff is None:
+            return deleted
+        for model, _, _ in SCOPES:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    try:
+                        oldest = (await db.execute(
+                            select(func.min(model.bucket)).where(model.granularity == "hour", model.bucket < cutoff)
+                        )).scalar()
+                        if oldest is None:
+                            break
+                        until = min(bucket_start(oldest, "day") + BUCKET_SIZE["day"], cutoff)
+                        result = await db.execute(
+                            delete(model)
+                            .where(model.granularity == "hour", model.bucket < until)
+                            .execution_options(synchronize_session=False)
+                        )
+                        await db.commit()
+                    except Exception:
+                        await db.rollback()
+                        raise
+                deleted[model.__tablename__] += result.rowcount
+        return deleted
+
+
+class RollupPruneJob:
+    """Background task running ReactionRollupService.prune every `interval` seconds"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await ReactionRollupService.prune()
+            except Exception:
+                logger.exception("Reaction rollup prune failed")
+
+
+# Hourly: retention is counted in days
+rollup_prune_job = RollupPruneJob(interval=3600)
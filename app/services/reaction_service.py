@@ -1,51 +1,318 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, and_, column, delete, func, literal_column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import aliased
+from ..models.publication import Publication
 from ..models.reaction import Reaction
-from ..schemas.reaction_schema import ReactionCreate
+from ..models.user import User
+from ..schemas.reaction_schema import ReactionCreate, ReactionType
+from ..schemas.publication_schema import PublicationResponse
+from .cache import invalidate_publication
+from .reaction_buffer import reaction_buffer
+from .reaction_rollup_service import ReactionRollupService
+from .trending_service import TrendingService
 from datetime import datetime
 import uuid
 
+ADDED = "added"
+REMOVED = "removed"
+FLIPPED = "flipped"
+UNCHANGED = "unchanged"
+
+OPPOSITE = {'like': 'dislike', 'dislike': 'like'}
+
+# Counter changes per transition, given the toggled reaction type
+TRANSITION_DELTAS = {
+    ADDED: lambda reaction_type: {reaction_type: 1},
+    REMOVED: lambda reaction_type: {reaction_type: -1},
+    FLIPPED: lambda reaction_type: {reaction_type: 1, OPPOSITE[reaction_type]: -1},
+    UNCHANGED: lambda reaction_type: {},
+}
+
 class ReactionService:
     @staticmethod
-    def toggle_reaction(db: Session, reaction_data: ReactionCreate):
+    async def _apply_counter_deltas(db: AsyncSession, deltas: Dict[uuid.UUID, Dict[str, int]]):
         """
-        Toggle a reaction. If the reaction exists, remove it. 
-        If not, add or replace existing reaction.
+        Apply {publication_id: {reaction_type: delta}} to the publication counters
+        (and bump their ETag versions) in a single UPDATE ... FROM (VALUES ...).
+        Runs inside the caller's transaction so counters and reactions commit together.
         """
-        existing_reaction = db.query(Reaction).filter(
-            and_(
-                Reaction.id_user == reaction_data.id_user,
-                Reaction.id_publication == reaction_data.id_publication
+        rows = [
+            (publication_id, delta.get('like', 0), delta.get('dislike', 0))
+            for publication_id, delta in sorted(deltas.items())
+            if any(delta.values())
+        ]
+        if not rows:
+            return
+
+        changes = values(
+            column("id", UUID(as_uuid=True)),
+            column("likes", Integer),
+            column("dislikes", Integer),
+            name="changes",
+        ).data(rows)
+        await db.execute(
+            update(Publication)
+            .where(Publication.id == changes.c.id)
+            .values(
+                likes_count=Publication.likes_count + changes.c.likes,
+                dislikes_count=Publication.dislikes_count + changes.c.dislikes,
+                version=Publication.version + 1,
             )
-        ).first()
-
-        if existing_reaction:
-            # If same reaction, remove it
-            if existing_reaction.type == reaction_data.type:
-                db.delete(existing_reaction)
-                db.commit()
-                return None
-            # If different reaction, update
-            else:
-                existing_reaction.type = reaction_data.type
-                existing_reaction.date = datetime.utcnow()
-                db.commit()
-                return existing_reaction
-        
-        # Create new reaction
-        new_reaction = Reaction(
-            id_user=reaction_data.id_user,
-            id_publication=reaction_data.id_publication,
-            type=reaction_data.type,
-            date=datetime.utcnow()
+            .execution_options(synchronize_session=False)
         )
-        db.add(new_reaction)
-        db.commit()
-        db.refresh(new_reaction)
-        return new_reaction
+
+    @staticmethod
+    async def release_reactions(db: AsyncSession, *conditions):
+        """
+        Take the reactions matching conditions out of the publication counters
+        (bumping their ETag versions), the trending scores and the reaction
+        rollups before they are deleted. Set-based.
+        """
+        counts = (
+            select(
+                Reaction.id_publication,
+                func.count().filter(Reaction.type == 'like').label("likes"),
+                func.count().filter(Reaction.type == 'dislike').label("dislikes"),
+            )
+            .where(*conditions)
+            .group_by(Reaction.id_publication)
+            .subquery()
+        )
+        await db.execute(
+            update(Publication)
+            .where(Publication.id == counts.c.id_publication)
+            .values(
+                likes_count=Publication.likes_count - counts.c.likes,
+                dislikes_count=Publication.dislikes_count - counts.c.dislikes,
+                version=Publication.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await TrendingService.release_reactions(db, *conditions)
+        await ReactionRollupService.release_reactions(db, *conditions)
+
+    @staticmethod
+    async def release_user_reactions(db: AsyncSession, user_id: uuid.UUID):
+        """
+        Take a user's reactions out of the publication counters, and the user's
+        reactions and publications out of the rollups, before the user (and with
+        it both) is deleted.
+        """
+        await ReactionService.release_reactions(db, Reaction.id_user == user_id)
+        # What is left in their publications' rollups are other users' reactions
+        await ReactionRollupService.release_publications(db, Publication.user_id == user_id)
+
+    @staticmethod
+    async def _lock_publications(db: AsyncSession, publication_ids) -> Dict[uuid.UUID, int]:
+        """
+        Lock the publications about to change, always in id order, so concurrent
+        toggles and batches cannot deadlock on the counter rows.
+        Returns {id: page_id} for the publications found.
+        """
+        result = await db.execute(
+            select(Publication.id, Publication.page_id)
+            .where(Publication.id.in_(publication_ids))
+            .order_by(Publication.id)
+            .with_for_update(key_share=True)
+        )
+        return dict(result.all())
+
+    @staticmethod
+    async def _toggle_statement(db: AsyncSession, user_id: uuid.UUID, publication_id: uuid.UUID, reaction_type: str, now: datetime) -> Tuple[str, Optional[datetime]]:
+        """
+        Apply one toggle and return the transition (added, removed, flipped or unchanged)
+        and the date of the reaction it replaced, if any.
+        Same type -> conditional DELETE; otherwise a single INSERT ... ON CONFLICT that
+        either inserts or flips the existing row (xmax = 0 only for a fresh insert).
+        """
+        removed = (await db.execute(
+            delete(Reaction)
+            .where(
+                Reaction.id_user == user_id,
+                Reaction.id_publication == publication_id,
+                Reaction.type == reaction_type,
+            )
+            .returning(Reaction.date)
+        )).first()
+        if removed:
+            return REMOVED, removed.date
+
+        # Subqueries in RETURNING see the row as it was before the statement
+        previous = aliased(Reaction)
+        upsert = pg_insert(Reaction).values(
+            id_user=user_id, id_publication=publication_id, type=reaction_type, date=now
+        )
+        upserted = (await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[Reaction.id_user, Reaction.id_publication],
+                set_={"type": upsert.excluded.type, "date": upsert.excluded.date},
+                where=Reaction.type != upsert.excluded.type,
+            )
+            .returning(
+                literal_column("xmax = 0").label("inserted"),
+                select(previous.date)
+                .where(previous.id_user == user_id, previous.id_publication == publication_id)
+                .scalar_subquery()
+                .label("previous_date"),
+            )
+        )).first()
+        if upserted is None:
+            # A concurrent toggle already left the same reaction in place
+            return UNCHANGED, None
+        if upserted.inserted:
+            return ADDED, None
+        return FLIPPED, upserted.previous_date
+
+    @staticmethod
+    async def apply_toggles(db: AsyncSession, toggles: List[ReactionCreate]) -> List[dict]:
+        """
+        Apply many toggles in one transaction, in order per (user, publication),
+        and update the counters of every touched publication with one statement
+        (and the reaction rollups with one per table).
+        Returns one result per toggle, in input order; toggles naming a missing
+        publication or user get an "error" instead of failing the batch.
+        """
+        if reaction_buffer.running:
+            # Toggles buffered before this batch must reach the database before it
+            await reaction_buffer.flush()
+        now = datetime.utcnow()
+        publication_ids = {toggle.id_publication for toggle in toggles}
+        pages = await ReactionService._lock_publications(db, publication_ids)
+        users = set((await db.execute(
+            select(User.id).where(User.id.in_({toggle.id_user for toggle in toggles}))
+        )).scalars().all())
+
+        # Toggles on different keys commute: a stable sort keeps per-key order
+        # and takes the reaction row locks in a consistent order
+        order = sorted(range(len(toggles)), key=lambda i: (toggles[i].id_publication, toggles[i].id_user))
+
+        results: List[Optional[dict]] = [None] * len(toggles)
+        deltas: Dict[uuid.UUID, Dict[str, int]] = {}
+        rollup_changes = []
+        try:
+            for index in order:
+                toggle = toggles[index]
+                reaction_type = toggle.type.value
+                result = {
+                    "index": index,
+                    "id_user": toggle.id_user,
+                    "id_publication": toggle.id_publication,
+                }
+                if toggle.id_publication not in pages:
+                    result["error"] = "Publication not found"
+                elif toggle.id_user not in users:
+                    result["error"] = "User not found"
+                if "error" in result:
+                    results[index] = result
+                    continue
+
+                transition, previous_date = await ReactionService._toggle_statement(
+                    db, toggle.id_user, toggle.id_publication, reaction_type, now
+                )
+                delta = deltas.setdefault(toggle.id_publication, {"like": 0, "dislike": 0})
+                for counter, change in TRANSITION_DELTAS[transition](reaction_type).items():
+                    delta[counter] += change
+
+                # Rollups: the old reaction leaves the buckets of its date, the new one joins now
+                if transition in (REMOVED, FLIPPED):
+                    old_type = reaction_type if transition == REMOVED else OPPOSITE[reaction_type]
+                    rollup_changes.append((toggle.id_publication, previous_date, old_type, -1))
+                if transition in (ADDED, FLIPPED):
+                    rollup_changes.append((toggle.id_publication, now, reaction_type, 1))
+
+                result["transition"] = transition
+                result["reaction_type"] = None if transition == REMOVED else reaction_type
+                results[index] = result
+
+            await ReactionService._apply_counter_deltas(db, deltas)
+            await TrendingService.record(db, deltas)
+            await ReactionRollupService.record(db, rollup_changes, pages)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        for publication_id, delta in deltas.items():
+            if any(delta.values()):
+                invalidate_publication(publication_id)
+        return results
+
+    @staticmethod
+    async def toggle_reaction(db: AsyncSession, reaction_data: ReactionCreate):
+        """
+        Toggle a reaction. If the reaction exists, remove it. 
+        If not, add or replace existing reaction.
+        With the write-behind buffer running the toggle is only queued.
+        """
+        if reaction_buffer.running:
+            reaction_buffer.toggle(reaction_data.id_user, reaction_data.id_publication, reaction_data.type.value)
+            return {"transition": "buffered"}
+        result = (await ReactionService.apply_toggles(db, [reaction_data]))[0]
+        if "error" in result:
+            raise ValueError(result["error"])
+        return result
     
     @staticmethod
-    def check_user_reaction(db: Session, user_id: uuid.UUID, publication_id: uuid.UUID):
+    async def get_user_reactions_for(db: AsyncSession, user_id: uuid.UUID, publication_ids) -> Dict[uuid.UUID, str]:
+        """
+        A user's reactions to many publications with one IN query:
+        {publication_id: type} for the publications the user reacted to.
+        """
+        publication_ids = list(dict.fromkeys(publication_ids))
+        if not publication_ids:
+            return {}
+        rows = (await db.execute(
+            select(Reaction.id_publication, Reaction.type).where(
+                Reaction.id_user == user_id,
+                Reaction.id_publication.in_(publication_ids),
+            )
+        )).all()
+        reactions = dict(rows)
+
+        if reaction_buffer.running:
+            # Include toggles still waiting in the write-behind buffer
+            for publication_id in publication_ids:
+                reactions[publication_id] = reaction_buffer.resolve(user_id, publication_id, reactions.get(publication_id))
+        return {publication_id: reaction for publication_id, reaction in reactions.items() if reaction}
+
+    @staticmethod
+    async def with_viewer_reactions(db: AsyncSession, page, viewer_id: Optional[uuid.UUID]):
+        """
+        Fill viewer_reaction on every item of a list response ({items, ...} dict or
+        model). Cached responses are shared, so items are copied, never modified.
+        """
+        if viewer_id is None:
+            return page
+
+        items = page["items"] if isinstance(page, dict) else page.items
+        if items and all(type(item) is dict for item in items):
+            # Row fast path: plain dicts, copied the same way
+            if "viewer_reaction" not in items[0]:
+                # A sparse fieldset that left the field out
+                return page
+            reactions = await ReactionService.get_user_reactions_for(db, viewer_id, [item["id"] for item in items])
+            items = [{**item, "viewer_reaction": reactions.get(item["id"])} for item in items]
+            return {**page, "items": items}
+
+        items = [
+            item if isinstance(item, PublicationResponse) else PublicationResponse.model_validate(item, from_attributes=True)
+            for item in items
+        ]
+        reactions = await ReactionService.get_user_reactions_for(db, viewer_id, [item.id for item in items])
+        # model_copy does not validate: store the enum, not the raw string
+        items = [
+            item.model_copy(update={"viewer_reaction": ReactionType(reactions[item.id]) if reactions.get(item.id) else None})
+            for item in items
+        ]
+
+        if isinstance(page, dict):
+            return {**page, "items": items}
+        return page.model_copy(update={"items": items})
+
+    @staticmethod
+    async def check_user_reaction(db: AsyncSession, user_id: uuid.UUID, publication_id: uuid.UUID):
         """
         Check if a user has reacted to a publication.
         Returns a dictionary with:
@@ -53,14 +320,21 @@ class ReactionService:
         - "reaction_type": type of reaction (like or dislike) if exists, otherwise None.
         """
         # Check if there's any reaction from the user on the given publication
-        reaction = db.query(Reaction).filter(
-            and_(
-                Reaction.id_user == user_id,
-                Reaction.id_publication == publication_id
+        reaction = (await db.execute(
+            select(Reaction).where(
+                and_(
+                    Reaction.id_user == user_id,
+                    Reaction.id_publication == publication_id
+                )
             )
-        ).first()
+        )).scalars().first()
+
+        reaction_type = reaction.type if reaction else None
+        if reaction_buffer.running:
+            # Include toggles still waiting in the write-behind buffer
+            reaction_type = reaction_buffer.resolve(user_id, publication_id, reaction_type)
 
-        if reaction:
-            return {"exists": True, "reaction_type": reaction.type}
+        if reaction_type:
+            return {"exists": True, "reaction_type": reaction_type}
         else:
-            return {"exists": False, "reaction_type": None}
\ No newline at end of file
+            return {"exists": False, "reaction_type": None}
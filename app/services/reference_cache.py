@@ -0,0 +1,137 @@
+# services/reference_cache.py
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import Settings
+from ..models.degree import Degree
+from ..models.page import Page
+from ..models.reference_data_version import ReferenceDataVersion
+from ..models.tag import Tag
+
+
+class ReferenceDataCache:
+    """
+    In-process copy of the tag, degree and page tables.
+
+    Triggers bump a per-table counter in reference_data_version on every write
+    (migration 007). Lookups read that small table at most once per
+    check_interval and reload only the tables whose counter moved; everything
+    else is served from memory.
+    """
+
+    TABLES = ("tag", "degree", "page")
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._lock = asyncio.Lock()
+        self._checked_at = float("-inf")
+        self.versions: Dict[str, int] = {}
+        self._tags: Dict[int, dict] = {}
+        self._degrees: Dict[int, str] = {}
+        self._pages: Dict[int, str] = {}
+        self.checks = 0
+        self.reloads = 0
+
+    async def _load(self, db: AsyncSession, table: str):
+        if table == "tag":
+            rows = (await db.execute(select(Tag.id, Tag.title, Tag.description).order_by(Tag.id))).all()
+            self._tags = {
+                tag_id: {"id": tag_id, "title": title, "description": description}
+                for tag_id, title, description in rows
+            }
+        elif table == "degree":
+            rows = (await db.execute(select(Degree.id, Degree.title).order_by(Degree.id))).all()
+            self._degrees = dict(rows)
+        elif table == "page":
+            rows = (await db.execute(select(Page.id, Page.url).order_by(Page.id))).all()
+            self._pages = dict(rows)
+        self.reloads += 1
+
+    async def refresh(self, db: AsyncSession, force: bool = False):
+        """Version check (rate limited unless forced), reloading tables that changed"""
+        if not force and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        async with self._lock:
+            if not force and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            versions = dict((await db.execute(
+                select(ReferenceDataVersion.name, ReferenceDataVersion.version)
+            )).all())
+            for table in self.TABLES:
+                # Tables without a counter row are reloaded on every check
+                if table not in self.versions or versions.get(table) is None or versions[table] != self.versions[table]:
+                    await self._load(db, table)
+            self.versions = versions
+            self._checked_at = time.monotonic()
+            self.checks += 1
+
+    async def tags(self, db: AsyncSession) -> List[dict]:
+        await self.refresh(db)
+        return list(self._tags.values())
+
+    async def degrees(self, db: AsyncSession) -> List[dict]:
+        await self.refresh(db)
+        return [{"id": degree_id, "title": title} for degree_id, title in self._degrees.items()]
+
+    async def pages(self, db: AsyncSession) -> List[dict]:
+        await self.refresh(db)
+        return [{"id": page_id, "url": url} for page_id, url in self._pages.items()]
+
+    async def existing_tag_ids(self, db: AsyncSession, tag_ids: Iterable[int]) -> Set[int]:
+        """The given tag ids that exist; an unknown id forces a version check first"""
+        tag_ids = set(tag_ids)
+        await self.refresh(db)
+        if not tag_ids <= self._tags.keys():
+            await self.refresh(db, force=True)
+        return tag_ids & self._tags.keys()
+
+    async def tag_map(self, db: AsyncSession, tag_ids: Iterable[int]) -> Dict[int, dict]:
+        """{id: tag dict} for the given ids that exist; the dicts are shared, do not modify them"""
+        tag_ids = set(tag_ids)
+        await self.refresh(db)
+        if not tag_ids <= self._tags.keys():
+            await self.refresh(db, force=True)
+        return {tag_id: self._tags[tag_id] for tag_id in tag_ids if tag_id in self._tags}
+
+    async def existing_page_ids(self, db: AsyncSession, page_ids: Iterable[int]) -> Set[int]:
+        """The given page ids that exist; an unknown id forces a version check first"""
+        page_ids = set(page_ids)
+        await self.refresh(db)
+        if not page_ids <= self._pages.keys():
+            await self.refresh(db, force=True)
+        return page_ids & self._pages.keys()
+
+    async def degree_title(self, db: AsyncSession, degree_id) -> Optional[str]:
+        """Title of a degree, None when it does not exist"""
+        try:
+            degree_id = int(degree_id)
+        except (TypeError, ValueError):
+            return None
+        await self.refresh(db)
+        if degree_id not in self._degrees:
+            await self.refresh(db, force=True)
+        return self._degrees.get(degree_id)
+
+    def clear(self):
+        """Drop the cached tables; the next lookup reloads all of them"""
+        self._checked_at = float("-inf")
+        self.versions = {}
+        self._tags, self._degrees, self._pages = {}, {}, {}
+
+    def stats(self) -> dict:
+        return {
+            "check_interval_seconds": self.check_interval,
+            "versions": dict(self.versions),
+            "tags": len(self._tags),
+            "degrees": len(self._degrees),
+            "pages": len(self._pages),
+            "checks": self.checks,
+            "reloads": self.reloads,
+        }
+
+
+reference_cache = ReferenceDataCache(check_interval=Settings.reference_cache_check_seconds)
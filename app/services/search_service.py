@@ -0,0 +1,115 @@
+# services/search_service.py
+from typing import List, Optional
+from sqlalchemy import Float, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from ..models.publication import Publication
+from .loading import PUBLICATION_RESPONSE
+from .projection import FULL_VIEW, PublicationProjection
+from .publication_service import PublicationService
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_rank_cursor, encode_rank_cursor
+
+# Must match the configuration of the publication.search_vector column
+SEARCH_CONFIG = literal_column("'spanish'::regconfig")
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+class SearchService:
+    """
+    Ranked full-text search over publication title and content, backed by the
+    GIN-indexed search_vector column. Pages by (rank, id) with opaque cursors,
+    and only the rows of the returned page pay for ts_headline.
+    """
+
+    @staticmethod
+    def _tsquery(q: str):
+        # websearch syntax: quoted phrases, OR and -excluded words; never a syntax error
+        return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    @staticmethod
+    def _ranked_ids(q: str, page_id: Optional[int], tag_ids: Optional[List[int]], cursor: Optional[str], limit: int):
+        tsquery = SearchService._tsquery(q)
+        rank = func.ts_rank_cd(Publication.search_vector, tsquery, type_=Float)
+
+        statement = (
+            select(Publication.id.label("id"), rank.label("rank"))
+            .where(Publication.search_vector.op("@@")(tsquery))
+        )
+        if page_id is not None:
+            statement = statement.where(Publication.page_id == page_id)
+        if tag_ids:
+            statement = statement.where(Publication.id.in_(PublicationService.tagged_ids_query(tag_ids)))
+        if cursor:
+            last_rank, last_id = decode_rank_cursor(cursor)
+            statement = statement.where(tuple_(rank, Publication.id) < tuple_(last_rank, last_id))
+
+        return (
+            statement
+            .order_by(rank.desc(), Publication.id.desc())
+            .limit(limit + 1)
+            .subquery("ranked")
+        )
+
+    @staticmethod
+    async def search_publications(
+        db: AsyncSession,
+        q: str,
+        page_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        projection: PublicationProjection = FULL_VIEW,
+    ):
+        """
+        Publications matching q, best match first, with highlighted snippets instead
+        of content. Other projections load and return only their own fields.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        ranked = SearchService._ranked_ids(q, page_id, tag_ids, cursor, limit)
+        snippet = func.ts_headline(
+            SEARCH_CONFIG, Publication.content, SearchService._tsquery(q), HEADLINE_OPTIONS
+        )
+
+        result = await db.execute(
+            select(Publication, ranked.c.rank, snippet.label("snippet"))
+            .join(ranked, ranked.c.id == Publication.id)
+            .options(*(
+                (defer(Publication.content), *PUBLICATION_RESPONSE) if projection.is_default
+                else projection.orm_options()
+            ))
+            .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+        )
+        rows = result.unique().all()
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last, last_rank, _ = page[-1]
+            next_cursor = encode_rank_cursor(last_rank, last.id)
+
+        if not projection.is_default:
+            items = [
+                {**projection.entity_item(publication), "rank": rank, "snippet": snippet}
+                for publication, rank, snippet in page
+            ]
+            return {"items": items, "next_cursor": next_cursor}
+
+        items = [
+            {
+                "id": publication.id,
+                "title": publication.title,
+                "date": publication.date,
+                "user_id": publication.user_id,
+                "user": publication.user,
+                "page_id": publication.page_id,
+                "page": publication.page,
+                "tags": publication.tags,
+                "likes_count": publication.likes_count,
+                "dislikes_count": publication.dislikes_count,
+                "rank": rank,
+                "snippet": snippet,
+            }
+            for publication, rank, snippet in page
+        ]
+        return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,273 @@
+# services/trending_service.py
+import asyncio
+import logging
+import math
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import DateTime, Float, case, column, delete, func, literal, select, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.database import AsyncSessionLocal
+from ..config.settings import Settings, get_settings
+from ..models.publication import Publication
+from ..models.reaction import Reaction
+from ..models.trending import PublicationTrending, TrendingState
+from ..schemas.publication_schema import TrendingPublicationResponse
+from .loading import PUBLICATION_RESPONSE
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .projection import FULL_VIEW, PublicationProjection
+from .publication_service import PublicationService
+
+logger = logging.getLogger(__name__)
+
+def _decay_rate() -> float:
+    """Per second: a score halves every half-life without new reactions"""
+    return math.log(2) / (get_settings().trending_half_life_hours * 3600)
+
+
+def _weights() -> Dict[str, float]:
+    settings = get_settings()
+    return {'like': settings.trending_like_weight, 'dislike': settings.trending_dislike_weight}
+
+
+# Rows that decayed below this are dropped by the re-decay job
+MIN_SCORE = 0.01
+
+# Rows rebased per re-decay transaction
+REDECAY_BATCH_SIZE = 1000
+
+# Released reactions older than this many half-lives are ignored (under 1e-9 of their weight)
+COLD_HALF_LIVES = 30
+
+class TrendingService:
+    """
+    Time-decayed "hot" score per publication.
+
+    Every stored score is expressed at an epoch: a reaction at time t adds
+    weight * e^(rate * (t - epoch)). Rows carry their own epoch, so a toggle
+    adds to a row at whatever epoch the row is at, without reading (or locking)
+    shared state. The re-decay job periodically rebases every row to now, which
+    keeps the stored numbers small, prunes publications that went cold and puts
+    all rows back on one epoch: relative order is then the order of the real
+    decayed scores, so the feed is a top-K scan of the score index.
+    """
+
+    @staticmethod
+    def _row_epoch():
+        """A row's epoch; rows from before migration 013 are at the shared one"""
+        shared = select(TrendingState.epoch).where(TrendingState.id == 1).scalar_subquery()
+        return func.coalesce(PublicationTrending.epoch, shared)
+
+    @staticmethod
+    def _growth(epoch):
+        """e^(rate * (now - epoch)): a weight added now, expressed at epoch"""
+        return func.exp(_decay_rate() * func.extract("epoch", func.now() - epoch))
+
+    @staticmethod
+    async def record(db: AsyncSession, deltas: Dict[uuid.UUID, Dict[str, int]]):
+        """
+        Add reaction changes ({publication_id: {type: delta}}) to the scores, inside the
+        caller's transaction. Removing a reaction takes its weight off at today's value,
+        never below zero.
+        """
+        reaction_weights = _weights()
+        weights = {
+            publication_id: sum(reaction_weights[reaction_type] * change for reaction_type, change in delta.items())
+            for publication_id, delta in deltas.items()
+        }
+        weights = sorted((publication_id, weight) for publication_id, weight in weights.items() if weight)
+        if not weights:
+            return
+
+        # Existing rows take the signed weight at their own epoch (re-evaluated
+        # if a re-decay batch rebased the row meanwhile); new rows only start from
+        # a positive one, at the shared epoch. Toggles already hold the publication
+        # row locks, so the two cannot race per row.
+        changes = values(
+            column("id", UUID(as_uuid=True)),
+            column("weight", Float),
+            name="changes",
+        ).data(weights)
+        await db.execute(
+            update(PublicationTrending)
+            .where(PublicationTrending.publication_id == changes.c.id)
+            .values(score=func.greatest(
+                PublicationTrending.score + changes.c.weight * TrendingService._growth(TrendingService._row_epoch()), 0
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        if any(weight > 0 for _, weight in weights):
+            await db.execute(
+                pg_insert(PublicationTrending)
+                .from_select(
+                    ["publication_id", "score", "epoch"],
+                    select(changes.c.id, changes.c.weight * TrendingService._growth(TrendingState.epoch), TrendingState.epoch)
+                    .join(TrendingState, TrendingState.id == 1)
+                    .where(changes.c.weight > 0),
+                )
+                .on_conflict_do_nothing(index_elements=[PublicationTrending.publication_id])
+            )
+
+    @staticmethod
+    async def release_reactions(db: AsyncSession, *conditions):
+        """
+        Take the reactions matching conditions out of the scores before they are
+        deleted, each at what is left of its weight today. Set-based, inside the
+        caller's transaction.
+        """
+        reaction_weights = _weights()
+        weight = case((Reaction.type == 'like', reaction_weights['like']), else_=reaction_weights['dislike'])
+        # Older reactions add nothing measurable (and would underflow exp())
+        since = datetime.now(timezone.utc) - timedelta(hours=get_settings().trending_half_life_hours * COLD_HALF_LIVES)
+        released = (
+            select(
+                Reaction.id_publication,
+                func.sum(weight * func.exp(
+                    -_decay_rate() * func.extract("epoch", func.now() - Reaction.date)
+                )).label("score"),
+            )
+            .where(*conditions, Reaction.date > since)
+            .group_by(Reaction.id_publication)
+            .subquery()
+        )
+        await db.execute(
+            update(PublicationTrending)
+            .where(PublicationTrending.publication_id == released.c.id_publication)
+            .values(score=func.greatest(
+                PublicationTrending.score - released.c.score * TrendingService._growth(TrendingService._row_epoch()), 0
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def redecay(batch_size: int = REDECAY_BATCH_SIZE):
+        """
+        Rebase every stored score to now, batch_size rows per transaction, drop
+        the cold ones, then move the shared epoch there. Each batch locks its
+        publications in id order, as toggles do, so toggles on other publications
+        never wait for it.
+        """
+        async with AsyncSessionLocal() as db:
+            target = (await db.execute(
+                select(func.now()).select_from(TrendingState).where(TrendingState.id == 1)
+            )).scalar()
+        if target is None:
+            return
+
+        rebased = PublicationTrending.score * func.exp(
+            -_decay_rate() * func.extract("epoch", literal(target, DateTime(timezone=True)) - TrendingService._row_epoch())
+        )
+        last = None
+        while True:
+            async with AsyncSessionLocal() as db:
+                try:
+                    statement = select(PublicationTrending.publication_id).order_by(PublicationTrending.publication_id).limit(batch_size)
+                    if last is not None:
+                        statement = statement.where(PublicationTrending.publication_id > last)
+                    ids = (await db.execute(statement)).scalars().all()
+                    if not ids:
+                        break
+                    await db.execute(
+                        select(Publication.id)
+                        .where(Publication.id.in_(ids))
+                        .order_by(Publication.id)
+                        .with_for_update(key_share=True)
+                    )
+                    await db.execute(
+                        update(PublicationTrending)
+                        .where(PublicationTrending.publication_id.in_(ids))
+                        .values(score=rebased, epoch=target)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.execute(
+                        delete(PublicationTrending)
+                        .where(PublicationTrending.publication_id.in_(ids), PublicationTrending.score < MIN_SCORE)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            last = ids[-1]
+
+        # Rows created meanwhile at the old epoch keep it until the next run
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(TrendingState).where(TrendingState.id == 1).values(epoch=target))
+            await db.commit()
+
+    @staticmethod
+    async def get_trending(
+        db: AsyncSession,
+        page_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        projection: PublicationProjection = FULL_VIEW,
+    ):
+        """The top `limit` publications by current trending score"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        epoch = func.coalesce(PublicationTrending.epoch, TrendingState.epoch)
+        decay = func.exp(-_decay_rate() * func.extract("epoch", func.now() - epoch))
+
+        statement = (
+            select(Publication, (PublicationTrending.score * decay).label("score"))
+            .join(PublicationTrending, PublicationTrending.publication_id == Publication.id)
+            .join(TrendingState, TrendingState.id == 1)
+            .options(*(PUBLICATION_RESPONSE if projection.is_default else projection.orm_options()))
+            .order_by(PublicationTrending.score.desc(), PublicationTrending.publication_id.desc())
+            .limit(limit)
+        )
+        if page_id is not None:
+            statement = statement.where(Publication.page_id == page_id)
+        if tag_ids:
+            statement = statement.where(Publication.id.in_(PublicationService.tagged_ids_query(tag_ids)))
+
+        rows = (await db.execute(statement)).unique().all()
+        if not projection.is_default:
+            items = [
+                {**projection.entity_item(publication), "trending_score": round(score or 0.0, 4)}
+                for publication, score in rows
+            ]
+            return {"items": items}
+
+        items = [
+            TrendingPublicationResponse.model_validate(publication, from_attributes=True).model_copy(
+                update={"trending_score": round(score or 0.0, 4)}
+            )
+            for publication, score in rows
+        ]
+        return {"items": items}
+
+
+class TrendingDecayJob:
+    """Background task running TrendingService.redecay every `interval` seconds"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await TrendingService.redecay()
+            except Exception:
+                logger.exception("Trending re-decay failed")
+
+
+trending_decay_job = TrendingDecayJob(interval=Settings.trending_redecay_seconds)
@@ -0,0 +1,204 @@
+# services/user_purge.py
+"""
+Deleting user accounts.
+
+A user row cascades (ON DELETE CASCADE) to their publications, and from there
+to reactions, tag links, trending scores and rollups, so a small account goes
+with one DELETE once its reactions are out of the counters and rollups.
+
+Accounts with more than USER_PURGE_THRESHOLD publications + reactions are
+purged in the background instead: USER_PURGE_BATCH_SIZE publications per
+transaction, then the user's reactions on USER_PURGE_BATCH_SIZE publications
+per transaction, then the user row. No transaction holds locks on the whole
+account. A purge cut short (shutdown, error) leaves a smaller account behind
+and resumes when the delete is requested again, or with
+`python -m app.commands.purge_user`.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.database import AsyncSessionLocal
+from ..config.settings import Settings
+from ..models.publication import Publication
+from ..models.reaction import Reaction
+from ..models.user import User
+from .cache import invalidate_publication, publication_cache
+from .reaction_rollup_service import ReactionRollupService
+from .reaction_service import ReactionService
+
+logger = logging.getLogger(__name__)
+
+
+class UserPurger:
+    """Synchronous deletes of small accounts and background purges of large ones"""
+
+    def __init__(self, threshold: int, batch_size: int):
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self._tasks: Dict[uuid.UUID, asyncio.Task] = {}
+        self.purged = 0
+        self.failed = 0
+        self.batches = 0
+        self.publications_deleted = 0
+        self.reactions_deleted = 0
+        self.longest_batch_ms = 0.0
+
+    @staticmethod
+    async def account_size(db: AsyncSession, user_id: uuid.UUID, limit: int) -> int:
+        """Publications + reactions of a user, counting no further than limit of each"""
+        size = 0
+        for statement in (
+            select(Publication.id).where(Publication.user_id == user_id),
+            select(Reaction.id_publication).where(Reaction.id_user == user_id),
+        ):
+            size += (await db.execute(
+                select(func.count()).select_from(statement.limit(limit).subquery())
+            )).scalar_one()
+        return size
+
+    async def should_purge(self, db: AsyncSession, user_id: uuid.UUID) -> bool:
+        if user_id in self._tasks:
+            return True
+        if self.threshold <= 0:
+            return False
+        return await self.account_size(db, user_id, self.threshold + 1) > self.threshold
+
+    @staticmethod
+    async def delete_account(db: AsyncSession, user_id: uuid.UUID):
+        """
+        Delete the user row and, through the cascades, everything under it, keeping
+        counters and rollups in sync. Runs in the caller's transaction.
+        """
+        # New reactions by the user check the row with FOR KEY SHARE: they wait from here on
+        await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+        await ReactionService.release_user_reactions(db, user_id)
+        await db.execute(delete(User).where(User.id == user_id))
+
+    async def _delete_publications_batch(self, user_id: uuid.UUID) -> int:
+        """Delete up to batch_size of the user's publications in one transaction"""
+        async with AsyncSessionLocal() as db:
+            try:
+                ids = (await db.execute(
+                    select(Publication.id)
+                    .where(Publication.user_id == user_id)
+                    .order_by(Publication.id)
+                    .limit(self.batch_size)
+                )).scalars().all()
+                if not ids:
+                    return 0
+                await ReactionService._lock_publications(db, ids)
+                await ReactionRollupService.release_publications(db, Publication.id.in_(ids))
+                await db.execute(delete(Publication).where(Publication.id.in_(ids)))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        for publication_id in ids:
+            invalidate_publication(publication_id)
+        self.publications_deleted += len(ids)
+        return len(ids)
+
+    async def _delete_reactions_batch(self, user_id: uuid.UUID) -> int:
+        """Delete the user's reactions on up to batch_size publications in one transaction"""
+        async with AsyncSessionLocal() as db:
+            try:
+                publication_ids = (await db.execute(
+                    select(Reaction.id_publication)
+                    .where(Reaction.id_user == user_id)
+                    .order_by(Reaction.id_publication)
+                    .limit(self.batch_size)
+                )).scalars().all()
+                if not publication_ids:
+                    return 0
+                # Same lock order as toggles, so counters cannot move underneath
+                await ReactionService._lock_publications(db, publication_ids)
+                conditions = (Reaction.id_user == user_id, Reaction.id_publication.in_(publication_ids))
+                await ReactionService.release_reactions(db, *conditions)
+                await db.execute(delete(Reaction).where(*conditions))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        for publication_id in publication_ids:
+            invalidate_publication(publication_id)
+        self.reactions_deleted += len(publication_ids)
+        return len(publication_ids)
+
+    async def _timed(self, batch) -> int:
+        start = time.perf_counter()
+        deleted = await batch
+        if deleted:
+            self.batches += 1
+            self.longest_batch_ms = max(self.longest_batch_ms, round((time.perf_counter() - start) * 1000, 3))
+        return deleted
+
+    async def purge(self, user_id: uuid.UUID) -> bool:
+        """Delete an account batch by batch; False if the user did not exist"""
+        while await self._timed(self._delete_publications_batch(user_id)):
+            pass
+        while await self._timed(self._delete_reactions_batch(user_id)):
+            pass
+        async with AsyncSessionLocal() as db:
+            try:
+                exists = (await db.execute(select(User.id).where(User.id == user_id))).scalar()
+                if exists is not None:
+                    await self.delete_account(db, user_id)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        publication_cache.clear()
+        return exists is not None
+
+    def schedule(self, user_id: uuid.UUID):
+        """Purge the account in a background task (once per user at a time)"""
+        if user_id not in self._tasks:
+            self._tasks[user_id] = asyncio.create_task(self._run(user_id))
+
+    def purging(self, user_id: uuid.UUID) -> bool:
+        return user_id in self._tasks
+
+    async def _run(self, user_id: uuid.UUID):
+        try:
+            await self.purge(user_id)
+            self.purged += 1
+        except Exception:
+            self.failed += 1
+            logger.exception("Purge of user %s failed; deleting the user again resumes it", user_id)
+        finally:
+            self._tasks.pop(user_id, None)
+
+    async def stop(self):
+        """Cancel running purges; each stops at a batch boundary (its transaction rolls back)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+
+    def stats(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "batch_size": self.batch_size,
+            "running": [str(user_id) for user_id in self._tasks],
+            "purged": self.purged,
+            "failed": self.failed,
+            "batches": self.batches,
+            "publications_deleted": self.publications_deleted,
+            "reactions_deleted": self.reactions_deleted,
+            "longest_batch_ms": self.longest_batch_ms,
+        }
+
+
+# Per process: a purge runs in the worker that accepted the delete
+user_purger = UserPurger(threshold=Settings.user_purge_threshold, batch_size=Settings.user_purge_batch_size)
@@ -1,52 +1,52 @@
 # services/user_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
-from app.models.degree import Degree
 from ..models.user import User
+from .cache import invalidate_author, publication_cache
+from .reference_cache import reference_cache
+from .user_purge import user_purger
 from ..schemas.user_schema import UserPublicResponse, UserUpdate
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_user_info(self, user_id: str):
+    async def get_user_info(self, user_id: str):
         try:
-            user_with_degree = (
-                self.db.query(User, Degree)
-                .join(Degree, User.degreeId == Degree.id)
-                .filter(User.id == user_id)
-                .first()
-            )
+            user = (await self.db.execute(select(User).where(User.id == user_id))).unique().scalars().first()
+            degree_title = await reference_cache.degree_title(self.db, user.degreeId) if user else None
 
-            if not user_with_degree:
+            if not user or degree_title is None:
                 raise HTTPException(status_code=404, detail="User not found")
 
-            user, degree = user_with_degree
-
             user_info = UserPublicResponse (
                 name=user.name,
                 lastName=user.lastName,
                 mail=user.mail,
                 bio=user.bio,
-                degreeTitle=degree.title
+                degreeTitle=degree_title
             )
 
             return user_info
         
         except Exception as e:
-            print(f"Error retrieving user info: {e}")
+            logger.exception("Error retrieving user info for %s", user_id)
             raise HTTPException(status_code=500, detail="Internal server error")
 
     
-    def update_user(self, user_id: str, user_update: UserUpdate):
-        user = self.db.query(User).filter(User.id == user_id).first()
+    async def update_user(self, user_id: str, user_update: UserUpdate):
+        user = (await self.db.execute(select(User).where(User.id == user_id))).unique().scalars().first()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -59,13 +59,16 @@ class UserService:
             user.bio = user_update.bio
         if user_update.degreeId:
             user.degreeId = user_update.degreeId
+        user.version = User.version + 1
         
         try:
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
+            # Cached publication bodies embed the author's name, mail and bio
+            invalidate_author(user.id)
             
             # Fetch degre
-            degree_title = self.db.query(Degree.title).filter(Degree.id == user.degreeId).scalar()
+            degree_title = await reference_cache.degree_title(self.db, user.degreeId)
             
             # RESPONSE PRST
             return {
@@ -78,23 +81,31 @@ class UserService:
                 "degreeTitle": degree_title or ""
             }
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
 
 
-    def delete_user(self, user_id: str):
+    async def delete_user(self, user_id: str):
         """
-        Delete user based on user ID
+        Delete user based on user ID. Small accounts go in one set-based transaction
+        (the database cascades to publications and reactions); large ones are handed
+        to the background purge and reported with "purging": True.
         """
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        user_id = (await self.db.execute(select(User.id).where(User.id == user_id))).scalar()
+        if user_id is None:
             raise HTTPException(status_code=404, detail="User not found")
-        
+
+        if await user_purger.should_purge(self.db, user_id):
+            user_purger.schedule(user_id)
+            return {"message": "User deletion scheduled", "purging": True}
+
         try:
-            self.db.delete(user)
-            self.db.commit()
+            # Keeps the counters and rollups of other users' publications in sync
+            await user_purger.delete_account(self.db, user_id)
+            await self.db.commit()
+            # Their publications and reactions are spread over every cached read
+            publication_cache.clear()
             return {"message": "User deleted successfully"}
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
-            
\ No newline at end of file
@@ -0,0 +1,138 @@
+# services/warmup_service.py
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from ..config.database import AsyncSessionLocal, Database
+from .etag_service import ETagService
+from .publication_cache_service import PublicationCacheService
+from .reaction_service import ReactionService
+from .reference_cache import reference_cache
+from .search_service import SearchService
+from .trending_service import TrendingService
+
+logger = logging.getLogger(__name__)
+
+# Matches no row: warm-up only needs the statement shapes
+NO_ID = uuid.UUID(int=0)
+
+# Seconds between warm-up attempts after a failed startup warm-up
+RETRY_INTERVAL = 5.0
+
+
+class StartupWarmup:
+    """
+    Readiness gate. Before the app reports ready it configures the ORM mappers,
+    opens the pool's connections, loads the reference cache and runs every hot
+    read path once, so the first real requests find compiled statements and
+    open connections instead of paying for them.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _timed(self, name: str, step):
+        start = time.perf_counter()
+        await step
+        self.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    @staticmethod
+    async def _configure_mappers():
+        configure_mappers()
+
+    @staticmethod
+    async def _warm_pool(database: Database):
+        settings = database.settings
+        if settings.db_pool_mode == "null":
+            return
+        count = settings.warmup_connections or settings.db_pool_size
+        for engine in [database.async_engine] + database.replica_engines:
+            # Held together so the pool really opens `count` distinct connections
+            connections = await asyncio.gather(*(engine.connect() for _ in range(count)))
+            try:
+                await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in connections))
+            finally:
+                await asyncio.gather(*(connection.close() for connection in connections))
+
+    @staticmethod
+    async def _reference_cache(db: AsyncSession):
+        await reference_cache.refresh(db, force=True)
+
+    @staticmethod
+    async def _hot_statements(db: AsyncSession):
+        """Each hot read once, bypassing the response cache; fills the compiled statement cache"""
+        tags = await reference_cache.tags(db)
+        pages = await reference_cache.pages(db)
+        page_id = pages[0]["id"] if pages else 0
+        tag_ids = [tags[0]["id"]] if tags else [0]
+
+        await ETagService.all_publications(db, limit=1)
+        await ETagService.publication(db, NO_ID)
+        await PublicationCacheService.get_all_publications(db, limit=1, use_cache=False)
+        await PublicationCacheService.get_publication_by_id(db, NO_ID, use_cache=False)
+        await PublicationCacheService.get_publications_by_page(db, page_id, limit=1, use_cache=False)
+        await PublicationCacheService.get_publications_by_user(db, NO_ID, limit=1, use_cache=False)
+        await PublicationCacheService.get_publications_by_tags(db, tag_ids, limit=1, use_cache=False)
+        await SearchService.search_publications(db, "propuesta", limit=1)
+        await TrendingService.get_trending(db, limit=1)
+        await ReactionService.get_user_reactions_for(db, NO_ID, [NO_ID])
+
+    async def run(self, database: Database) -> bool:
+        """Warm everything up; True (and ready) on success, False with the error logged"""
+        self.ready = False
+        self.error = None
+        self.steps = {}
+        try:
+            await self._timed("mappers", self._configure_mappers())
+            if database.settings.startup_warmup:
+                await self._timed("pool", self._warm_pool(database))
+                async with AsyncSessionLocal() as db:
+                    await self._timed("reference_cache", self._reference_cache(db))
+                    await self._timed("hot_statements", self._hot_statements(db))
+                # Compiled statements are cached per engine
+                for index, engine in enumerate(database.replica_engines):
+                    async with AsyncSessionLocal(bind=engine) as db:
+                        await self._timed(f"hot_statements_replica_{index}", self._hot_statements(db))
+        except Exception as exc:
+            logger.exception("Startup warm-up failed")
+            self.error = repr(exc)
+            return False
+        self.ready = True
+        logger.info("Startup warm-up done: %s", self.steps)
+        return True
+
+    def retry(self, database: Database):
+        """Keep retrying in the background until a warm-up succeeds"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._retry(database))
+
+    async def _retry(self, database: Database):
+        while not self.ready:
+            await asyncio.sleep(RETRY_INTERVAL)
+            await self.run(database)
+        self._task = None
+
+    async def stop(self):
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        return {"ready": self.ready, "error": self.error, "steps_ms": dict(self.steps)}
+
+
+startup_warmup = StartupWarmup()
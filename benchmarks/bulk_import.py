@@ -0,0 +1,80 @@
+# benchmarks/bulk_import.py
+"""
+Rows per second: POST /publications/ one by one vs POST /publications/bulk.
+
+Runs the app in-process against DATABASE_URL and deletes what it created.
+
+Usage:
+    python -m benchmarks.bulk_import --user-id <uuid> --page-id 1 --tag-id 1 [--rows 1000] [--batch 500]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete
+
+from app.config.database import AsyncSessionLocal
+from app.main import app
+from app.models.publication import Publication
+from app.models.publication_tag import PublicationTag
+
+
+def _item(args, n):
+    return {
+        "title": f"bench {n}",
+        "content": "contenido de prueba " * 20,
+        "tags": args.tag_id,
+        "user_id": args.user_id,
+        "page_id": args.page_id,
+    }
+
+
+async def _cleanup(ids):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(PublicationTag).where(PublicationTag.publication_id.in_(ids)))
+        await db.execute(delete(Publication).where(Publication.id.in_(ids)))
+        await db.commit()
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        created = []
+
+        start = time.perf_counter()
+        for n in range(args.rows):
+            response = await client.post("/publications/", json=_item(args, n))
+            response.raise_for_status()
+            created.append(uuid.UUID(response.json()["id"]))
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            batch = [_item(args, n) for n in range(offset, min(offset + args.batch, args.rows))]
+            response = await client.post("/publications/bulk", json={"items": batch})
+            response.raise_for_status()
+            created.extend(uuid.UUID(r["id"]) for r in response.json()["results"] if r["id"])
+        bulk = time.perf_counter() - start
+
+    await _cleanup(created)
+
+    print(f"rows: {args.rows}")
+    print(f"single create: {single:8.3f}s  {args.rows / single:10.1f} rows/s")
+    print(f"bulk import:   {bulk:8.3f}s  {args.rows / bulk:10.1f} rows/s  (batch {args.batch})")
+    print(f"speedup:       {single / bulk:8.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Single vs bulk publication import throughput")
+    parser.add_argument("--user-id", required=True, help="Existing user id to author the rows")
+    parser.add_argument("--page-id", type=int, required=True)
+    parser.add_argument("--tag-id", type=int, action="append", required=True, help="Repeat for several tags")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=500)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# benchmarks/datagen.py
+"""
+Seeded synthetic dataset for the benchmarks: degrees, pages, tags, users,
+publications, publication_tag and reactions at a chosen scale.
+
+Everything it creates is recognisable and removable: users have mails under
+@bench.example.com, degrees/pages/tags use ids from BENCH_ID_BASE up, and
+publications/reactions belong to those users. The same --seed always
+produces the same rows. Stored like/dislike counters are written consistent
+with the generated reactions, and the reaction rollups are rebuilt after loading.
+
+Usage:
+    python -m benchmarks.datagen --scale small [--seed 42]
+    python -m benchmarks.datagen --drop
+"""
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.config.database import get_database
+from app.models.degree import Degree
+from app.models.page import Page
+from app.models.publication import Publication
+from app.models.publication_tag import PublicationTag
+from app.models.reaction import Reaction
+from app.services.reaction_rollup_service import ReactionRollupService
+from app.models.tag import Tag
+from app.models.user import User
+from app.services.content_summary import summarize_content
+
+BENCH_ID_BASE = 900_000
+# Not a special-use TLD: the mails must pass EmailStr in responses
+BENCH_MAIL_DOMAIN = "bench.example.com"
+
+# Rows per executemany batch
+BATCH_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class Scale:
+    degrees: int
+    pages: int
+    tags: int
+    users: int
+    publications: int
+    reactions: int
+
+
+SCALES = {
+    "tiny": Scale(degrees=3, pages=3, tags=10, users=50, publications=300, reactions=2_000),
+    "small": Scale(degrees=5, pages=5, tags=20, users=200, publications=2_000, reactions=20_000),
+    "medium": Scale(degrees=10, pages=20, tags=50, users=2_000, publications=20_000, reactions=200_000),
+    "large": Scale(degrees=20, pages=50, tags=100, users=10_000, publications=200_000, reactions=2_000_000),
+}
+
+WORDS = (
+    "propuesta educación salud transporte agua energía seguridad empleo vivienda cultura "
+    "ciencia tecnología agricultura minería ambiente reforma justicia economía turismo "
+    "descentralización región ciudad comunidad jóvenes mujeres niños pueblo gobierno "
+    "presupuesto inversión infraestructura carretera hospital escuela universidad internet "
+    "corrupción transparencia participación ciudadana desarrollo sostenible nacional local"
+).split()
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _popularity(rng: random.Random, count: int):
+    """Heavy-tailed weights: a few authors and publications get most of the activity"""
+    return [rng.paretovariate(1.2) for _ in range(count)]
+
+
+def generate(scale: Scale, seed: int):
+    """Build every row in memory; returns {model: [row dicts]} in insert order"""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+
+    degrees = [{"id": BENCH_ID_BASE + i, "title": f"Carrera {i}"} for i in range(scale.degrees)]
+    pages = [{"id": BENCH_ID_BASE + i, "url": f"https://bench.example.com/page/{i}"} for i in range(scale.pages)]
+    tags = [
+        {"id": BENCH_ID_BASE + i, "title": f"{rng.choice(WORDS)}-{i}", "description": _text(rng, 8)}
+        for i in range(scale.tags)
+    ]
+    users = [
+        {
+            "id": _uuid(rng),
+            "name": f"Bench{i}",
+            "lastName": "User",
+            "mail": f"user{i}@{BENCH_MAIL_DOMAIN}",
+            "bio": _text(rng, 12),
+            "degreeId": rng.choice(degrees)["id"],
+        }
+        for i in range(scale.users)
+    ]
+
+    author_weights = _popularity(rng, len(users))
+    authors = rng.choices(users, weights=author_weights, k=scale.publications)
+    publications = []
+    publication_tags = []
+    for i, author in enumerate(authors):
+        publication_id = _uuid(rng)
+        content = _text(rng, rng.randint(40, 400))
+        excerpt, word_count = summarize_content(content)
+        publications.append({
+            "id": publication_id,
+            "title": _text(rng, rng.randint(3, 9)).capitalize(),
+            "content": content,
+            "excerpt": excerpt,
+            "word_count": word_count,
+            "date": now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            "user_id": author["id"],
+            "page_id": rng.choice(pages)["id"],
+            "likes_count": 0,
+            "dislikes_count": 0,
+        })
+        for tag in rng.sample(tags, rng.randint(1, min(4, len(tags)))):
+            publication_tags.append({"publication_id": publication_id, "tag_id": tag["id"]})
+
+    # Unique (user, publication) pairs, popular publications drawing most reactions
+    publication_weights = _popularity(rng, len(publications))
+    target = min(scale.reactions, len(users) * len(publications))
+    seen = set()
+    reactions = []
+    by_id = {publication["id"]: publication for publication in publications}
+    while len(reactions) < target:
+        publication = rng.choices(publications, weights=publication_weights, k=1)[0]
+        user = rng.choice(users)
+        key = (user["id"], publication["id"])
+        if key in seen:
+            continue
+        seen.add(key)
+        reaction_type = "like" if rng.random() < 0.8 else "dislike"
+        reactions.append({
+            "id_user": user["id"],
+            "id_publication": publication["id"],
+            "type": reaction_type,
+            "date": publication["date"] + timedelta(seconds=rng.randint(0, 30 * 86400)),
+        })
+        by_id[publication["id"]]["likes_count" if reaction_type == "like" else "dislikes_count"] += 1
+
+    return {
+        Degree: degrees,
+        Page: pages,
+        Tag: tags,
+        User: users,
+        Publication: publications,
+        PublicationTag: publication_tags,
+        Reaction: reactions,
+    }
+
+
+def load(dataset):
+    """Insert a generated dataset in one transaction"""
+    with get_database().engine.begin() as conn:
+        for model, rows in dataset.items():
+            for start in range(0, len(rows), BATCH_SIZE):
+                conn.execute(insert(model), rows[start:start + BATCH_SIZE])
+    with Session(get_database().engine) as db:
+        ReactionRollupService.rebuild(db)
+
+
+def drop():
+    """Delete every benchmark row (and whatever the benchmarks created under those users)"""
+    bench_users = select(User.id).where(User.mail.like(f"%@{BENCH_MAIL_DOMAIN}"))
+    bench_publications = select(Publication.id).where(
+        or_(Publication.user_id.in_(bench_users), Publication.page_id >= BENCH_ID_BASE)
+    )
+    with get_database().engine.begin() as conn:
+        conn.execute(delete(Reaction).where(
+            or_(Reaction.id_user.in_(bench_users), Reaction.id_publication.in_(bench_publications))
+        ))
+        conn.execute(delete(PublicationTag).where(PublicationTag.publication_id.in_(bench_publications)))
+        conn.execute(delete(Publication).where(Publication.id.in_(bench_publications)))
+        conn.execute(delete(User).where(User.mail.like(f"%@{BENCH_MAIL_DOMAIN}")))
+        conn.execute(delete(Tag).where(Tag.id >= BENCH_ID_BASE))
+        conn.execute(delete(Page).where(Page.id >= BENCH_ID_BASE))
+        conn.execute(delete(Degree).where(Degree.id >= BENCH_ID_BASE))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or drop the benchmark dataset")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Only delete the benchmark rows")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    drop()
+    if args.drop:
+        print(f"benchmark data dropped in {time.perf_counter() - start:.1f}s")
+        return
+
+    dataset = generate(SCALES[args.scale], args.seed)
+    load(dataset)
+    counts = ", ".join(f"{model.__tablename__}={len(rows)}" for model, rows in dataset.items())
+    print(f"scale {args.scale} (seed {args.seed}) loaded in {time.perf_counter() - start:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
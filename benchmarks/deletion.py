@@ -0,0 +1,148 @@
+# benchmarks/deletion.py
+"""
+How user deletion time grows with account size: one cascading transaction
+(DELETE /users/me below USER_PURGE_THRESHOLD) vs the batched background purge.
+
+For every size a throwaway user is created with that many publications on the
+benchmark pages. Bench users react to each publication, and the throwaway user
+reacts to as many bench publications, all through /reactions/batch so
+counters and rollups stay consistent. The account is then deleted both ways:
+total time, and the longest single transaction (what other writers can end up
+waiting behind).
+
+Runs the app in-process against DATABASE_URL, over the benchmarks.datagen dataset.
+
+Usage:
+    python -m benchmarks.datagen --scale small
+    python -m benchmarks.deletion [--size 10 --size 100 --size 1000] [--reactions 5] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+from sqlalchemy import insert, select
+
+from app.config.database import AsyncSessionLocal, get_database
+from app.main import app
+from app.models.page import Page
+from app.models.publication import Publication
+from app.models.publication_tag import PublicationTag
+from app.models.tag import Tag
+from app.models.user import User
+from app.services.user_purge import user_purger
+
+from .datagen import BENCH_ID_BASE, BENCH_MAIL_DOMAIN, WORDS
+
+DEFAULT_SIZES = [10, 100, 1000]
+# /reactions/batch accepts up to REACTION_BATCH_MAX_ITEMS
+TOGGLE_BATCH = 1000
+
+
+def _bench_context():
+    with get_database().engine.connect() as conn:
+        users = conn.execute(
+            select(User.id, User.degreeId).where(User.mail.like(f"%@{BENCH_MAIL_DOMAIN}")).order_by(User.id).limit(1000)
+        ).all()
+        publications = conn.execute(
+            select(Publication.id).where(Publication.page_id >= BENCH_ID_BASE).order_by(Publication.id).limit(20000)
+        ).scalars().all()
+        page_ids = conn.execute(select(Page.id).where(Page.id >= BENCH_ID_BASE)).scalars().all()
+        tag_ids = conn.execute(select(Tag.id).where(Tag.id >= BENCH_ID_BASE)).scalars().all()
+    if not users or not publications or not tag_ids:
+        raise SystemExit("No benchmark data found; run `python -m benchmarks.datagen` first")
+    return users, list(publications), list(page_ids), list(tag_ids)
+
+
+async def _build_account(client, rng: random.Random, size: int, reactions: int, context) -> uuid.UUID:
+    """A throwaway user with `size` publications, `reactions` reactions on each, and `size` reactions of their own"""
+    users, bench_publications, page_ids, tag_ids = context
+    user_id = uuid.uuid4()
+    publications = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"deletion bench {n}",
+            "content": " ".join(rng.choices(WORDS, k=60)),
+            "date": datetime.utcnow(),
+            "user_id": user_id,
+            "page_id": rng.choice(page_ids),
+        }
+        for n in range(size)
+    ]
+    with get_database().engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": user_id,
+            "name": "Deletion",
+            "lastName": "Bench",
+            "mail": f"deletion-{user_id.hex}@{BENCH_MAIL_DOMAIN}",
+            "degreeId": users[0].degreeId,
+        }])
+        for start in range(0, size, TOGGLE_BATCH):
+            conn.execute(insert(Publication), publications[start:start + TOGGLE_BATCH])
+        conn.execute(insert(PublicationTag), [
+            {"publication_id": publication["id"], "tag_id": rng.choice(tag_ids)} for publication in publications
+        ])
+
+    toggles = []
+    for publication in publications:
+        for reactor, _ in rng.sample(users, min(reactions, len(users))):
+            toggles.append({"id_user": str(reactor), "id_publication": str(publication["id"]), "type": "like"})
+    for publication_id in rng.sample(bench_publications, min(size, len(bench_publications))):
+        toggles.append({"id_user": str(user_id), "id_publication": str(publication_id), "type": rng.choice(("like", "dislike"))})
+    for start in range(0, len(toggles), TOGGLE_BATCH):
+        response = await client.post("/reactions/batch", json={"items": toggles[start:start + TOGGLE_BATCH]})
+        response.raise_for_status()
+    return user_id
+
+
+async def _delete_at_once(user_id: uuid.UUID):
+    """One transaction, so no separate longest batch: returns None"""
+    async with AsyncSessionLocal() as db:
+        await user_purger.delete_account(db, user_id)
+        await db.commit()
+    return None
+
+
+async def _delete_batched(user_id: uuid.UUID):
+    user_purger.longest_batch_ms = 0.0
+    await user_purger.purge(user_id)
+    return user_purger.longest_batch_ms
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    context = _bench_context()
+    user_purger.batch_size = args.batch_size
+    modes = [("cascade", _delete_at_once), ("batched", _delete_batched)]
+
+    print(f"{'publications':>12} {'reactions':>10} {'mode':>8} {'total s':>9} {'longest tx ms':>14}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for size in args.size:
+            for name, delete_account in modes:
+                user_id = await _build_account(client, rng, size, args.reactions, context)
+                start = time.perf_counter()
+                longest_ms = await delete_account(user_id)
+                elapsed = time.perf_counter() - start
+                if longest_ms is None:
+                    longest_ms = elapsed * 1000
+                reaction_rows = size * min(args.reactions, len(context[0])) + min(size, len(context[1]))
+                print(f"{size:>12} {reaction_rows:>10} {name:>8} {elapsed:>9.3f} {longest_ms:>14.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="User deletion time by account size")
+    parser.add_argument("--size", type=int, action="append", help="Publications per account; repeat (default 10, 100, 1000)")
+    parser.add_argument("--reactions", type=int, default=5, help="Reactions on each of the account's publications")
+    parser.add_argument("--batch-size", type=int, default=500, help="Publications per purge transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    args.size = args.size or DEFAULT_SIZES
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/reaction_load.py
+"""
+Concurrent reaction toggles: POST /reactions/toggle and POST /reactions/batch
+hammering the same (user, publication) keys at once.
+
+Every key is always toggled with the same type, so whatever order the requests
+interleave in, its final state only depends on how many toggles it received
+(odd -> flipped, even -> unchanged). Checks that no request failed, that every
+key ended in that state and that the stored counters match the reactions table.
+Afterwards every key is toggled back to where it started.
+
+Runs the app in-process against DATABASE_URL.
+
+Usage:
+    python -m benchmarks.reaction_load --user-id <uuid> [--user-id ...] --publication-id <uuid> [...]
+        [--workers 32] [--requests 50] [--batch-size 20]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+from sqlalchemy import select
+
+from app.config.database import AsyncSessionLocal, SessionLocal
+from app.main import app
+from app.models.reaction import Reaction
+from app.services.reaction_count_service import ReactionCountService
+
+
+async def _reaction_states(keys):
+    users = {user_id for user_id, _ in keys}
+    publications = {publication_id for _, publication_id in keys}
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(Reaction.id_user, Reaction.id_publication, Reaction.type)
+            .where(Reaction.id_user.in_(users), Reaction.id_publication.in_(publications))
+        )).all()
+    return {(user_id, publication_id): reaction_type for user_id, publication_id, reaction_type in rows}
+
+
+def _toggle(key, reaction_type):
+    user_id, publication_id = key
+    return {"id_user": str(user_id), "id_publication": str(publication_id), "type": reaction_type}
+
+
+async def _worker(client, keys, types, args, sent, errors, latencies):
+    rng = random.Random()
+    for _ in range(args.requests):
+        if rng.random() < 0.5:
+            batch = [rng.choice(keys) for _ in range(args.batch_size)]
+            start = time.perf_counter()
+            response = await client.post("/reactions/batch", json={"items": [_toggle(k, types[k]) for k in batch]})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json()["failed"]:
+                errors.append(response.text)
+                continue
+        else:
+            batch = [rng.choice(keys)]
+            start = time.perf_counter()
+            response = await client.post("/reactions/toggle", json=_toggle(batch[0], types[batch[0]]))
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.text)
+                continue
+        sent.update(batch)
+
+
+async def run(args):
+    keys = [(uuid.UUID(u), uuid.UUID(p)) for u in args.user_id for p in args.publication_id]
+    initial = await _reaction_states(keys)
+    # Toggle each key with the reaction it already has (or a random one)
+    types = {key: initial.get(key) or random.choice(("like", "dislike")) for key in keys}
+
+    sent, errors, latencies = Counter(), [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(client, keys, types, args, sent, errors, latencies) for _ in range(args.workers)
+        ))
+        elapsed = time.perf_counter() - start
+
+        final = await _reaction_states(keys)
+        wrong = []
+        for key in keys:
+            expected = initial.get(key)
+            if sent[key] % 2:
+                expected = None if expected else types[key]
+            if final.get(key) != expected:
+                wrong.append((key, expected, final.get(key)))
+
+        with SessionLocal() as db:
+            touched = {publication_id for _, publication_id in keys}
+            drift = [d for d in ReactionCountService.find_drift(db) if d["publication_id"] in touched]
+
+        # Put every key back where it started
+        restore = [_toggle(key, types[key]) for key in keys if final.get(key) != initial.get(key)]
+        if restore:
+            (await client.post("/reactions/batch", json={"items": restore})).raise_for_status()
+
+    latencies.sort()
+    toggles = sum(sent.values())
+    print(f"keys: {len(keys)}  workers: {args.workers}  requests: {len(latencies)}  toggles: {toggles}")
+    print(f"elapsed: {elapsed:.3f}s  {toggles / elapsed:10.1f} toggles/s")
+    if latencies:
+        print(f"latency p50: {latencies[len(latencies) // 2] * 1000:.1f}ms  "
+              f"p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"failed requests: {len(errors)}  wrong final states: {len(wrong)}  counter drift: {len(drift)}")
+    for error in errors[:5]:
+        print(f"  error: {error}")
+    for key, expected, actual in wrong[:5]:
+        print(f"  {key}: expected {expected}, got {actual}")
+    for row in drift[:5]:
+        print(f"  drift: {row}")
+    return 1 if errors or wrong or drift else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent reaction toggle load test")
+    parser.add_argument("--user-id", action="append", required=True, help="Existing user id; repeat for several")
+    parser.add_argument("--publication-id", action="append", required=True, help="Existing publication id; repeat for several")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per worker")
+    parser.add_argument("--batch-size", type=int, default=20)
+    sys.exit(asyncio.run(run(parser.parse_args(argv))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/report.py
+"""
+Summaries for benchmark runs and a side-by-side comparison of two of them.
+
+A run is a JSON document: {"meta": {...}, "peak_rss_mb": float,
+"scenarios": {name: summary}} where every summary holds latency
+percentiles, throughput and statements per request (see summarize).
+
+Usage:
+    python -m benchmarks.report baseline.json candidate.json
+"""
+import argparse
+import json
+import math
+import resource
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+# Columns printed by print_table / compared by compare
+COLUMNS = ("requests", "errors", "p50_ms", "p95_ms", "p99_ms", "throughput_rps", "statements_per_request")
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], statements: List[int], db_times: List[float], errors: int, elapsed: float) -> dict:
+    """Per-scenario numbers from per-request seconds, statement counts and DB seconds"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        "statements_per_request": round(sum(statements) / count, 2) if count else 0.0,
+        "db_ms_per_request": round(sum(db_times) / count * 1000, 3) if count else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(scenarios: Dict[str, dict], out=sys.stdout):
+    width = max((len(name) for name in scenarios), default=8)
+    print(f"{'scenario':<{width}}  " + "  ".join(f"{column:>{len(column)}}" for column in COLUMNS), file=out)
+    for name, summary in scenarios.items():
+        print(f"{name:<{width}}  " + "  ".join(f"{summary.get(column, 0):>{len(column)}}" for column in COLUMNS), file=out)
+
+
+def write_json(run: dict, path: str):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(run, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare(baseline: dict, candidate: dict, out=sys.stdout):
+    """Per scenario and column: baseline, candidate and the relative change"""
+    print(f"baseline  {baseline['meta'].get('git', '?')}  peak RSS {baseline.get('peak_rss_mb')} MB", file=out)
+    print(f"candidate {candidate['meta'].get('git', '?')}  peak RSS {candidate.get('peak_rss_mb')} MB", file=out)
+    for name in sorted(set(baseline["scenarios"]) | set(candidate["scenarios"])):
+        before = baseline["scenarios"].get(name)
+        after = candidate["scenarios"].get(name)
+        if before is None or after is None:
+            print(f"\n{name}: only in {'candidate' if before is None else 'baseline'}", file=out)
+            continue
+        print(f"\n{name}", file=out)
+        for column in COLUMNS[2:]:
+            old, new = before.get(column, 0), after.get(column, 0)
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            print(f"  {column:<24}{old:>12}{new:>12}{change:>10}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args(argv)
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.candidate, encoding="utf-8") as handle:
+        candidate = json.load(handle)
+    compare(baseline, candidate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# benchmarks/runner.py
+"""
+Drives every route in publication_routes, reaction_routes and user_routes
+in-process (httpx ASGITransport, the real middleware stack) against the
+dataset built by benchmarks.datagen, once per concurrency level.
+
+For each scenario it records per-request latency, SQL statements and DB time
+(record_queries), then reports p50/p95/p99, throughput and statements per
+request, plus the process's peak RSS. --output writes the run as JSON for
+benchmarks.report to compare.
+
+Writes stay inside the benchmark data: publications it creates are deleted
+again, every reaction key is toggled an even number of times, and DELETE
+/users/me only removes throwaway users inserted for it.
+
+Usage:
+    python -m benchmarks.datagen --scale small
+    python -m benchmarks.runner [--iterations 200] [--concurrency 1 --concurrency 16]
+        [--only by-page --only search] [--output run.json]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import delete, insert, select
+
+from app.config.database import get_database
+from app.config.query_stats import record_queries
+from app.main import app
+from app.models.page import Page
+from app.models.publication import Publication
+from app.models.publication_tag import PublicationTag
+from app.models.tag import Tag
+from app.models.user import User
+
+from .datagen import BENCH_ID_BASE, BENCH_MAIL_DOMAIN, WORDS
+from .report import git_revision, peak_rss_mb, print_table, summarize, write_json
+
+# Publications and users sampled from the dataset to spread requests over
+SAMPLE_USERS = 200
+SAMPLE_PUBLICATIONS = 1000
+
+
+@dataclass
+class Context:
+    rng: random.Random
+    users: List[uuid.UUID]
+    publications: List[Tuple[uuid.UUID, uuid.UUID]]
+    page_ids: List[int]
+    tag_ids: List[int]
+    # (publication id, author) created by the write scenarios, consumed by update/delete
+    created: List[Tuple[uuid.UUID, uuid.UUID]] = field(default_factory=list)
+    # Users inserted only to be deleted through DELETE /users/me
+    disposable_users: List[uuid.UUID] = field(default_factory=list)
+
+    def user(self) -> str:
+        return str(self.rng.choice(self.users))
+
+    def publication(self) -> Tuple[uuid.UUID, uuid.UUID]:
+        return self.rng.choice(self.publications)
+
+    def tags(self, count: int) -> List[int]:
+        return self.rng.sample(self.tag_ids, min(count, len(self.tag_ids)))
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # (context, iteration) -> httpx request kwargs including "url"; None skips the iteration
+    build: Callable[[Context, int], Optional[dict]]
+    after: Optional[Callable[[Context, httpx.Response], None]] = None
+    # Cap for scenarios that are too heavy to repeat at full iterations
+    max_iterations: Optional[int] = None
+
+
+def _new_publication(ctx: Context) -> dict:
+    return {
+        "title": " ".join(ctx.rng.choice(WORDS) for _ in range(5)),
+        "content": " ".join(ctx.rng.choice(WORDS) for _ in range(120)),
+        "tags": ctx.tags(2),
+        "user_id": ctx.user(),
+        "page_id": ctx.rng.choice(ctx.page_ids),
+    }
+
+
+def _remember_created(ctx: Context, response: httpx.Response):
+    body = response.json()
+    if "results" not in body:
+        ctx.created.append((uuid.UUID(body["id"]), uuid.UUID(body["user_id"])))
+        return
+    # Bulk results only carry the index; the author comes from the request
+    items = json.loads(response.request.content)["items"]
+    ctx.created.extend(
+        (uuid.UUID(result["id"]), uuid.UUID(items[result["index"]]["user_id"]))
+        for result in body["results"] if result.get("id")
+    )
+
+
+def _update(ctx: Context, i: int):
+    if not ctx.created:
+        return None
+    publication_id, user_id = ctx.created[i % len(ctx.created)]
+    body = _new_publication(ctx)
+    return {"url": f"/publications/{publication_id}/{user_id}", "json": {
+        "title": body["title"], "content": body["content"], "tags": body["tags"], "page_id": body["page_id"],
+    }}
+
+
+def _delete(ctx: Context, i: int):
+    if not ctx.created:
+        return None
+    publication_id, user_id = ctx.created.pop()
+    return {"url": f"/publications/{publication_id}/{user_id}"}
+
+
+def _toggle_key(ctx: Context, i: int):
+    # Iterations 2k and 2k+1 toggle the same key with the same type: net unchanged
+    keyed = random.Random(i // 2)
+    publication_id, _ = keyed.choice(ctx.publications)
+    return {
+        "id_user": str(keyed.choice(ctx.users)),
+        "id_publication": str(publication_id),
+        "type": keyed.choice(("like", "dislike")),
+    }
+
+
+def _toggle_batch(ctx: Context, i: int):
+    keys = [_toggle_key(ctx, 2 * (i * 10 + n)) for n in range(10)]
+    return {"url": "/reactions/batch", "json": {"items": keys + keys}}
+
+
+def _delete_user(ctx: Context, i: int):
+    if not ctx.disposable_users:
+        return None
+    return {"url": "/users/me", "headers": {"user-id": str(ctx.disposable_users.pop())}}
+
+
+def _with_viewer(ctx: Context, url: str, params: dict = None) -> dict:
+    params = dict(params or {})
+    if ctx.rng.random() < 0.5:
+        params["viewer_id"] = ctx.user()
+    return {"url": url, "params": params}
+
+
+SCENARIOS = [
+    # publication_routes, reads
+    Scenario("all-items", "GET", lambda ctx, i: _with_viewer(ctx, "/publications/all-items")),
+    Scenario("all-items-summary", "GET", lambda ctx, i: _with_viewer(ctx, "/publications/all-items", {"view": "summary"})),
+    Scenario("all-items-fields", "GET", lambda ctx, i: {"url": "/publications/all-items", "params": {"fields": "title,date,likes_count"}}),
+    Scenario("by-page", "GET", lambda ctx, i: _with_viewer(ctx, f"/publications/by-page/{ctx.rng.choice(ctx.page_ids)}")),
+    Scenario("by-user", "GET", lambda ctx, i: _with_viewer(ctx, f"/publications/by-user/{ctx.publication()[1]}")),
+    Scenario("by-tags-any", "GET", lambda ctx, i: _with_viewer(
+        ctx, "/publications/by-tags", {"tag_ids": ctx.tags(2), "mode": "any"})),
+    Scenario("by-tags-all", "GET", lambda ctx, i: _with_viewer(
+        ctx, "/publications/by-tags", {"tag_ids": ctx.tags(2), "mode": "all"})),
+    Scenario("user-likes", "GET", lambda ctx, i: _with_viewer(ctx, f"/publications/user-reactions/{ctx.user()}/likes")),
+    Scenario("user-dislikes", "GET", lambda ctx, i: _with_viewer(ctx, f"/publications/user-reactions/{ctx.user()}/dislikes")),
+    Scenario("search", "GET", lambda ctx, i: {"url": "/publications/search", "params": {
+        "q": " ".join(ctx.rng.sample(WORDS, 2))}}),
+    Scenario("trending", "GET", lambda ctx, i: _with_viewer(ctx, "/publications/trending")),
+    Scenario("by-id", "GET", lambda ctx, i: {"url": f"/publications/{ctx.publication()[0]}"}),
+    Scenario("publication-tags", "GET", lambda ctx, i: {"url": f"/publications/{ctx.publication()[0]}/tags"}),
+    Scenario("export-ndjson", "GET", lambda ctx, i: {"url": "/publications/export"}, max_iterations=3),
+    # publication_routes, writes
+    Scenario("create", "POST", lambda ctx, i: {"url": "/publications/", "json": _new_publication(ctx)},
+             after=_remember_created),
+    Scenario("bulk-create", "POST", lambda ctx, i: {"url": "/publications/bulk", "json": {
+        "items": [_new_publication(ctx) for _ in range(20)]}}, after=_remember_created),
+    Scenario("update", "PUT", _update),
+    # reaction_routes
+    Scenario("reaction-toggle", "POST", lambda ctx, i: {"url": "/reactions/toggle", "json": _toggle_key(ctx, i)}),
+    Scenario("reaction-batch", "POST", _toggle_batch),
+    Scenario("reaction-lookup", "POST", lambda ctx, i: {"url": "/reactions/lookup", "json": {
+        "id_user": ctx.user(),
+        "publication_ids": [str(ctx.publication()[0]) for _ in range(20)],
+    }}),
+    Scenario("reaction-get", "GET", lambda ctx, i: {"url": f"/reactions/reaction-get/{ctx.user()}/{ctx.publication()[0]}"}),
+    Scenario("reaction-counts", "GET", lambda ctx, i: {"url": f"/reactions/counts/{ctx.publication()[0]}"}),
+    Scenario("reaction-series", "GET", lambda ctx, i: {"url": f"/reactions/series/publication/{ctx.publication()[0]}"}),
+    Scenario("reaction-series-page", "GET", lambda ctx, i: {
+        "url": f"/reactions/series/page/{ctx.rng.choice(ctx.page_ids)}", "params": {"granularity": "day"}}),
+    Scenario("reaction-leaderboard", "GET", lambda ctx, i: {
+        "url": f"/reactions/leaderboard/{ctx.rng.choice(ctx.page_ids)}", "params": {"metric": "net"}}),
+    # user_routes
+    Scenario("user-get", "GET", lambda ctx, i: {"url": "/users/me", "headers": {"user-id": ctx.user()}}),
+    Scenario("user-update", "PUT", lambda ctx, i: {"url": "/users/me", "headers": {"user-id": ctx.user()},
+                                                    "json": {"bio": " ".join(ctx.rng.sample(WORDS, 8))}}),
+    Scenario("user-delete", "DELETE", _delete_user),
+    # Last: removes what create/bulk-create made
+    Scenario("delete", "DELETE", _delete),
+]
+
+
+def _load_context(seed: int) -> Context:
+    bench_users = select(User.id).where(User.mail.like(f"%@{BENCH_MAIL_DOMAIN}"))
+    with get_database().engine.connect() as conn:
+        users = conn.execute(bench_users.order_by(User.id).limit(SAMPLE_USERS)).scalars().all()
+        publications = conn.execute(
+            select(Publication.id, Publication.user_id)
+            .where(Publication.user_id.in_(bench_users))
+            .order_by(Publication.id)
+            .limit(SAMPLE_PUBLICATIONS)
+        ).all()
+        tag_ids = conn.execute(select(Tag.id).where(Tag.id >= BENCH_ID_BASE).order_by(Tag.id)).scalars().all()
+        page_ids = conn.execute(select(Page.id).where(Page.id >= BENCH_ID_BASE).order_by(Page.id)).scalars().all()
+    if not users or not publications or not tag_ids:
+        raise SystemExit("No benchmark data found; run `python -m benchmarks.datagen` first")
+    return Context(
+        rng=random.Random(seed),
+        users=list(users),
+        publications=[tuple(row) for row in publications],
+        page_ids=list(page_ids),
+        tag_ids=list(tag_ids),
+    )
+
+
+def _add_disposable_users(ctx: Context, count: int):
+    with get_database().engine.begin() as conn:
+        degree_id = conn.execute(
+            select(User.degreeId).where(User.id == ctx.users[0])
+        ).scalar()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "name": "Disposable",
+                "lastName": "User",
+                "mail": f"disposable-{uuid.uuid4().hex}@{BENCH_MAIL_DOMAIN}",
+                "degreeId": degree_id,
+            }
+            for _ in range(count)
+        ]
+        conn.execute(insert(User), rows)
+    ctx.disposable_users.extend(row["id"] for row in rows)
+
+
+def _cleanup(ctx: Context):
+    """Whatever the write scenarios left behind (failed deletes, skipped scenarios)"""
+    leftovers = [publication_id for publication_id, _ in ctx.created]
+    with get_database().engine.begin() as conn:
+        if leftovers:
+            conn.execute(delete(PublicationTag).where(PublicationTag.publication_id.in_(leftovers)))
+            conn.execute(delete(Publication).where(Publication.id.in_(leftovers)))
+        if ctx.disposable_users:
+            conn.execute(delete(User).where(User.id.in_(ctx.disposable_users)))
+    ctx.created.clear()
+    ctx.disposable_users.clear()
+
+
+async def _run_scenario(client, ctx: Context, scenario: Scenario, iterations: int, concurrency: int):
+    iterations = min(iterations, scenario.max_iterations or iterations)
+    # Pairs of toggles cancel out; keep the count even
+    iterations += iterations % 2
+    latencies, statements, db_times = [], [], []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            request = scenario.build(ctx, i)
+            if request is None:
+                return
+            with record_queries() as stats:
+                start = time.perf_counter()
+                response = await client.request(scenario.method, **request)
+                elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            statements.append(stats.statements)
+            db_times.append(stats.db_time)
+            if response.status_code >= 400:
+                errors += 1
+            elif scenario.after is not None:
+                scenario.after(ctx, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    return summarize(latencies, statements, db_times, errors, time.perf_counter() - start)
+
+
+async def run(args):
+    ctx = _load_context(args.seed)
+    selected = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    results = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm-up: connections, caches and statement compilation out of the measurements
+        for scenario in selected:
+            if scenario.method == "GET":
+                await _run_scenario(client, ctx, scenario, 2, 1)
+
+        for concurrency in args.concurrency:
+            if any(s.name == "user-delete" for s in selected):
+                _add_disposable_users(ctx, args.iterations + 1)
+            try:
+                for scenario in selected:
+                    name = f"{scenario.name}@c{concurrency}"
+                    results[name] = await _run_scenario(client, ctx, scenario, args.iterations, concurrency)
+                    print(f"{name}: p50 {results[name]['p50_ms']}ms  {results[name]['throughput_rps']} req/s", flush=True)
+            finally:
+                _cleanup(ctx)
+
+    run_document = {
+        "meta": {
+            "git": git_revision(),
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "users_sampled": len(ctx.users),
+            "publications_sampled": len(ctx.publications),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "scenarios": results,
+    }
+    print()
+    print_table(results)
+    print(f"\npeak RSS: {run_document['peak_rss_mb']} MB")
+    if args.output:
+        write_json(run_document, args.output)
+        print(f"written to {args.output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency, throughput and SQL per route over the benchmark dataset")
+    parser.add_argument("--iterations", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--concurrency", type=int, action="append", help="Repeat for several levels (default 1 and 16)")
+    parser.add_argument("--only", action="append", help="Scenario name; repeat to select several")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the run as JSON here")
+    args = parser.parse_args(argv)
+    args.concurrency = args.concurrency or [1, 16]
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
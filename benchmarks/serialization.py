@@ -0,0 +1,141 @@
+# benchmarks/serialization.py
+"""
+List response serialization without a database: the ORM path (Publication
+objects -> PublicationResponse -> response_model -> JSON) against the row
+fast path (row tuples -> PublicationProjection.build_items -> orjson), for
+pages of 100, 1,000 and 10,000 items.
+
+Both are served by a FastAPI route and requested in-process, so the numbers
+include everything FastAPI does with the return value. The two bodies are
+checked to decode to the same JSON.
+
+Usage:
+    python -m benchmarks.serialization [--sizes 100 1000 10000] [--repeat 20] [--output serialization.json]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+
+from app.config.json_response import FastJSONResponse
+from app.models.page import Page
+from app.models.publication import Publication
+from app.models.publication_tag import PublicationTag  # noqa: F401 (mapped for Publication.tags)
+from app.models.tag import Tag
+from app.models.user import User
+from app.schemas.publication_schema import PublicationListResponse, PublicationResponse
+from app.services.projection import FULL_VIEW
+
+from .report import git_revision, write_json
+
+
+def _dataset(size: int, seed: int = 7):
+    """The same page as ORM objects and as FULL_VIEW row tuples plus tag dicts"""
+    rng = random.Random(seed)
+    tags = [Tag(id=i, title=f"tag {i}", description=f"descripción {i}") for i in range(1, 21)]
+    pages = [Page(id=i, url=f"https://example.com/page/{i}") for i in range(1, 6)]
+    users = [
+        User(id=uuid.UUID(int=rng.getrandbits(128)), name=f"Nombre{i}", lastName="Apellido",
+             mail=f"user{i}@example.com", bio="bio " * 10, degreeId=str(1 + i % 5))
+        for i in range(50)
+    ]
+
+    publications, rows, row_tags = [], [], {}
+    for i in range(size):
+        user, page = rng.choice(users), rng.choice(pages)
+        publication_tags = rng.sample(tags, 3)
+        publication = Publication(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            title=f"Propuesta {i}",
+            content="contenido de la propuesta " * 30,
+            date=datetime(2026, 1, 1) - timedelta(minutes=i),
+            user_id=user.id,
+            page_id=page.id,
+            likes_count=rng.randint(0, 500),
+            dislikes_count=rng.randint(0, 50),
+        )
+        publication.user, publication.page, publication.tags = user, page, publication_tags
+        publications.append(publication)
+        values = {
+            "id": publication.id, "title": publication.title, "content": publication.content,
+            "date": publication.date, "user_id": user.id, "page_id": page.id,
+            "likes_count": publication.likes_count, "dislikes_count": publication.dislikes_count,
+            "user_name": user.name, "user_lastName": user.lastName, "user_mail": user.mail,
+            "user_bio": user.bio, "user_degreeId": user.degreeId, "page_url": page.url,
+        }
+        rows.append(tuple(values[label] for label in FULL_VIEW.labels))
+        row_tags[publication.id] = [{"id": t.id, "title": t.title, "description": t.description} for t in publication_tags]
+    return publications, rows, row_tags
+
+
+def _bench_app(publications, rows, row_tags) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orm", response_model=PublicationListResponse)
+    async def orm_path():
+        # What PublicationCacheService._list builds, then response_model serializes
+        return PublicationListResponse(
+            items=[PublicationResponse.model_validate(item, from_attributes=True) for item in publications],
+            next_cursor=None,
+        )
+
+    @app.get("/rows", response_model=PublicationListResponse)
+    async def row_path():
+        items = FULL_VIEW.build_items(rows, row_tags)
+        return FastJSONResponse({"items": items, "next_cursor": None})
+
+    return app
+
+
+async def _measure(client, path: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(timings), response
+
+
+async def run(args):
+    results = {}
+    print(f"{'items':>8}{'orm ms':>12}{'rows ms':>12}{'speedup':>10}{'body KB':>10}")
+    for size in args.sizes:
+        app = _bench_app(*_dataset(size))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            repeat = max(3, args.repeat * 100 // max(size, 100)) if size > 1000 else args.repeat
+            orm_ms, orm_response = await _measure(client, "/orm", repeat)
+            rows_ms, rows_response = await _measure(client, "/rows", repeat)
+
+        if orm_response.json() != rows_response.json():
+            raise SystemExit(f"{size} items: the two paths produced different JSON")
+        results[str(size)] = {
+            "orm_ms": round(orm_ms, 2),
+            "rows_ms": round(rows_ms, 2),
+            "speedup": round(orm_ms / rows_ms, 2),
+            "body_bytes": len(rows_response.content),
+            "repeat": repeat,
+        }
+        print(f"{size:>8}{orm_ms:>12.2f}{rows_ms:>12.2f}{orm_ms / rows_ms:>9.1f}x{len(rows_response.content) / 1024:>10.0f}")
+
+    if args.output:
+        write_json({"meta": {"git": git_revision()}, "serialization": results}, args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ORM + response_model vs row + orjson list serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the medians as JSON here")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/startup.py
+"""
+Cold start: import time, create_app(), startup (warm-up) and the first and
+second request, each measured in a fresh interpreter, with the startup
+warm-up on and off.
+
+Runs the app in-process against DATABASE_URL; the requests are read-only.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--path /publications/all-items] [--output startup.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from .report import git_revision, write_json
+
+STAGES = ("import_ms", "create_app_ms", "startup_ms", "first_request_ms", "second_request_ms", "time_to_first_response_ms")
+
+
+async def _child(path: str, warmup: bool) -> dict:
+    """One cold start; runs in its own interpreter so every import is really cold"""
+    start = time.perf_counter()
+    from dataclasses import replace
+
+    import httpx
+
+    from app.config.settings import load_settings
+    from app.main import create_app
+    imported = time.perf_counter()
+
+    app = create_app(replace(load_settings(), startup_warmup=warmup))
+    created = time.perf_counter()
+
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get(path)
+            response.raise_for_status()
+            first = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            second = time.perf_counter()
+
+    return {
+        "import_ms": (imported - start) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+        "startup_ms": (started - created) * 1000,
+        "first_request_ms": (first - started) * 1000,
+        "second_request_ms": (second - first) * 1000,
+        "time_to_first_response_ms": (first - start) * 1000,
+    }
+
+
+def _cold_start(path: str, warmup: bool) -> dict:
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", "--path", path]
+    if not warmup:
+        command.append("--no-warmup")
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(args):
+    results = {}
+    for warmup in (True, False):
+        runs = [_cold_start(args.path, warmup) for _ in range(args.runs)]
+        results["warmup" if warmup else "no-warmup"] = {
+            stage: round(statistics.median(run[stage] for run in runs), 1) for stage in STAGES
+        }
+
+    print(f"median of {args.runs} cold starts, GET {args.path}")
+    print(f"{'stage':<28}{'warmup':>12}{'no-warmup':>12}")
+    for stage in STAGES:
+        print(f"{stage:<28}{results['warmup'][stage]:>12}{results['no-warmup'][stage]:>12}")
+
+    if args.output:
+        write_json({"meta": {"git": git_revision(), "runs": args.runs, "path": args.path}, "startup": results}, args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-request of a cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/publications/all-items")
+    parser.add_argument("--output", help="Write the medians as JSON here")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--no-warmup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args.path, warmup=not args.no_warmup))))
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
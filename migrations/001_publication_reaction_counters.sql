@@ -0,0 +1,17 @@
+-- Denormalized reaction counters on publication (user-003)
+ALTER TABLE publication
+    ADD COLUMN IF NOT EXISTS likes_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS dislikes_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from reactions
+UPDATE publication p
+SET likes_count = r.likes,
+    dislikes_count = r.dislikes
+FROM (
+    SELECT id_publication,
+           count(*) FILTER (WHERE type = 'like') AS likes,
+           count(*) FILTER (WHERE type = 'dislike') AS dislikes
+    FROM reactions
+    GROUP BY id_publication
+) r
+WHERE r.id_publication = p.id;
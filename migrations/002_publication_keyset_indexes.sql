@@ -0,0 +1,5 @@
+-- Indexes backing keyset pagination ordered by (date, id) (user-004)
+CREATE INDEX IF NOT EXISTS ix_publication_date_id ON publication (date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_publication_page_date_id ON publication (page_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_publication_user_date_id ON publication (user_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_reactions_user_type ON reactions (id_user, type);
@@ -0,0 +1,3 @@
+-- Version stamps used as ETag validators (user-008)
+ALTER TABLE publication ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
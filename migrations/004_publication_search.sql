@@ -0,0 +1,9 @@
+-- Full-text search over title and content (user-013)
+-- Generated column: Postgres recomputes it on every insert and update of the row
+ALTER TABLE publication ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(content, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_publication_search_vector ON publication USING GIN (search_vector);
@@ -0,0 +1,3 @@
+-- Tag lookups by tag first (user-014): both "any" and "all" tag queries read only
+-- this index. The primary key (publication_id, tag_id) serves lookups by publication.
+CREATE INDEX IF NOT EXISTS ix_publication_tag_tag_publication ON publication_tag (tag_id, publication_id);
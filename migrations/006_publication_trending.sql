@@ -0,0 +1,27 @@
+-- Trending feed (user-015): time-decayed reaction scores, see services/trending_service.py
+CREATE TABLE IF NOT EXISTS trending_state (
+    id INTEGER PRIMARY KEY DEFAULT 1,
+    epoch TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO trending_state (id, epoch) VALUES (1, now()) ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS publication_trending (
+    publication_id UUID PRIMARY KEY REFERENCES publication (id) ON DELETE CASCADE,
+    score DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_publication_trending_score
+    ON publication_trending (score DESC, publication_id DESC);
+
+-- Backfill from existing reactions with the default settings
+-- (24h half-life, like 1.0, dislike 0.5), expressed at the epoch set above
+INSERT INTO publication_trending (publication_id, score)
+SELECT r.id_publication,
+       sum(CASE r.type WHEN 'like' THEN 1.0 ELSE 0.5 END
+           * exp(-ln(2) / 86400 * extract(epoch FROM s.epoch - r.date)))
+FROM reactions r CROSS JOIN trending_state s
+-- Anything older has decayed far below the 0.01 cut-off
+WHERE r.date > s.epoch - interval '14 days'
+GROUP BY r.id_publication
+HAVING sum(CASE r.type WHEN 'like' THEN 1.0 ELSE 0.5 END
+           * exp(-ln(2) / 86400 * extract(epoch FROM s.epoch - r.date))) >= 0.01
+ON CONFLICT (publication_id) DO NOTHING;
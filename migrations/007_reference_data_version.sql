@@ -0,0 +1,30 @@
+-- Version counters for the reference data cache (user-017): any write to
+-- tag, degree or page bumps its row, which the API polls to know when to reload
+CREATE TABLE IF NOT EXISTS reference_data_version (
+    name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1
+);
+INSERT INTO reference_data_version (name) VALUES ('tag'), ('degree'), ('page')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_reference_data_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE name = TG_TABLE_NAME;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tag_reference_data_version ON tag;
+CREATE TRIGGER tag_reference_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tag
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version();
+
+DROP TRIGGER IF EXISTS degree_reference_data_version ON degree;
+CREATE TRIGGER degree_reference_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON degree
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version();
+
+DROP TRIGGER IF EXISTS page_reference_data_version ON page;
+CREATE TRIGGER page_reference_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON page
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version();
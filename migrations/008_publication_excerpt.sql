@@ -0,0 +1,23 @@
+-- Stored excerpt and word count for view=summary listings (user-022)
+-- New and edited publications get both from PublicationService/BulkImportService
+-- (services/content_summary.py); this backfills existing rows the same way.
+ALTER TABLE publication ADD COLUMN IF NOT EXISTS excerpt VARCHAR(300);
+ALTER TABLE publication ADD COLUMN IF NOT EXISTS word_count INTEGER NOT NULL DEFAULT 0;
+
+WITH normalized AS (
+    SELECT id, btrim(regexp_replace(content, '\s+', ' ', 'g')) AS text
+    FROM publication
+    WHERE excerpt IS NULL
+)
+UPDATE publication p
+SET excerpt = CASE
+        WHEN length(n.text) <= 280 THEN n.text
+        -- Cut at the last word boundary within 280 characters
+        ELSE rtrim(left(regexp_replace(left(n.text, 281), ' [^ ]*$', ''), 280)) || '…'
+    END,
+    word_count = CASE
+        WHEN n.text = '' THEN 0
+        ELSE array_length(string_to_array(n.text, ' '), 1)
+    END
+FROM normalized n
+WHERE p.id = n.id;
@@ -0,0 +1,37 @@
+-- Reaction analytics (user-024): hourly and daily like/dislike buckets per
+-- publication and per page, see services/reaction_rollup_service.py.
+-- Buckets are UTC and count the current reactions dated inside them.
+CREATE TABLE IF NOT EXISTS publication_reaction_rollup (
+    publication_id UUID NOT NULL REFERENCES publication (id) ON DELETE CASCADE,
+    granularity VARCHAR(8) NOT NULL CHECK (granularity IN ('hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    likes INTEGER NOT NULL DEFAULT 0,
+    dislikes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (publication_id, granularity, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS page_reaction_rollup (
+    page_id INTEGER NOT NULL REFERENCES page (id) ON DELETE CASCADE,
+    granularity VARCHAR(8) NOT NULL CHECK (granularity IN ('hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    likes INTEGER NOT NULL DEFAULT 0,
+    dislikes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (page_id, granularity, bucket)
+);
+
+-- Backfill; python -m app.commands.backfill_reaction_rollups rebuilds the same way
+INSERT INTO publication_reaction_rollup (publication_id, granularity, bucket, likes, dislikes)
+SELECT r.id_publication, g.granularity, date_trunc(g.granularity, r.date AT TIME ZONE 'UTC'),
+       count(*) FILTER (WHERE r.type = 'like'), count(*) FILTER (WHERE r.type = 'dislike')
+FROM reactions r CROSS JOIN (VALUES ('hour'), ('day')) AS g (granularity)
+GROUP BY 1, 2, 3
+ON CONFLICT DO NOTHING;
+
+INSERT INTO page_reaction_rollup (page_id, granularity, bucket, likes, dislikes)
+SELECT p.page_id, g.granularity, date_trunc(g.granularity, r.date AT TIME ZONE 'UTC'),
+       count(*) FILTER (WHERE r.type = 'like'), count(*) FILTER (WHERE r.type = 'dislike')
+FROM reactions r
+JOIN publication p ON p.id = r.id_publication
+CROSS JOIN (VALUES ('hour'), ('day')) AS g (granularity)
+GROUP BY 1, 2, 3
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,22 @@
+-- Database-side cascades for user and publication deletes (user-025): one DELETE
+-- removes a user's publications, their reactions and tag links instead of the ORM
+-- loading and deleting them row by row. Constraints are added NOT VALID: swapping
+-- them takes a brief ACCESS EXCLUSIVE lock per table but scans no rows. Existing
+-- rows are checked, and the supporting index built, by 011_cascade_deletes_validate.sql.
+ALTER TABLE reactions
+    DROP CONSTRAINT IF EXISTS reactions_id_user_fkey,
+    ADD CONSTRAINT reactions_id_user_fkey
+        FOREIGN KEY (id_user) REFERENCES "user" (id) ON DELETE CASCADE NOT VALID,
+    DROP CONSTRAINT IF EXISTS reactions_id_publication_fkey,
+    ADD CONSTRAINT reactions_id_publication_fkey
+        FOREIGN KEY (id_publication) REFERENCES publication (id) ON DELETE CASCADE NOT VALID;
+
+ALTER TABLE publication_tag
+    DROP CONSTRAINT IF EXISTS publication_tag_publication_id_fkey,
+    ADD CONSTRAINT publication_tag_publication_id_fkey
+        FOREIGN KEY (publication_id) REFERENCES publication (id) ON DELETE CASCADE NOT VALID;
+
+ALTER TABLE publication
+    DROP CONSTRAINT IF EXISTS publication_user_id_fkey,
+    ADD CONSTRAINT publication_user_id_fkey
+        FOREIGN KEY (user_id) REFERENCES "user" (id) ON DELETE CASCADE NOT VALID;
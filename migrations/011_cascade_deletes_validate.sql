@@ -0,0 +1,15 @@
+-- Second step of 010_cascade_deletes.sql (user-025). Run it on its own and
+-- outside a transaction (plain `psql -f`, not -1 / --single-transaction):
+-- CREATE INDEX CONCURRENTLY cannot run inside one.
+--
+-- VALIDATE CONSTRAINT scans the existing rows under SHARE UPDATE EXCLUSIVE, so
+-- reads and writes carry on meanwhile; each statement commits on its own.
+ALTER TABLE reactions VALIDATE CONSTRAINT reactions_id_user_fkey;
+ALTER TABLE reactions VALIDATE CONSTRAINT reactions_id_publication_fkey;
+ALTER TABLE publication_tag VALIDATE CONSTRAINT publication_tag_publication_id_fkey;
+ALTER TABLE publication VALIDATE CONSTRAINT publication_user_id_fkey;
+
+-- The reactions primary key leads with id_user: without this, every deleted
+-- publication cascades into a sequential scan of reactions. Built without
+-- blocking writes; if it fails, drop the INVALID index and run this again.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reactions_publication ON reactions (id_publication);
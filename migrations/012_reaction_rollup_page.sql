@@ -0,0 +1,24 @@
+-- Page-scoped reads and retention for the reaction rollups (user-024). Run it
+-- outside a transaction (plain `psql -f`, not -1): the indexes are built
+-- CONCURRENTLY. Apply it with the code that writes page_id; if SET NOT NULL
+-- fails on rows written by older code meanwhile, run the file again.
+--
+-- Each publication bucket carries its publication's page, so a page leaderboard
+-- reads only that page's buckets instead of joining every bucket in the range
+-- to publication.
+ALTER TABLE publication_reaction_rollup ADD COLUMN IF NOT EXISTS page_id INTEGER;
+
+UPDATE publication_reaction_rollup r
+SET page_id = p.page_id
+FROM publication p
+WHERE p.id = r.publication_id AND r.page_id IS DISTINCT FROM p.page_id;
+
+ALTER TABLE publication_reaction_rollup ALTER COLUMN page_id SET NOT NULL;
+
+-- Neither index covers likes/dislikes, so counter updates stay HOT
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publication_reaction_rollup_page
+    ON publication_reaction_rollup (page_id, granularity, bucket);
+
+-- The prune job deletes hourly buckets past ROLLUP_HOURLY_RETENTION_DAYS, oldest day first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publication_reaction_rollup_bucket
+    ON publication_reaction_rollup (granularity, bucket);
@@ -0,0 +1,6 @@
+-- Per-row trending epochs (user-015), see services/trending_service.py.
+-- Each score carries the time it is expressed at, so toggles no longer lock
+-- trending_state and the re-decay job rebases scores in short batches.
+-- Metadata-only: existing rows keep NULL, which reads as trending_state.epoch,
+-- until the next re-decay gives every row its own.
+ALTER TABLE publication_trending ADD COLUMN IF NOT EXISTS epoch TIMESTAMPTZ;
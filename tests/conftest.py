@@ -0,0 +1,7 @@
+# tests/conftest.py
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
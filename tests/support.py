@@ -0,0 +1,124 @@
+# tests/support.py
+"""
+Helpers shared by the tests.
+
+Most tests run on an in-memory sqlite database (aiosqlite). Tests that need
+Postgres (asyncpg, ON CONFLICT, date_trunc, full-text search) run against
+TEST_DATABASE_URL and are skipped without it. Its tables are dropped and
+recreated from the models, so point it at a throwaway database.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+from app.config.database import Base, get_async_db
+from app.config.query_stats import install_query_stats
+from app.config.settings import Settings
+from app.main import create_app
+from app.models import Degree, Page, Publication, PublicationTag, Reaction, ReferenceDataVersion, Tag, User
+from app.services.cache import publication_cache
+from app.services.reference_cache import reference_cache
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Engines are built lazily: apps whose sessions are overridden never connect to it
+UNUSED_DATABASE_URL = "postgresql+psycopg2://tests@localhost/unused"
+
+requires_postgres = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+def make_app(database_url: str = UNUSED_DATABASE_URL, **overrides):
+    """An app for the given database, without the startup warm-up and with fresh caches"""
+    settings = Settings(database_url=database_url, **{"startup_warmup": False, **overrides})
+    app = create_app(settings)
+    publication_cache.clear()
+    reference_cache.clear()
+    return app
+
+
+def make_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://tests")
+
+
+async def sqlite_sessions():
+    """An in-memory sqlite database with the models' tables, with query stats installed"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _search_functions(connection, record):
+        # search_vector is generated from these; searching itself needs Postgres
+        connection.create_function("to_tsvector", 2, lambda config, text: text, deterministic=True)
+        connection.create_function("setweight", 2, lambda vector, weight: vector, deterministic=True)
+
+    install_query_stats(engine.sync_engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def use_sessions(app, sessions):
+    """Serve the app's requests from sessions instead of its own engines"""
+    async def get_db():
+        async with sessions() as db:
+            yield db
+    app.dependency_overrides[get_async_db] = get_db
+
+
+async def seed(sessions, publications: int) -> SimpleNamespace:
+    """
+    Two pages, three tags and three users; `publications` publications on page 1
+    by the first user, tagged 1 and 2, each liked by the other two users
+    """
+    user_ids = [uuid.uuid4() for _ in range(3)]
+    publication_ids = [uuid.uuid4() for _ in range(publications)]
+    start = datetime(2026, 1, 1)
+    async with sessions() as db:
+        await db.execute(insert(Degree), [{"id": 1, "title": "Ingeniería"}])
+        await db.execute(insert(Page), [{"id": 1, "url": "page-1"}, {"id": 2, "url": "page-2"}])
+        await db.execute(insert(Tag), [{"id": n, "title": f"tag {n}"} for n in (1, 2, 3)])
+        await db.execute(insert(ReferenceDataVersion), [{"name": name, "version": 1} for name in ("tag", "degree", "page")])
+        await db.execute(insert(User), [
+            {"id": user_id, "name": f"user {n}", "lastName": "test", "mail": f"user{n}@tests.example.com", "degreeId": 1}
+            for n, user_id in enumerate(user_ids)
+        ])
+        if publication_ids:
+            await db.execute(insert(Publication), [
+                {
+                    "id": publication_id, "title": f"publication {n}", "content": "hola mundo " * (n + 1),
+                    "date": start + timedelta(hours=n), "user_id": user_ids[0], "page_id": 1, "likes_count": 2,
+                }
+                for n, publication_id in enumerate(publication_ids)
+            ])
+            await db.execute(insert(PublicationTag), [
+                {"publication_id": publication_id, "tag_id": tag_id}
+                for publication_id in publication_ids for tag_id in (1, 2)
+            ])
+            await db.execute(insert(Reaction), [
+                {"id_user": user_id, "id_publication": publication_id, "type": "like", "date": start}
+                for publication_id in publication_ids for user_id in user_ids[1:]
+            ])
+        await db.commit()
+    return SimpleNamespace(user_ids=user_ids, publication_ids=publication_ids)
+
+
+async def sqlite_app(publications: int, **overrides):
+    """An app served from a seeded sqlite database: (app, seeded ids, engine)"""
+    engine, sessions = await sqlite_sessions()
+    data = await seed(sessions, publications)
+    app = make_app(**overrides)
+    use_sessions(app, sessions)
+    return app, data, engine
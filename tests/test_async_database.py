@@ -0,0 +1,205 @@
+# tests/test_async_database.py
+"""
+Concurrent requests through the async engine and AsyncSession (asyncpg):
+requests waiting on the database overlap instead of queueing, counters and
+rows come out right and every connection goes back to the pool.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import Depends
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config.database import Base, get_async_db
+from app.models import Degree, Page, Publication, PublicationReactionRollup, PublicationTag, Reaction, Tag, TrendingState, User
+from app.services.trending_service import TrendingService
+
+from .support import TEST_DATABASE_URL, make_app, make_client, requires_postgres
+
+pytestmark = [pytest.mark.anyio, requires_postgres]
+
+USERS = 25
+
+# Requests in flight at once (within DB_POOL_SIZE + DB_MAX_OVERFLOW) and the
+# database time each one spends
+IN_FLIGHT = 10
+SLOW_QUERY_SECONDS = 0.5
+
+
+@pytest.fixture
+async def database():
+    app = make_app(TEST_DATABASE_URL)
+    database = app.state.database
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+    user_ids = [uuid.uuid4() for _ in range(USERS)]
+    publication_id = uuid.uuid4()
+    with Session(database.engine) as db:
+        db.execute(insert(Degree), [{"id": 1, "title": "Ingeniería"}, {"id": 2, "title": "Derecho"}])
+        db.execute(insert(Page), [{"id": 1, "url": "page-1"}])
+        db.execute(insert(Tag), [{"id": 1, "title": "uno"}, {"id": 2, "title": "dos"}])
+        db.execute(insert(TrendingState), [{"id": 1}])
+        db.execute(insert(User), [
+            {"id": user_id, "name": f"user {n}", "lastName": "test", "mail": f"user{n}@tests.example.com", "degreeId": 1}
+            for n, user_id in enumerate(user_ids)
+        ])
+        db.execute(insert(Publication), [{
+            "id": publication_id, "title": "concurrent", "content": "hola mundo",
+            "date": datetime.utcnow(), "user_id": user_ids[0], "page_id": 1,
+        }])
+        db.commit()
+    database.user_ids = user_ids
+    database.publication_id = publication_id
+    yield app, database
+    Base.metadata.drop_all(database.engine)
+    await database.dispose()
+
+
+def _count(database, statement) -> int:
+    with Session(database.engine) as db:
+        return db.execute(statement).scalar_one()
+
+
+def _assert_no_leaks(database):
+    assert database.async_engine.pool.checkedout() == 0
+
+
+async def test_in_flight_requests_overlap(database):
+    app, database = database
+
+    @app.get("/tests/slow")
+    async def slow(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": SLOW_QUERY_SECONDS})
+        return {}
+
+    async def timed(requests: int) -> float:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get("/tests/slow") for _ in range(requests)))
+        assert [response.status_code for response in responses] == [200] * requests
+        return time.perf_counter() - start
+
+    async with make_client(app) as client:
+        # Opens every connection the burst needs
+        await timed(IN_FLIGHT)
+        single = await timed(1)
+        burst = await timed(IN_FLIGHT)
+    _assert_no_leaks(database)
+
+    # IN_FLIGHT times the work in about the time of one request, not IN_FLIGHT times it
+    assert single >= SLOW_QUERY_SECONDS
+    assert burst < 2 * single, (single, burst)
+
+
+async def test_concurrent_toggles_keep_counters_and_rows(database):
+    app, database = database
+    publication_id = str(database.publication_id)
+
+    async def toggle(user_id, reaction_type):
+        return await client.post(
+            "/reactions/toggle",
+            json={"id_user": str(user_id), "id_publication": publication_id, "type": reaction_type},
+        )
+
+    async with make_client(app) as client:
+        responses = await asyncio.gather(*(toggle(user_id, "like") for user_id in database.user_ids))
+        assert [response.status_code for response in responses] == [200] * USERS
+        counts = (await client.get(f"/reactions/counts/{publication_id}")).json()
+        assert counts == {"likes_count": USERS, "dislikes_count": 0}
+
+        # Every like flips to a dislike
+        responses = await asyncio.gather(*(toggle(user_id, "dislike") for user_id in database.user_ids))
+        assert [response.status_code for response in responses] == [200] * USERS
+        counts = (await client.get(f"/reactions/counts/{publication_id}")).json()
+        assert counts == {"likes_count": 0, "dislikes_count": USERS}
+    _assert_no_leaks(database)
+
+    assert _count(database, select(func.count()).select_from(Reaction).where(Reaction.type == "dislike")) == USERS
+    assert _count(database, select(func.count()).select_from(Reaction).where(Reaction.type == "like")) == 0
+    assert _count(database, (
+        select(func.sum(PublicationReactionRollup.dislikes))
+        .where(PublicationReactionRollup.granularity == "hour")
+    )) == USERS
+
+
+async def test_batch_reports_missing_users_per_item(database):
+    app, database = database
+    publication_id = str(database.publication_id)
+    async with make_client(app) as client:
+        response = await client.post("/reactions/batch", json={"items": [
+            {"id_user": str(database.user_ids[1]), "id_publication": publication_id, "type": "like"},
+            {"id_user": str(uuid.uuid4()), "id_publication": publication_id, "type": "like"},
+            {"id_user": str(database.user_ids[2]), "id_publication": str(uuid.uuid4()), "type": "like"},
+        ]})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert (body["applied"], body["failed"]) == (1, 2)
+        assert [result["error"] for result in body["results"]] == [None, "User not found", "Publication not found"]
+        counts = (await client.get(f"/reactions/counts/{publication_id}")).json()
+        assert counts == {"likes_count": 1, "dislikes_count": 0}
+    _assert_no_leaks(database)
+
+
+async def test_concurrent_tagged_creates(database):
+    app, database = database
+    creates = 10
+
+    async def create(n):
+        return await client.post("/publications/", json={
+            "title": f"tagged {n}", "content": "hola mundo", "tags": [1, 2],
+            "user_id": str(database.user_ids[n]), "page_id": 1,
+        })
+
+    async with make_client(app) as client:
+        responses = await asyncio.gather(*(create(n) for n in range(creates)))
+        assert [response.status_code for response in responses] == [200] * creates
+        assert all(sorted(tag["id"] for tag in response.json()["tags"]) == [1, 2] for response in responses)
+    _assert_no_leaks(database)
+
+    assert _count(database, select(func.count()).select_from(PublicationTag)) == creates * 2
+    assert _count(database, select(func.count()).select_from(Publication)) == creates + 1
+
+
+async def test_update_degree(database):
+    app, database = database
+    user_id = str(database.user_ids[0])
+    async with make_client(app) as client:
+        response = await client.put("/users/me", json={"degreeId": 2}, headers={"user-id": user_id})
+        assert response.status_code == 200
+    _assert_no_leaks(database)
+    assert _count(database, select(User.degreeId).where(User.id == database.user_ids[0])) == 2
+
+
+async def _trending_score(client) -> float:
+    items = (await client.get("/publications/trending")).json()["items"]
+    return items[0]["trending_score"] if items else 0.0
+
+
+async def test_trending_follows_toggles_redecay_and_deletes(database):
+    app, database = database
+    publication_id = str(database.publication_id)
+    likers = database.user_ids[1:6]
+    async with make_client(app) as client:
+        with Session(database.engine) as db:
+            # What the old re-decay held for its whole run: toggles no longer wait for it
+            db.execute(select(TrendingState.epoch).with_for_update())
+            responses = await asyncio.wait_for(asyncio.gather(*(
+                client.post("/reactions/toggle", json={"id_user": str(user_id), "id_publication": publication_id, "type": "like"})
+                for user_id in likers
+            )), timeout=10)
+            assert [response.status_code for response in responses] == [200] * len(likers)
+        assert await _trending_score(client) == pytest.approx(len(likers), rel=1e-3)
+
+        await TrendingService.redecay(batch_size=1)
+        assert await _trending_score(client) == pytest.approx(len(likers), rel=1e-3)
+
+        # Deleted users' likes leave the score with them
+        for user_id in likers[1:]:
+            response = await client.delete("/users/me", headers={"user-id": str(user_id)})
+            assert response.status_code == 200, response.text
+        assert await _trending_score(client) == pytest.approx(1, rel=1e-3)
+    _assert_no_leaks(database)
@@ -0,0 +1,34 @@
+# tests/test_cache.py
+from app.services.cache import MISSING, ResponseCache
+
+
+def test_invalidation_only_drops_fills_of_its_own_keys():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    generation = cache.generation
+    # A write to publication 1 while both values were being loaded
+    cache.invalidate(("publication", 1))
+    cache.set("other", "fresh", [("publication", 2)], generation)
+    cache.set("touched", "stale", [("publication", 1)], generation)
+    assert cache.get("other") == "fresh"
+    assert cache.get("touched") is MISSING
+
+
+def test_clear_drops_every_fill_in_flight():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    cache.set("key", "stale", [("publication", 1)], generation)
+    assert cache.get("key") is MISSING
+
+    generation = cache.generation
+    cache.set("key", "fresh", [("publication", 1)], generation)
+    assert cache.get("key") == "fresh"
+
+
+def test_invalidate_drops_dependents():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    cache.set("page", "items", [("page", 1), ("publication", 1)])
+    cache.set("detail", "item", [("publication", 2)])
+    cache.invalidate(("publication", 1))
+    assert cache.get("page") is MISSING
+    assert cache.get("detail") == "item"
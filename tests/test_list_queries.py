@@ -0,0 +1,52 @@
+# tests/test_list_queries.py
+"""
+Publication list endpoints issue the same number of statements whatever the
+page size: counts, authors, pages and tags are fetched per page, never per item.
+"""
+import pytest
+
+from app.config.query_stats import record_queries
+
+from .support import make_client, sqlite_app
+
+pytestmark = pytest.mark.anyio
+
+PUBLICATIONS = 30
+PAGE_SIZES = (5, 25)
+
+LIST_ROUTES = [
+    "/publications/all-items",
+    "/publications/all-items?view=summary",
+    "/publications/all-items?viewer_id={reactor}",
+    "/publications/by-page/1",
+    "/publications/by-user/{author}",
+    "/publications/by-tags?tag_ids=1&tag_ids=2",
+    "/publications/by-tags?tag_ids=1&tag_ids=2&mode=all",
+    "/publications/user-reactions/{reactor}/likes",
+]
+
+
+@pytest.fixture(params=[True, False], ids=["rows", "orm"])
+async def served(request):
+    # Responses are not cached, so every request reaches the database
+    app, data, engine = await sqlite_app(PUBLICATIONS, fast_list_responses=request.param, publication_cache_routes=())
+    async with make_client(app) as client:
+        # Loads the reference data cache
+        await client.get("/publications/all-items?limit=1&view=summary")
+        yield client, data
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("route", LIST_ROUTES)
+async def test_statements_do_not_grow_with_the_page(served, route):
+    client, data = served
+    url = route.format(author=data.user_ids[0], reactor=data.user_ids[1])
+    url += "&" if "?" in url else "?"
+    statements = []
+    for limit in PAGE_SIZES:
+        with record_queries() as stats:
+            response = await client.get(f"{url}limit={limit}")
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == limit
+        statements.append(stats.statements)
+    assert statements[0] == statements[1]
@@ -0,0 +1,65 @@
+# tests/test_publication_cache.py
+"""
+A write made by another worker never reaches this process's cache, but it
+does change the ETag: a cached body stored under another ETag is not served.
+"""
+import pytest
+from sqlalchemy import update
+
+from app.models import Publication
+from app.services.cache import publication_cache
+
+from .support import make_app, make_client, seed, sqlite_sessions, use_sessions
+
+pytestmark = pytest.mark.anyio
+
+ROUTES = [
+    "/publications/{publication}",
+    "/publications/{publication}?fields=title,likes_count",
+    "/publications/all-items",
+    "/publications/all-items?viewer_id={reactor}",
+    "/publications/by-page/1",
+    "/publications/by-user/{author}",
+    "/publications/by-tags?tag_ids=1",
+]
+
+
+@pytest.fixture(params=[True, False], ids=["rows", "orm"])
+async def served(request):
+    engine, sessions = await sqlite_sessions()
+    data = await seed(sessions, 3)
+    app = make_app(fast_list_responses=request.param)
+    use_sessions(app, sessions)
+    async with make_client(app) as client:
+        yield client, sessions, data
+    await engine.dispose()
+
+
+def _likes(body) -> int:
+    return body["items"][0]["likes_count"] if "items" in body else body["likes_count"]
+
+
+@pytest.mark.parametrize("route", ROUTES)
+async def test_write_by_another_worker_is_served_with_its_etag(served, route):
+    client, sessions, data = served
+    url = route.format(publication=data.publication_ids[-1], reactor=data.user_ids[1], author=data.user_ids[0])
+    first = await client.get(url)
+    assert _likes(first.json()) == 2
+    hits = publication_cache.hits
+    assert _likes((await client.get(url)).json()) == 2
+    # Same version: served from the cache
+    assert publication_cache.hits == hits + 1
+
+    # What a toggle in another worker commits; this process's cache is not told
+    async with sessions() as db:
+        await db.execute(
+            update(Publication)
+            .where(Publication.id == data.publication_ids[-1])
+            .values(likes_count=3, version=Publication.version + 1)
+        )
+        await db.commit()
+
+    response = await client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert _likes(response.json()) == 3
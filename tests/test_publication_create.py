@@ -0,0 +1,52 @@
+# tests/test_publication_create.py
+import pytest
+from sqlalchemy import event, func, select
+
+from app.models import Publication, PublicationTag
+
+from .support import make_client, sqlite_app
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_tagged_create_commits_once():
+    app, data, engine = await sqlite_app(0)
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda connection: commits.append(connection))
+    try:
+        async with make_client(app) as client:
+            response = await client.post("/publications/", json={
+                "title": "tagged", "content": "hola mundo", "tags": [1, 3],
+                "user_id": str(data.user_ids[0]), "page_id": 1,
+            })
+        assert response.status_code == 200, response.text
+        assert sorted(tag["id"] for tag in response.json()["tags"]) == [1, 3]
+        assert len(commits) == 1
+
+        async with engine.connect() as connection:
+            tags = await connection.scalar(select(func.count()).select_from(PublicationTag))
+        assert tags == 2
+    finally:
+        await engine.dispose()
+
+
+async def test_bulk_reports_long_titles_per_item():
+    app, data, engine = await sqlite_app(0)
+    item = {"content": "hola mundo", "tags": [1], "user_id": str(data.user_ids[0]), "page_id": 1}
+    try:
+        async with make_client(app) as client:
+            response = await client.post("/publications/bulk", json={"items": [
+                {**item, "title": "short"},
+                {**item, "title": "x" * 256},
+                {**item, "title": "x" * 255},
+            ]})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert (body["created"], body["failed"]) == (2, 1)
+        assert body["results"][1]["error"] == "Title longer than 255 characters"
+
+        async with engine.connect() as connection:
+            publications = await connection.scalar(select(func.count()).select_from(Publication))
+        assert publications == 2
+    finally:
+        await engine.dispose()
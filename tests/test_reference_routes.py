@@ -0,0 +1,42 @@
+# tests/test_reference_routes.py
+import pytest
+from sqlalchemy import delete
+
+from app.models import ReferenceDataVersion
+
+from .support import make_app, make_client, seed, sqlite_sessions, use_sessions
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def served():
+    engine, sessions = await sqlite_sessions()
+    await seed(sessions, 0)
+    app = make_app()
+    use_sessions(app, sessions)
+    async with make_client(app) as client:
+        yield client, sessions
+    await engine.dispose()
+
+
+async def test_tags_revalidate_against_the_version(served):
+    client, _ = served
+    response = await client.get("/tags")
+    etag = response.headers["ETag"]
+    assert etag == '"r-tag-1"'
+    response = await client.get("/tags", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+async def test_no_etag_without_a_version_row(served):
+    client, sessions = served
+    async with sessions() as db:
+        await db.execute(delete(ReferenceDataVersion).where(ReferenceDataVersion.name == "degree"))
+        await db.commit()
+    response = await client.get("/degrees")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert "ETag" not in response.headers
+    response = await client.get("/degrees", headers={"If-None-Match": '"r-degree-None"'})
+    assert response.status_code == 200
@@ -0,0 +1,104 @@
+# tests/test_statement_budgets.py
+"""
+Statements issued and rows fetched per request for the publication list,
+detail and search endpoints. A change to the loading profiles that adds a
+query (a lazy load, a second eager load) or multiplies rows (a joined
+collection) fails here before it shows up in production.
+"""
+import pytest
+
+from app.config.database import AsyncSessionLocal, Base
+from app.config.query_stats import record_queries
+
+from .support import TEST_DATABASE_URL, make_app, make_client, requires_postgres, seed, sqlite_app
+
+pytestmark = pytest.mark.anyio
+
+# Seeded publications, two tags each, all on one page by one author
+PUBLICATIONS = 10
+
+# (statements, rows): the ETag window, the page's rows (author and page
+# joined, one row per item) and their tags
+LIST_BUDGETS = {
+    "/publications/all-items": (3, 40),
+    "/publications/all-items?view=summary": (3, 40),
+    "/publications/all-items?fields=title,user,page": (2, 20),
+    "/publications/by-page/1": (3, 40),
+    "/publications/by-user/{author}": (3, 40),
+    "/publications/by-tags?tag_ids=1&tag_ids=2": (3, 40),
+    # ... and the viewer's reactions
+    "/publications/all-items?viewer_id={reactor}": (4, 50),
+}
+
+# (statements, rows): ETag, the publication (author and page joined), its tags
+DETAIL_BUDGETS = {
+    "/publications/{publication}": (3, 4),
+    "/publications/{publication}?view=summary": (3, 4),
+    "/publications/{publication}?fields=title": (2, 2),
+}
+
+# Statements: the ranked page (author and page joined), its tags
+SEARCH_BUDGETS = {
+    "/publications/search?q=hola": 2,
+    "/publications/search?q=hola&view=summary": 2,
+    "/publications/search?q=hola&fields=title": 1,
+}
+
+
+async def _measure(client, url: str):
+    """(statements, rows) of one request"""
+    with record_queries() as stats:
+        response = await client.get(url)
+    assert response.status_code == 200, response.text
+    return stats.statements, stats.rows
+
+
+@pytest.fixture(params=[True, False], ids=["rows", "orm"])
+async def served(request):
+    app, data, engine = await sqlite_app(PUBLICATIONS, fast_list_responses=request.param, publication_cache_routes=())
+    async with make_client(app) as client:
+        # Loads the reference data cache
+        await client.get("/publications/all-items?limit=1&view=summary")
+        yield client, data
+    await engine.dispose()
+
+
+def _url(route: str, data) -> str:
+    return route.format(author=data.user_ids[0], reactor=data.user_ids[1], publication=data.publication_ids[0])
+
+
+@pytest.mark.parametrize("route", LIST_BUDGETS)
+async def test_list_budget(served, route):
+    client, data = served
+    assert await _measure(client, _url(route, data)) == LIST_BUDGETS[route]
+
+
+@pytest.mark.parametrize("route", DETAIL_BUDGETS)
+async def test_detail_budget(served, route):
+    client, data = served
+    assert await _measure(client, _url(route, data)) == DETAIL_BUDGETS[route]
+
+
+@pytest.fixture
+async def postgres_client():
+    app = make_app(TEST_DATABASE_URL, publication_cache_routes=())
+    database = app.state.database
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+    await seed(AsyncSessionLocal, PUBLICATIONS)
+    async with make_client(app) as client:
+        # Connection setup statements and the reference data cache
+        await client.get("/publications/all-items?limit=1&view=summary")
+        yield client
+    Base.metadata.drop_all(database.engine)
+    await database.dispose()
+
+
+@requires_postgres
+@pytest.mark.parametrize("route", SEARCH_BUDGETS)
+async def test_search_statements(postgres_client, route):
+    budget = SEARCH_BUDGETS[route]
+    statements, _ = await _measure(postgres_client, f"{route}&limit=2")
+    assert statements == budget
+    statements, _ = await _measure(postgres_client, f"{route}&limit=8")
+    assert statements == budget
@@ -0,0 +1,60 @@
+# tests/test_user_delete.py
+"""
+Deleting a user who reacted takes their reactions out of the counters and
+gives the publications they reacted to a new ETag, so clients revalidating
+with the old one get the new counts instead of a 304.
+"""
+import pytest
+
+from app.config.database import AsyncSessionLocal, Base
+from app.services.user_purge import user_purger
+
+from .support import TEST_DATABASE_URL, make_app, make_client, requires_postgres, seed
+
+pytestmark = [pytest.mark.anyio, requires_postgres]
+
+
+@pytest.fixture
+async def served():
+    app = make_app(TEST_DATABASE_URL)
+    database = app.state.database
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+    # Publications by the first user, each liked by the other two
+    data = await seed(AsyncSessionLocal, 2)
+    async with make_client(app) as client:
+        yield client, data
+    Base.metadata.drop_all(database.engine)
+    await database.dispose()
+
+
+async def _revalidated(client, url: str, etag: str):
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.status_code
+    assert response.headers["ETag"] != etag
+    return response
+
+
+async def test_delete_changes_the_etag_of_reacted_publications(served):
+    client, data = served
+    detail = f"/publications/{data.publication_ids[0]}"
+    listing = "/publications/all-items"
+    detail_etag = (await client.get(detail)).headers["ETag"]
+    list_etag = (await client.get(listing)).headers["ETag"]
+
+    response = await client.delete("/users/me", headers={"user-id": str(data.user_ids[1])})
+    assert response.status_code == 200, response.text
+
+    assert (await _revalidated(client, detail, detail_etag)).json()["likes_count"] == 1
+    items = (await _revalidated(client, listing, list_etag)).json()["items"]
+    assert [item["likes_count"] for item in items] == [1, 1]
+
+
+async def test_purge_changes_the_etag_of_reacted_publications(served):
+    client, data = served
+    detail = f"/publications/{data.publication_ids[0]}"
+    etag = (await client.get(detail)).headers["ETag"]
+
+    assert await user_purger.purge(data.user_ids[2])
+
+    assert (await _revalidated(client, detail, etag)).json()["likes_count"] == 1